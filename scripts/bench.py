@@ -0,0 +1,174 @@
+#!/usr/bin/env python3
+"""Micro-benchmarks for the staking node's log hot path.
+
+Usage: uv run python scripts/bench.py [name ...]
+"""
+
+import os
+import re
+import sys
+import tempfile
+from collections.abc import Callable
+from pathlib import Path
+from time import perf_counter
+
+# Config reads these at import time
+os.environ.setdefault("DEPLOY_ENV", "dev")
+os.environ.setdefault("ETH_ADDR", "0x0000000000000000000000000000000000000000")
+sys.path.insert(0, str(Path(__file__).parent.parent / "src"))
+
+from rich.console import Console  # noqa: E402
+
+from staker.config import LOG_STYLES  # noqa: E402
+from staker.logs import LogSink  # noqa: E402
+from staker.rules import RuleEngine  # noqa: E402
+from staker.utils import colorize_log, colorize_log_ansi  # noqa: E402
+
+# Representative client output
+SAMPLE_LINES = [
+    "<<< EXECUTION >>> INFO [10-18|12:00:00.000] Imported new potential chain segment "
+    "number=21,000,000 hash=0x1234..abcd blocks=1 txs=150 mgas=12.345 elapsed=45.6ms",
+    "<<< EXECUTION >>> WARN [10-18|12:00:01.000] Snapshot extension registration failed "
+    'peer=1a2b3c4d err="peer connected on snap without compatible eth support"',
+    '[[[ CONSENSUS ]]] time="2025-10-18 12:00:02" level=info msg="Synced new block" '
+    "block=0x1234abcd... epoch=300000 finalizedEpoch=299998 prefix=blockchain slot=9600000",
+    '(( _VALIDATION )) time="2025-10-18 12:00:03" level=info msg="Submitted new attestations" '
+    "AggregatorIndices=[] AttesterIndices=[12345] prefix=client slot=9600000",
+    '+++ MEV_BOOST +++ time="2025-10-18T12:00:04.000Z" level=info msg="http: GET /eth/v1/builder/status 200" '
+    "duration=0.000123 method=GET module=service path=/eth/v1/builder/status status=200",
+]
+
+
+def bench_open_per_line(path: str, lines: list[str]) -> None:
+    """Baseline: reopen the file in append mode for every line."""
+    for line in lines:
+        with open(path, "a") as file:
+            file.write(f"{line}\n")
+
+
+def bench_log_sink(path: str, lines: list[str]) -> None:
+    """Write through a long-lived buffered LogSink."""
+    sink = LogSink(path)
+    for line in lines:
+        sink.write(line)
+    sink.close()
+
+
+def run_log_sink(num_lines: int = 200_000) -> None:
+    """Compare lines/sec of open-per-line appends against LogSink."""
+    lines = [SAMPLE_LINES[i % len(SAMPLE_LINES)] for i in range(num_lines)]
+    cases: dict[str, Callable[[str, list[str]], None]] = {
+        "open per line": bench_open_per_line,
+        "LogSink": bench_log_sink,
+    }
+    with tempfile.TemporaryDirectory() as tmp:
+        for name, case in cases.items():
+            path = os.path.join(tmp, f"{name.replace(' ', '_')}.txt")
+            start = perf_counter()
+            case(path, lines)
+            elapsed = perf_counter() - start
+            print(f"  {name:<24} {num_lines / elapsed:>14,.0f} lines/sec")
+
+
+def colorize_replace_loop(text: str) -> str:
+    """Baseline: one str.replace pass per LOG_STYLES entry."""
+    for key, style in LOG_STYLES.items():
+        text = text.replace(key, f"[{style}]{key}[/{style}]")
+    return text
+
+
+def run_colorize(num_lines: int = 100_000) -> None:
+    """Compare colorizing (and rendering) lines with each colorizer."""
+    lines = [SAMPLE_LINES[i % len(SAMPLE_LINES)] for i in range(num_lines)]
+    cases: dict[str, Callable[[str], str]] = {
+        "str.replace loop": colorize_replace_loop,
+        "compiled markup": colorize_log,
+        "compiled ANSI": colorize_log_ansi,
+    }
+    for name, case in cases.items():
+        start = perf_counter()
+        for line in lines:
+            case(line)
+        elapsed = perf_counter() - start
+        print(f"  {name:<24} {num_lines / elapsed:>14,.0f} lines/sec")
+
+    # End to end through the console, as Node._print_line does
+    with open(os.devnull, "w") as devnull:
+        console = Console(highlight=False, file=devnull, force_terminal=True)
+        rendered: dict[str, Callable[[str], None]] = {
+            "replace loop + print": lambda line: console.print(colorize_replace_loop(line)),
+            "ANSI + out": lambda line: console.out(colorize_log_ansi(line)),
+        }
+        sample = lines[: num_lines // 10]
+        for name, case in rendered.items():
+            start = perf_counter()
+            for line in sample:
+                case(line)
+            elapsed = perf_counter() - start
+            print(f"  {name:<24} {len(sample) / elapsed:>14,.0f} lines/sec")
+
+
+def synthetic_rules(num_rules: int) -> list[dict]:
+    """Build varied alert rules that never match the sample lines."""
+    subjects = ["database", "trie", "peer", "block", "state", "snapshot", "header", "bloom"]
+    failures = ["corrupted", "missing", "failed", "timed out", "rejected"]
+    return [
+        {
+            "name": f"rule-{i}",
+            "pattern": rf"{subjects[i % len(subjects)]} {failures[i % len(failures)]} \(code {i}\)",
+            "source": None if i % 2 else "execution",
+            "threshold": 3,
+            "window": 60,
+            "action": "alert",
+        }
+        for i in range(num_rules)
+    ]
+
+
+def run_rules(num_lines: int = 100_000, num_rules: int = 60) -> None:
+    """Compare one regex search per rule against RuleEngine's compiled matcher."""
+    lines = [SAMPLE_LINES[i % len(SAMPLE_LINES)] for i in range(num_lines)]
+    rules = synthetic_rules(num_rules)
+    # Every 1000th line trips a rule, so the threshold bookkeeping is exercised too
+    for i in range(0, num_lines, 1000):
+        lines[i] = rules[i % num_rules]["pattern"].replace("\\", "")
+    patterns = [re.compile(rule["pattern"]) for rule in rules]
+    engine = RuleEngine(rules)
+
+    def per_rule(line: str) -> None:
+        for pattern in patterns:
+            if pattern.search(line):
+                break
+
+    cases: dict[str, Callable[[str], object]] = {
+        f"search per rule ({num_rules})": per_rule,
+        "RuleEngine": lambda line: engine.match("execution", line),
+    }
+    for name, case in cases.items():
+        start = perf_counter()
+        for line in lines:
+            case(line)
+        elapsed = perf_counter() - start
+        print(f"  {name:<24} {num_lines / elapsed:>14,.0f} lines/sec")
+
+
+BENCHMARKS: dict[str, Callable[[], None]] = {
+    "log_sink": run_log_sink,
+    "colorize": run_colorize,
+    "rules": run_rules,
+}
+
+
+def main() -> None:
+    """Main entry point."""
+    names = sys.argv[1:] or list(BENCHMARKS)
+    for name in names:
+        if name not in BENCHMARKS:
+            print(f"ERROR: Unknown benchmark {name}", file=sys.stderr)
+            sys.exit(1)
+        print(f"[{name}]")
+        BENCHMARKS[name]()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,212 @@
+"""Beacon node health from its REST API and event stream.
+
+This module subscribes to the local beacon node's server-sent events for new
+heads, finality and reorgs, and polls its sync state and peer count over a
+reused HTTP connection, so the node learns about consensus health without
+scanning log lines.
+"""
+
+from __future__ import annotations
+
+import json
+import threading
+from collections.abc import Iterable, Iterator
+from time import monotonic
+
+import requests
+from rich.console import Console
+
+from staker.config import (
+    BEACON_API_URL,
+    BEACON_EVENT_TIMEOUT,
+    BEACON_EVENT_TOPICS,
+    BEACON_POLL_INTERVAL,
+    BEACON_SYNCED_DISTANCE,
+)
+
+console = Console(highlight=False)
+print = console.print
+
+
+def parse_events(lines: Iterable[str]) -> Iterator[tuple[str, str]]:
+    """Parse a server-sent event stream.
+
+    The data is left for the caller to decode, so one malformed event does
+    not end the stream.
+
+    Args:
+        lines: Decoded lines of the stream.
+
+    Yields:
+        (event name, JSON data text) for each complete event.
+    """
+    event, data = "message", []
+    for line in lines:
+        if not line:
+            if data:
+                yield event, "\n".join(data)
+            event, data = "message", []
+        elif line.startswith("event:"):
+            event = line[6:].strip()
+        elif line.startswith("data:"):
+            data.append(line[5:].strip())
+
+
+class BeaconMonitor:
+    """Tracks the beacon node's head, finality, reorgs, sync state and peers.
+
+    Attributes:
+        url: Base URL of the beacon node's REST API.
+        head_slot: Slot of the latest head event.
+        finalized_epoch: Epoch of the latest finalized checkpoint.
+        reorgs: Number of chain reorgs seen.
+        last_reorg_depth: Depth of the latest reorg.
+        sync: Latest /eth/v1/node/syncing data with numbers parsed.
+        peers: Connected peer count.
+        last_event_at: Monotonic time of the latest event.
+        synced_since: Monotonic time since which the beacon node has been
+            reachable and in sync, or None if it is not.
+    """
+
+    def __init__(
+        self,
+        url: str = BEACON_API_URL,
+        poll_interval: float = BEACON_POLL_INTERVAL,
+        event_timeout: float = BEACON_EVENT_TIMEOUT,
+        synced_distance: int = BEACON_SYNCED_DISTANCE,
+    ) -> None:
+        """Initialize the monitor without starting it.
+
+        Args:
+            url: Base URL of the beacon node's REST API.
+            poll_interval: Seconds between sync and peer polls.
+            event_timeout: Seconds without stream data before reconnecting.
+            synced_distance: Most slots behind that still count as in sync.
+        """
+        self.url = url
+        self.poll_interval = poll_interval
+        self.event_timeout = event_timeout
+        self.synced_distance = synced_distance
+        self.head_slot: int | None = None
+        self.finalized_epoch: int | None = None
+        self.reorgs = 0
+        self.last_reorg_depth: int | None = None
+        self.sync: dict | None = None
+        self.peers: int | None = None
+        self.last_event_at: float | None = None
+        self.synced_since: float | None = None
+        # Sessions keep the connection alive between polls
+        self._session = requests.Session()
+        self._stop = threading.Event()
+
+    def start(self) -> None:
+        """Listen for events and poll in daemon threads until stopped."""
+        threading.Thread(target=self._listen_forever, name="beacon-events", daemon=True).start()
+        threading.Thread(target=self._poll_forever, name="beacon-poll", daemon=True).start()
+
+    def _get(self, path: str) -> dict:
+        """GET a REST endpoint and return its "data" field.
+
+        Args:
+            path: The endpoint path.
+
+        Returns:
+            The response's data.
+        """
+        response = self._session.get(f"{self.url}{path}", timeout=5)
+        response.raise_for_status()
+        return response.json()["data"]
+
+    def poll(self, now: float | None = None) -> None:
+        """Fetch the sync state and peer count.
+
+        Args:
+            now: Monotonic timestamp (defaults to now).
+        """
+        data = self._get("/eth/v1/node/syncing")
+        self.sync = {
+            **data,
+            "head_slot": int(data["head_slot"]),
+            "sync_distance": int(data["sync_distance"]),
+        }
+        if self.sync["is_syncing"] or self.sync["sync_distance"] > self.synced_distance:
+            self.synced_since = None
+        elif self.synced_since is None:
+            self.synced_since = monotonic() if now is None else now
+        self.peers = int(self._get("/eth/v1/node/peer_count")["connected"])
+
+    def _poll_forever(self) -> None:
+        """Poll on the interval until stopped."""
+        while True:
+            try:
+                self.poll()
+            except (requests.exceptions.RequestException, ValueError, KeyError):
+                self.sync = None
+                self.peers = None
+                self.synced_since = None
+            if self._stop.wait(self.poll_interval):
+                return
+
+    def listen(self) -> int:
+        """Consume the event stream until it ends or times out.
+
+        Returns:
+            Number of events handled.
+        """
+        count = 0
+        with requests.get(
+            f"{self.url}/eth/v1/events",
+            params={"topics": ",".join(BEACON_EVENT_TOPICS)},
+            headers={"Accept": "text/event-stream"},
+            stream=True,
+            timeout=(5, self.event_timeout),
+        ) as response:
+            response.raise_for_status()
+            lines = response.iter_lines(decode_unicode=True)
+            for event, data in parse_events(lines):
+                try:
+                    self.handle(event, json.loads(data))
+                except (KeyError, TypeError, ValueError) as e:
+                    print(
+                        f"[bright_yellow]WARNING: Skipped malformed {event} event: {e!r}"
+                        "[/bright_yellow]"
+                    )
+                    continue
+                count += 1
+                if self._stop.is_set():
+                    break
+        return count
+
+    def _listen_forever(self) -> None:
+        """Reconnect to the event stream until stopped."""
+        while not self._stop.is_set():
+            try:
+                self.listen()
+            except (requests.exceptions.RequestException, ValueError):
+                # The beacon node may not be up yet
+                pass
+            except Exception as e:
+                print(f"[bright_yellow]WARNING: Beacon event stream failed: {e!r}[/bright_yellow]")
+            self._stop.wait(self.poll_interval)
+
+    def handle(self, event: str, data: dict) -> None:
+        """Update state from one event.
+
+        Args:
+            event: The event name.
+            data: The event's data.
+        """
+        self.last_event_at = monotonic()
+        if event == "head":
+            self.head_slot = int(data["slot"])
+        elif event == "finalized_checkpoint":
+            self.finalized_epoch = int(data["epoch"])
+        elif event == "chain_reorg":
+            self.reorgs += 1
+            self.last_reorg_depth = int(data["depth"])
+            print(f"Chain reorg at slot {data['slot']}, depth {data['depth']}")
+
+    def stop(self) -> None:
+        """Stop listening and polling."""
+        self._stop.set()
+        self._session.close()
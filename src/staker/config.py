@@ -16,6 +16,52 @@ KILL_TIME: int = 30
 VPN_TIMEOUT: int = 10
 MAX_PEERS: int = 10
 
+# Restart policies per process: "restart-alone", "restart-dependents" or "restart-all"
+RESTART_POLICIES: dict[str, str] = {
+    "vpn": "restart-all",
+    "execution": "restart-dependents",
+    "consensus": "restart-dependents",
+    "validation": "restart-alone",
+    "mev": "restart-alone",
+}
+# Processes that must be restarted along with the key process
+DEPENDENTS: dict[str, tuple[str, ...]] = {
+    "execution": ("consensus",),
+    "consensus": ("validation",),
+}
+# Shutdown order: dependents stop before the clients they use, the VPN last
+SHUTDOWN_ORDER: tuple[str, ...] = ("validation", "mev", "consensus", "execution", "vpn")
+# Seconds each process gets after a signal before escalating (default KILL_TIME).
+# Geth flushes its trie on exit; the SIGINT budgets fit ECS's 120s stop timeout
+SHUTDOWN_BUDGETS: dict[str, float] = {
+    "validation": 10,
+    "mev": 5,
+    "consensus": 20,
+    "execution": 60,
+    "vpn": 5,
+}
+RESTART_BACKOFF: float = 1.0
+MAX_RESTART_BACKOFF: float = 60.0
+# Crashes of one process within the window before terminating the instance
+CRASH_LOOP_THRESHOLD: int = 3
+CRASH_LOOP_WINDOW: int = 600
+# Log rules: a regex searched for in lines of "source" (None for every
+# process), firing after "threshold" matches within "window" seconds. Actions:
+# "soft-restart" (interrupt the stack), "restart-process" (interrupt the
+# source only), "alert" (print and count only) or "terminate" (the instance).
+# Patterns are combined into one regex, so use scoped flags like (?i:...) and
+# no backreferences
+ERROR_RULES: list[dict] = [
+    {
+        "name": "beacon-backfill-failed",
+        "pattern": "Beacon backfilling failed",
+        "source": None,
+        "threshold": 1,
+        "window": 0,
+        "action": "soft-restart",
+    },
+]
+
 
 def get_env_bool(var_name: str) -> bool:
     """Get a boolean value from an environment variable.
@@ -33,15 +79,97 @@ def get_env_bool(var_name: str) -> bool:
 AWS: bool = get_env_bool("AWS")
 DOCKER: bool = get_env_bool("DOCKER")
 VPN: bool = get_env_bool("VPN")
+# Run the asyncio supervisor engine instead of the select loop
+ASYNC_ENGINE: bool = get_env_bool("ASYNC_ENGINE")
+# Write logs.txt as JSONL records parsed once per line instead of prefixed text
+JSON_LOGS: bool = get_env_bool("JSON_LOGS")
 
 # Snapshot configuration
 MAX_SNAPSHOTS: int = 3
 SNAPSHOT_DAYS: int = 30
 MAX_SNAPSHOT_DAYS: int = MAX_SNAPSHOTS * SNAPSHOT_DAYS
 
+# Startup readiness gating
+STARTUP_POLL_INTERVAL: float = 1.0
+BEACON_API_URL: str = "http://localhost:3500"
+
+# Validator indices whose duties planned interruptions avoid (comma-separated)
+VALIDATOR_INDICES: tuple[int, ...] = tuple(
+    int(index) for index in os.environ.get("VALIDATOR_INDICES", "").split(",") if index.strip()
+)
+# Planned interruptions wait at most this long for a duty-free window
+DUTY_GRACE_PERIOD: float = 15 * 60
+# Duties are fetched in the background this often; planned interruptions only
+# read the cached ones
+DUTY_REFRESH_INTERVAL: float = 60.0
+SECONDS_PER_SLOT: int = 12
+SLOTS_PER_EPOCH: int = 32
+
+# Beacon node events subscribed to, and how often sync state and peers are polled
+BEACON_EVENT_TOPICS: tuple[str, ...] = ("head", "finalized_checkpoint", "chain_reorg")
+BEACON_POLL_INTERVAL: float = 30.0
+# Heads arrive every slot, so a stream silent for this long is reconnected
+BEACON_EVENT_TIMEOUT: float = 60.0
+# The beacon node counts as in sync while at most this many slots behind
+BEACON_SYNCED_DISTANCE: int = 2
+
+# geth JSON-RPC over IPC: the poll interval doubles from MIN to MAX while the
+# sync state and peer count stay the same
+IPC_TIMEOUT: float = 5.0
+EXECUTION_POLL_MIN: float = 5.0
+EXECUTION_POLL_MAX: float = 60.0
+# Restart geth if it reports being in sync but its head has not advanced for
+# this long while the beacon node was in sync; without the beacon node feeding
+# it blocks, geth's head cannot move
+EXECUTION_STALL_TIME: float = 600.0
+
+# Prometheus metrics endpoint (port 0 disables it)
+METRICS_HOST: str = os.environ.get("METRICS_HOST", "127.0.0.1")
+METRICS_PORT: int = int(os.environ.get("METRICS_PORT", "0"))
+
+# Child output reading
+READ_CHUNK_BYTES: int = 64 * 1024
+# Seconds to keep reading output once stopped processes have exited
+LOG_DRAIN_TIMEOUT: float = 5.0
+# Console flood control: repeats of a line (ignoring timestamps) within the
+# window print once with a count, and each process may print RATE lines per
+# second in bursts of up to BURST (a RATE of 0 disables the limit)
+CONSOLE_REPEAT_WINDOW: float = 5.0
+CONSOLE_RATE: float = float(os.environ.get("CONSOLE_RATE", "50"))
+CONSOLE_BURST: int = 200
+# Write the throttled console stream to logs.txt instead of every line (text logs only)
+AGGREGATE_LOG_FILE: bool = get_env_bool("AGGREGATE_LOG_FILE")
+
+# Log file buffering
+LOG_BUFFER_BYTES: int = 64 * 1024
+LOG_FLUSH_INTERVAL: float = 1.0
+LOG_FSYNC: str = "close"  # "never", "flush" (every flush) or "close" (on close only)
+# Log rotation: the live file rotates at this size or age into gzipped segments
+LOG_MAX_BYTES: int = int(os.environ.get("LOG_MAX_MB", "100")) * 1024 * 1024
+LOG_MAX_AGE: float = 24 * 60 * 60
+# Rotated segments kept, including the previous run's log
+LOG_RETENTION: int = int(os.environ.get("LOG_RETENTION", "10"))
+# Recent lines kept in memory per process for the query endpoint (port 0
+# disables it) and for the incident file written when a process dies
+LOG_RING_LINES: int = int(os.environ.get("LOG_RING_LINES", "2000"))
+LOG_API_HOST: str = "127.0.0.1"
+LOG_API_PORT: int = int(os.environ.get("LOG_API_PORT", "0"))
+# Incident files kept in the "incidents" directory next to logs.txt
+INCIDENT_RETENTION: int = 20
+
+# Managed client processes in start order, and their log prefixes
+CLIENTS: tuple[str, ...] = ("execution", "consensus", "validation", "mev")
+PREFIXES: dict[str, str] = {
+    "vpn": "xxx OPENVPN__ xxx",
+    "execution": "<<< EXECUTION >>>",
+    "consensus": "[[[ CONSENSUS ]]]",
+    "validation": "(( _VALIDATION ))",
+    "mev": "+++ MEV_BOOST +++",
+}
+
 # Log coloring styles for Rich console
 LOG_STYLES: dict[str, str] = {
-    "OPENVPN": "orange",
+    "OPENVPN": "orange1",
     "EXECUTION": "bold magenta",
     "CONSENSUS": "bold cyan",
     "VALIDATION": "bold yellow",
@@ -87,3 +215,47 @@ RELAYS_HOODI: list[str] = [
 
 # Select relays based on environment
 RELAYS: list[str] = RELAYS_HOODI if DEV else RELAYS_MAINNET
+
+# Relay probing
+RELAY_TRIALS: int = 5
+RELAY_TIMEOUT: float = 10.0
+# Cheap builder API endpoint used to measure relay latency
+RELAY_STATUS_PATH: str = "/eth/v1/builder/status"
+# Upper bound on how long relay probing may hold up startup
+RELAY_PROBE_DEADLINE: float = 30.0
+# Persisted relay scoreboard, stored next to the data directories
+RELAY_CACHE_FILE: str = "relay_scoreboard.json"
+RELAY_CACHE_TTL: float = 6 * 60 * 60
+# Warm latency samples kept per relay
+RELAY_HISTORY: int = 50
+# A relay is dropped only if its p90 is this many scaled MADs above the median p90
+RELAY_OUTLIER_SCORE: float = 3.5
+# ...and also at least this many seconds slower
+RELAY_MIN_EXCESS: float = 0.05
+# Relay feedback from mev-boost's getHeader logs: samples needed before use,
+# and the error rate above which a relay is dropped
+RELAY_MIN_OBSERVATIONS: int = 20
+RELAY_MAX_ERROR_RATE: float = 0.2
+# A relay whose median latency exceeds the getHeader budget of a slot would
+# miss the bid, so it is dropped
+RELAY_SLOT_BUDGET: float = 0.95
+# mev-boost request timeouts are the slowest selected relay's p99 times this
+# margin, clamped to (min, max) seconds per builder API call
+MEV_TIMEOUT_MARGIN: float = 1.5
+MEV_TIMEOUT_BOUNDS: dict[str, tuple[float, float]] = {
+    "getHeader": (0.3, RELAY_SLOT_BUDGET),
+    "getPayload": (1.0, 4.0),
+    "registerValidator": (1.0, 3.0),
+}
+MEV_TIMEOUT_FLAGS: dict[str, str] = {
+    "getHeader": "-request-timeout-getheader",
+    "getPayload": "-request-timeout-getpayload",
+    "registerValidator": "-request-timeout-regval",
+}
+# Background relay health checks (0 disables them)
+RELAY_MONITOR_INTERVAL: float = 300.0
+# Weight of the newest check in each relay's rolling health score
+RELAY_HEALTH_ALPHA: float = 0.5
+# Hysteresis: relays leave the active set at or below LOW, rejoin at or above HIGH
+RELAY_HEALTH_LOW: float = 0.3
+RELAY_HEALTH_HIGH: float = 0.7
@@ -0,0 +1,209 @@
+"""Validator duty lookup for scheduling planned interruptions.
+
+This module keeps the proposer and attester duties of our validators fetched
+from the local beacon node in a background thread and finds the longest
+duty-free window within a grace period, so snapshot pauses and planned
+restarts do not cost a proposal.
+"""
+
+from __future__ import annotations
+
+import threading
+from time import time
+
+import requests
+from rich.console import Console
+
+from staker.config import (
+    BEACON_API_URL,
+    DUTY_GRACE_PERIOD,
+    DUTY_REFRESH_INTERVAL,
+    SECONDS_PER_SLOT,
+    SLOTS_PER_EPOCH,
+    VALIDATOR_INDICES,
+)
+
+console = Console(highlight=False)
+print = console.print
+
+
+def longest_free_window(
+    start: float, end: float, busy: list[tuple[float, float]]
+) -> tuple[float, float]:
+    """Find the longest stretch of [start, end) not covered by busy intervals.
+
+    Args:
+        start: Start of the search range.
+        end: End of the search range.
+        busy: (start, end) intervals, in any order and possibly overlapping.
+
+    Returns:
+        (window start, window length); the earliest one wins ties.
+    """
+    best = (start, 0.0)
+    cursor = start
+    for busy_start, busy_end in sorted(busy):
+        if busy_start > cursor:
+            gap = min(busy_start, end) - cursor
+            if gap > best[1]:
+                best = (cursor, gap)
+        cursor = max(cursor, busy_end)
+        if cursor >= end:
+            return best
+    if end - cursor > best[1]:
+        best = (cursor, end - cursor)
+    return best
+
+
+class DutyScheduler:
+    """Picks when planned interruptions should happen.
+
+    Attributes:
+        indices: Validator indices whose duties are protected.
+        url: Base URL of the beacon node's REST API.
+        grace: Longest seconds an interruption may be deferred.
+        refresh_interval: Seconds between duty fetches.
+        busy: Unix time intervals blocked by duties, or None if unknown.
+        known_until: Unix time up to which duties are known.
+    """
+
+    def __init__(
+        self,
+        indices: tuple[int, ...] = VALIDATOR_INDICES,
+        url: str = BEACON_API_URL,
+        grace: float = DUTY_GRACE_PERIOD,
+        refresh_interval: float = DUTY_REFRESH_INTERVAL,
+    ) -> None:
+        """Initialize the scheduler without fetching duties yet.
+
+        Args:
+            indices: Validator indices whose duties are protected.
+            url: Base URL of the beacon node's REST API.
+            grace: Longest seconds an interruption may be deferred.
+            refresh_interval: Seconds between duty fetches.
+        """
+        self.indices = indices
+        self.url = url
+        self.grace = grace
+        self.refresh_interval = refresh_interval
+        self.busy: list[tuple[float, float]] | None = None
+        self.known_until = 0.0
+        self._genesis_time: int | None = None
+        self._session = requests.Session()
+        self._stop = threading.Event()
+
+    def start(self) -> None:
+        """Fetch duties in a daemon thread until stopped, if there are validators."""
+        if self.indices:
+            threading.Thread(target=self._refresh_forever, name="duties", daemon=True).start()
+
+    def _refresh_forever(self) -> None:
+        """Refresh on the interval until stopped."""
+        while not self._stop.is_set():
+            self.refresh()
+            self._stop.wait(self.refresh_interval)
+
+    def _get(self, path: str) -> list | dict:
+        """GET a REST endpoint and return its "data" field.
+
+        Args:
+            path: The endpoint path.
+
+        Returns:
+            The response's data.
+        """
+        response = self._session.get(f"{self.url}{path}", timeout=5)
+        response.raise_for_status()
+        return response.json()["data"]
+
+    def genesis_time(self) -> int:
+        """Get the chain's genesis time, fetched once.
+
+        Returns:
+            Genesis time as a Unix timestamp.
+        """
+        if self._genesis_time is None:
+            self._genesis_time = int(self._get("/eth/v1/beacon/genesis")["genesis_time"])
+        return self._genesis_time
+
+    def duty_slots(self, epoch: int) -> set[int]:
+        """Get the slots in which our validators propose or attest.
+
+        Args:
+            epoch: The epoch to look up.
+
+        Returns:
+            Slots with at least one duty.
+        """
+        indices = {str(index) for index in self.indices}
+        proposers = self._get(f"/eth/v1/validator/duties/proposer/{epoch}")
+        response = self._session.post(
+            f"{self.url}/eth/v1/validator/duties/attester/{epoch}",
+            json=sorted(indices),
+            timeout=5,
+        )
+        response.raise_for_status()
+        attesters = response.json()["data"]
+        return {
+            int(duty["slot"])
+            for duty in [*proposers, *attesters]
+            if str(duty["validator_index"]) in indices
+        }
+
+    def refresh(self, now: float | None = None) -> bool:
+        """Fetch the duties of the current and next epoch.
+
+        Each duty blocks its own slot and the slot before it.
+
+        Args:
+            now: Unix timestamp (defaults to now).
+
+        Returns:
+            True if the duties were fetched; they are forgotten otherwise.
+        """
+        now = time() if now is None else now
+        try:
+            genesis = self.genesis_time()
+            epoch = int(now - genesis) // SECONDS_PER_SLOT // SLOTS_PER_EPOCH
+            slots = self.duty_slots(epoch) | self.duty_slots(epoch + 1)
+        except (requests.exceptions.RequestException, ValueError, KeyError, TypeError) as e:
+            print(
+                f"[bright_yellow]WARNING: Could not fetch validator duties, not deferring: {e}"
+                "[/bright_yellow]"
+            )
+            self.busy = None
+            return False
+
+        self.known_until = genesis + (epoch + 2) * SLOTS_PER_EPOCH * SECONDS_PER_SLOT
+        self.busy = [
+            (
+                genesis + (slot - 1) * SECONDS_PER_SLOT,
+                genesis + (slot + 1) * SECONDS_PER_SLOT,
+            )
+            for slot in slots
+        ]
+        return True
+
+    def delay(self, now: float | None = None) -> float:
+        """Get how long to wait for the longest duty-free window.
+
+        Only reads the duties last fetched, so it never blocks. Duties are
+        only known for the current and next epoch, which bounds the search.
+
+        Args:
+            now: Unix timestamp (defaults to now).
+
+        Returns:
+            Seconds to wait; 0 if there are no validators or duties are unknown.
+        """
+        busy = self.busy
+        if not self.indices or busy is None:
+            return 0.0
+        now = time() if now is None else now
+        start, _ = longest_free_window(now, min(now + self.grace, self.known_until), busy)
+        return start - now
+
+    def stop(self) -> None:
+        """Stop fetching and close the HTTP session."""
+        self._stop.set()
+        self._session.close()
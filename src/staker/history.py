@@ -0,0 +1,311 @@
+"""Recent client log lines kept in memory for queries and post-mortems.
+
+This module keeps the last lines of each process in a preallocated ring
+buffer, serves tail, level and time queries over them from a localhost HTTP
+endpoint, and writes a process's lines to an incident file when it dies, so
+failures can be investigated without scanning the whole log file.
+"""
+
+from __future__ import annotations
+
+import glob
+import json
+import os
+import threading
+from array import array
+from datetime import UTC, datetime
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import parse_qs, urlsplit
+
+from staker.config import (
+    INCIDENT_RETENTION,
+    LOG_API_HOST,
+    LOG_API_PORT,
+    LOG_RING_LINES,
+    PREFIXES,
+)
+from staker.records import Record, parse_record
+
+# Severity of each client log level, for "at least this level" queries
+SEVERITIES: dict[str, int] = {
+    "trace": 0,
+    "debug": 1,
+    "info": 2,
+    "warn": 3,
+    "warning": 3,
+    "error": 4,
+    "crit": 5,
+    "fatal": 5,
+    "panic": 5,
+}
+# Severity slot of a line whose level was not parsed when it was stored
+UNPARSED = -2
+
+
+class LogRing:
+    """Fixed-size buffer of a process's most recent lines.
+
+    All slots are allocated up front; appending overwrites the oldest line.
+    Lines can be stored with the severity of their already parsed level, so
+    level queries only parse the lines stored without one.
+
+    Attributes:
+        size: Number of lines kept.
+    """
+
+    def __init__(self, size: int) -> None:
+        """Allocate empty slots.
+
+        Args:
+            size: Number of lines kept.
+        """
+        self.size = size
+        self._times = array("d", bytes(8 * size))
+        self._severities = array("b", [UNPARSED]) * size
+        self._lines: list[str] = [""] * size
+        self._next = 0
+        self._count = 0
+
+    def append(self, line: str, ts: float, severity: int = UNPARSED) -> None:
+        """Store a line in the oldest slot.
+
+        Args:
+            line: The line without prefix.
+            ts: Unix time the line was received.
+            severity: Severity of the line's level, -1 if it has none, or
+                UNPARSED if its level was not parsed.
+        """
+        i = self._next
+        self._times[i] = ts
+        self._severities[i] = severity
+        self._lines[i] = line
+        self._next = (i + 1) % self.size
+        if self._count < self.size:
+            self._count += 1
+
+    def entries(self) -> list[tuple[float, str]]:
+        """Get the stored lines, oldest first.
+
+        Returns:
+            (unix time, line) pairs.
+        """
+        return [(self._times[i], self._lines[i]) for i in self._slots()]
+
+    def severities(self) -> list[int]:
+        """Get the stored severities, in the order of ``entries``.
+
+        Returns:
+            Severity of each line, -1 if it has no level, or UNPARSED.
+        """
+        return [self._severities[i] for i in self._slots()]
+
+    def _slots(self) -> list[int]:
+        """Get the indexes of the stored lines, oldest first.
+
+        Returns:
+            Slot indexes.
+        """
+        start = (self._next - self._count) % self.size
+        return [(start + k) % self.size for k in range(self._count)]
+
+
+class LogHistory:
+    """Ring buffers of every process and the queries served over them.
+
+    Attributes:
+        rings: Ring buffer per process name.
+    """
+
+    def __init__(
+        self, size: int = LOG_RING_LINES, names: tuple[str, ...] = tuple(PREFIXES)
+    ) -> None:
+        """Allocate a ring for each process.
+
+        Args:
+            size: Lines kept per process.
+            names: Process names.
+        """
+        self.rings = {name: LogRing(size) for name in names}
+
+    def record(self, source: str, line: str, ts: float, record: Record | None = None) -> None:
+        """Keep a line of a process; lines of unknown sources are ignored.
+
+        Args:
+            source: Process name.
+            line: The line without prefix.
+            ts: Unix time the line was received.
+            record: The line's record if it was already parsed, so level
+                queries need not parse it again.
+        """
+        ring = self.rings.get(source)
+        if ring is not None:
+            severity = UNPARSED if record is None else SEVERITIES.get(record.level or "", -1)
+            ring.append(line, ts, severity)
+
+    def query(
+        self,
+        source: str | None = None,
+        tail: int | None = None,
+        level: str | None = None,
+        since: float | None = None,
+    ) -> list[dict]:
+        """Get stored lines matching all given filters, oldest first.
+
+        Args:
+            source: Only this process's lines.
+            tail: Only the newest this many matching lines.
+            level: Only lines at this level or more severe.
+            since: Only lines received at or after this unix time.
+
+        Returns:
+            Dicts with "ts", "src" and "line".
+
+        Raises:
+            ValueError: If the process or level is unknown or tail is negative.
+        """
+        if tail is not None and tail < 0:
+            raise ValueError(f"Negative tail: {tail}")
+        if source is not None and source not in self.rings:
+            raise ValueError(f"Unknown process: {source}")
+        if level is not None and level not in SEVERITIES:
+            raise ValueError(f"Unknown level: {level}")
+        names = [source] if source else list(self.rings)
+        entries = [
+            (ts, name, line, severity)
+            for name in names
+            for (ts, line), severity in zip(
+                self.rings[name].entries(), self.rings[name].severities(), strict=True
+            )
+        ]
+        if since is not None:
+            entries = [entry for entry in entries if entry[0] >= since]
+        if level is not None:
+            # Only lines stored without their level are parsed, never on the logging path
+            minimum = SEVERITIES[level]
+            entries = [
+                entry
+                for entry in entries
+                if (entry[3] if entry[3] != UNPARSED else self._severity(*entry[:3])) >= minimum
+            ]
+        if len(names) > 1:
+            entries.sort(key=lambda entry: entry[0])
+        if tail is not None:
+            entries = entries[len(entries) - tail :] if tail < len(entries) else entries
+        return [{"ts": ts, "src": name, "line": line} for ts, name, line, _ in entries]
+
+    @staticmethod
+    def _severity(ts: float, name: str, line: str) -> int:
+        """Parse the severity of a line stored without its level.
+
+        Args:
+            ts: Unix time the line was received.
+            name: Process name.
+            line: The line without prefix.
+
+        Returns:
+            Severity of the line's level, or -1 if it has none.
+        """
+        return SEVERITIES.get(parse_record(name, line, ts).level or "", -1)
+
+    def dump(self, name: str, directory: str, reason: str) -> str:
+        """Write a process's stored lines to a new incident file.
+
+        Only the newest INCIDENT_RETENTION incident files are kept.
+
+        Args:
+            name: The process name.
+            directory: Directory for incident files (created if missing).
+            reason: Header describing the incident, e.g. the exit code.
+
+        Returns:
+            Path to the incident file.
+        """
+        os.makedirs(directory, exist_ok=True)
+        stamp = datetime.now(UTC).strftime("%Y%m%dT%H%M%S%f")
+        path = os.path.join(directory, f"{stamp}-{name}.log")
+        with open(path, "w", encoding="utf-8") as f:
+            f.write(f"# {name}: {reason}\n")
+            for ts, line in self.rings[name].entries():
+                f.write(f"{datetime.fromtimestamp(ts, UTC).isoformat()} {line}\n")
+        incidents = sorted(glob.glob(os.path.join(glob.escape(directory), "*.log")))
+        for old in incidents[: max(0, len(incidents) - INCIDENT_RETENTION)]:
+            os.remove(old)
+        return path
+
+
+class LogHandler(BaseHTTPRequestHandler):
+    """Serves ring buffer queries on /logs as JSON.
+
+    Query parameters: process, tail, level and since (unix time).
+    """
+
+    def do_GET(self) -> None:
+        """Respond with the matching lines, 400 for bad queries or 404 for other paths."""
+        url = urlsplit(self.path)
+        if url.path != "/logs":
+            self.send_error(404)
+            return
+        params = {key: values[-1] for key, values in parse_qs(url.query).items()}
+        try:
+            lines = self.server.history.query(
+                source=params.get("process"),
+                tail=int(params["tail"]) if "tail" in params else None,
+                level=params.get("level", "").lower() or None,
+                since=float(params["since"]) if "since" in params else None,
+            )
+        except ValueError as e:
+            self.send_error(400, str(e))
+            return
+        body = json.dumps(lines, separators=(",", ":"), ensure_ascii=False).encode()
+        self.send_response(200)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, *args) -> None:
+        """Keep queries out of the node's logs."""
+
+
+class LogServer:
+    """Built-in HTTP endpoint for querying recent log lines.
+
+    Attributes:
+        host: Address to bind.
+        port: Port to bind (0 disables the endpoint unless started explicitly).
+    """
+
+    def __init__(
+        self,
+        history: LogHistory,
+        host: str = LOG_API_HOST,
+        port: int = LOG_API_PORT,
+    ) -> None:
+        """Initialize the endpoint without binding it yet.
+
+        Args:
+            history: The ring buffers to query.
+            host: Address to bind.
+            port: Port to bind.
+        """
+        self.history = history
+        self.host = host
+        self.port = port
+        self._server: ThreadingHTTPServer | None = None
+
+    def start(self) -> None:
+        """Bind the endpoint and serve queries from a daemon thread."""
+        server = ThreadingHTTPServer((self.host, self.port), LogHandler)
+        server.daemon_threads = True
+        server.history = self.history
+        self.port = server.server_port
+        self._server = server
+        threading.Thread(target=server.serve_forever, name="logs", daemon=True).start()
+        print(f"Serving recent logs on http://{self.host}:{self.port}/logs")
+
+    def stop(self) -> None:
+        """Stop serving, if started."""
+        if self._server is not None:
+            self._server.shutdown()
+            self._server.server_close()
+            self._server = None
@@ -0,0 +1,120 @@
+"""Latency statistics for relay selection.
+
+This module keeps bounded latency histories in compact ``array`` buffers and
+provides the percentile and median/MAD helpers used to spot relays whose
+tail latency is too slow.
+"""
+
+from __future__ import annotations
+
+from array import array
+from collections.abc import Iterable, Iterator, Sequence
+from statistics import median
+
+# Scale the median / mean absolute deviation to estimate the standard
+# deviation of normal data
+MAD_SCALE = 1.4826
+MEAN_AD_SCALE = 1.2533
+
+
+def percentile(sorted_samples: Sequence[float], q: float) -> float:
+    """Get a percentile by linear interpolation between closest ranks.
+
+    Args:
+        sorted_samples: Non-empty samples in ascending order.
+        q: Percentile between 0 and 100.
+
+    Returns:
+        The interpolated percentile.
+    """
+    rank = (len(sorted_samples) - 1) * q / 100
+    low = int(rank)
+    high = min(low + 1, len(sorted_samples) - 1)
+    return sorted_samples[low] + (sorted_samples[high] - sorted_samples[low]) * (rank - low)
+
+
+class LatencyWindow:
+    """The most recent latency samples in a preallocated ring buffer.
+
+    Attributes:
+        capacity: Maximum number of samples kept.
+    """
+
+    def __init__(self, capacity: int, samples: Iterable[float] = ()) -> None:
+        """Initialize the window.
+
+        Args:
+            capacity: Maximum number of samples kept.
+            samples: Initial samples, oldest first.
+        """
+        self.capacity = capacity
+        self._buffer = array("d", bytes(8 * capacity))
+        self._start = 0
+        self._size = 0
+        self.extend(samples)
+
+    def __len__(self) -> int:
+        """Return the number of samples held."""
+        return self._size
+
+    def __iter__(self) -> Iterator[float]:
+        """Iterate over the samples, oldest first."""
+        for i in range(self._size):
+            yield self._buffer[(self._start + i) % self.capacity]
+
+    def add(self, sample: float) -> None:
+        """Add a sample, evicting the oldest one when full.
+
+        Args:
+            sample: Latency in seconds.
+        """
+        end = (self._start + self._size) % self.capacity
+        self._buffer[end] = sample
+        if self._size < self.capacity:
+            self._size += 1
+        else:
+            self._start = (self._start + 1) % self.capacity
+
+    def extend(self, samples: Iterable[float]) -> None:
+        """Add several samples, oldest first.
+
+        Args:
+            samples: Latencies in seconds.
+        """
+        for sample in samples:
+            self.add(sample)
+
+    def tolist(self) -> list[float]:
+        """Get the samples as a list, oldest first."""
+        return list(self)
+
+    def percentiles(self) -> dict[str, float]:
+        """Get the p50, p90 and p99 of the samples.
+
+        Returns:
+            Mapping of "p50"/"p90"/"p99" to seconds; empty if there are no samples.
+        """
+        if not self._size:
+            return {}
+        ordered = sorted(self)
+        return {f"p{q}": percentile(ordered, q) for q in (50, 90, 99)}
+
+
+def robust_scores(values: dict[str, float]) -> tuple[float, float, dict[str, float]]:
+    """Score values by how many scaled MADs they lie above the median.
+
+    Args:
+        values: Value per key, e.g. p90 latency per relay.
+
+    Returns:
+        Tuple of (median, MAD, score per key). When most values are equal the
+        MAD is 0, so the mean absolute deviation is used to scale instead;
+        scores are all 0 only if every value is equal.
+    """
+    center = median(values.values())
+    deviations = [abs(value - center) for value in values.values()]
+    mad = median(deviations)
+    scale = MAD_SCALE * mad or MEAN_AD_SCALE * sum(deviations) / len(deviations)
+    if not scale:
+        return center, mad, dict.fromkeys(values, 0.0)
+    return center, mad, {key: (value - center) / scale for key, value in values.items()}
@@ -0,0 +1,226 @@
+"""Buffered log file output for the Ethereum staking node.
+
+This module provides a long-lived log sink that keeps a single file handle
+open and batches lines in memory, so the hot logging path never pays an
+open/close syscall pair per line. The file is rotated by size and age, and
+rotated segments are gzipped and pruned by a background worker.
+"""
+
+from __future__ import annotations
+
+import contextlib
+import glob
+import gzip
+import logging
+import os
+import queue
+import shutil
+import threading
+from datetime import UTC, datetime
+from time import monotonic
+
+from staker.config import (
+    LOG_BUFFER_BYTES,
+    LOG_FLUSH_INTERVAL,
+    LOG_FSYNC,
+    LOG_MAX_AGE,
+    LOG_MAX_BYTES,
+    LOG_RETENTION,
+)
+
+FSYNC_POLICIES: tuple[str, ...] = ("never", "flush", "close")
+
+
+class LogSink:
+    """Append-only log writer with a bounded in-memory buffer.
+
+    Lines are buffered until either the buffer reaches ``buffer_bytes`` or
+    ``flush_interval`` seconds have passed since the last flush. A daemon
+    thread flushes stale buffers so quiet periods still reach disk.
+
+    Once the file reaches ``max_bytes`` or ``max_age`` it is renamed to a
+    timestamped segment and reopened. Another daemon thread syncs and gzips
+    segments and keeps the newest ``retention`` of them.
+
+    Attributes:
+        path: Path to the log file.
+        buffer_bytes: Buffered size that triggers a flush.
+        flush_interval: Maximum age in seconds of buffered lines.
+        fsync: When to fsync: "never", "flush" or "close".
+        max_bytes: File size that triggers a rotation.
+        max_age: Seconds after which a non-empty file is rotated.
+        retention: Number of rotated segments kept.
+    """
+
+    def __init__(
+        self,
+        path: str,
+        buffer_bytes: int = LOG_BUFFER_BYTES,
+        flush_interval: float = LOG_FLUSH_INTERVAL,
+        fsync: str = LOG_FSYNC,
+        max_bytes: int = LOG_MAX_BYTES,
+        max_age: float = LOG_MAX_AGE,
+        retention: int = LOG_RETENTION,
+    ) -> None:
+        """Open the log file for appending and start the worker threads.
+
+        Args:
+            path: Path to the log file.
+            buffer_bytes: Buffered size that triggers a flush.
+            flush_interval: Maximum age in seconds of buffered lines.
+            fsync: When to fsync: "never", "flush" or "close".
+            max_bytes: File size that triggers a rotation.
+            max_age: Seconds after which a non-empty file is rotated.
+            retention: Number of rotated segments kept.
+
+        Raises:
+            ValueError: If the fsync policy is unknown.
+        """
+        if fsync not in FSYNC_POLICIES:
+            raise ValueError(f"Unknown fsync policy: {fsync}")
+        self.path = path
+        self.buffer_bytes = buffer_bytes
+        self.flush_interval = flush_interval
+        self.fsync = fsync
+        self.max_bytes = max_bytes
+        self.max_age = max_age
+        self.retention = retention
+        self._file = open(path, "a", encoding="utf-8")  # noqa: SIM115 - long-lived handle
+        self._opened_at = monotonic()
+        self._lines: list[str] = []
+        self._size = 0
+        self._last_flush = monotonic()
+        self._lock = threading.Lock()
+        self._closed = threading.Event()
+        self._segments: queue.Queue[str | None] = queue.Queue()
+        self._flusher = threading.Thread(target=self._flush_periodically, daemon=True)
+        self._flusher.start()
+        self._compressor = threading.Thread(target=self._compress_segments, daemon=True)
+        self._compressor.start()
+
+    def write(self, line: str) -> None:
+        """Buffer a line, flushing if the buffer is full.
+
+        Args:
+            line: The log line, without a trailing newline.
+        """
+        with self._lock:
+            self._lines.append(line)
+            self._size += len(line) + 1
+            if self._size >= self.buffer_bytes:
+                self._flush_locked()
+
+    def flush(self) -> None:
+        """Write all buffered lines to the file."""
+        with self._lock:
+            self._flush_locked()
+
+    def rotate(self) -> None:
+        """Flush and rotate the file now if it has any content.
+
+        Called on startup so the previous run's log is kept as a segment.
+        Segments a previous run did not get to compress are queued first.
+        """
+        for part in glob.glob(f"{glob.escape(self.path)}.*.part"):
+            with contextlib.suppress(OSError):
+                os.remove(part)
+        for segment in self._segment_files():
+            if not segment.endswith(".gz"):
+                self._segments.put(segment)
+        with self._lock:
+            self._flush_locked()
+            if self._file.tell():
+                self._rotate_locked()
+
+    def close(self) -> None:
+        """Flush remaining lines, stop the workers and close the file.
+
+        Segments still waiting for compression are compressed on the next
+        startup's ``rotate``.
+        """
+        self._closed.set()
+        self._segments.put(None)
+        with self._lock:
+            if self._file.closed:
+                return
+            self._flush_locked()
+            if self.fsync != "never":
+                os.fsync(self._file.fileno())
+            self._file.close()
+
+    def _flush_locked(self) -> None:
+        """Write buffered lines to the file. Caller must hold the lock."""
+        self._last_flush = monotonic()
+        if not self._lines or self._file.closed:
+            return
+        self._lines.append("")
+        self._file.write("\n".join(self._lines))
+        self._file.flush()
+        if self.fsync == "flush":
+            os.fsync(self._file.fileno())
+        self._lines = []
+        self._size = 0
+        if self._file.tell() >= self.max_bytes or monotonic() - self._opened_at >= self.max_age:
+            self._rotate_locked()
+
+    def _rotate_locked(self) -> None:
+        """Rename the file to a new segment and reopen it. Caller must hold the lock.
+
+        The segment is synced by the compressor, so writers never wait on the disk here.
+        """
+        self._file.close()
+        stamp = datetime.now(UTC).strftime("%Y%m%dT%H%M%S%f")
+        segment = f"{self.path}.{stamp}"
+        os.replace(self.path, segment)
+        self._file = open(self.path, "a", encoding="utf-8")  # noqa: SIM115 - long-lived handle
+        self._opened_at = monotonic()
+        self._segments.put(segment)
+
+    def _flush_periodically(self) -> None:
+        """Flush the buffer whenever it is older than the flush interval."""
+        while not self._closed.wait(self.flush_interval):
+            with self._lock:
+                if monotonic() - self._last_flush >= self.flush_interval:
+                    self._flush_locked()
+
+    def _segment_files(self) -> list[str]:
+        """Get rotated segments, compressed or not, oldest first."""
+        return sorted(
+            segment
+            for segment in glob.glob(f"{glob.escape(self.path)}.*")
+            if not segment.endswith(".part")
+        )
+
+    def _compress_segments(self) -> None:
+        """Sync, gzip and prune queued segments until the sink is closed.
+
+        Unless the fsync policy is "never", a segment is synced before it
+        is compressed and the compressed copy before it replaces it.
+        """
+        while (segment := self._segments.get()) is not None:
+            try:
+                # Write under a temporary name so a crash never leaves a truncated .gz
+                with open(segment, "rb") as src, open(f"{segment}.gz.part", "wb") as raw:
+                    if self.fsync != "never":
+                        os.fsync(src.fileno())
+                    with gzip.GzipFile(fileobj=raw, mode="wb", compresslevel=6) as dst:
+                        shutil.copyfileobj(src, dst)
+                    if self.fsync != "never":
+                        raw.flush()
+                        os.fsync(raw.fileno())
+                os.replace(f"{segment}.gz.part", f"{segment}.gz")
+                os.remove(segment)
+            except FileNotFoundError:
+                # Pruned before its turn came
+                pass
+            except OSError as e:
+                logging.exception(e)
+            self._prune()
+
+    def _prune(self) -> None:
+        """Delete all but the newest ``retention`` segments."""
+        stems = sorted({segment.removesuffix(".gz") for segment in self._segment_files()})
+        for stem in stems[: max(0, len(stems) - self.retention)]:
+            for old in (stem, f"{stem}.gz"):
+                with contextlib.suppress(FileNotFoundError):
+                    os.remove(old)
@@ -0,0 +1,377 @@
+"""Prometheus metrics for the Ethereum staking node.
+
+This module keeps the node's counters in preallocated arrays, so the log hot
+path only increments numbers in place, and serves them together with
+process, snapshot, relay, startup and shutdown state in the Prometheus text format
+from a small built-in HTTP endpoint.
+"""
+
+from __future__ import annotations
+
+import threading
+from array import array
+from collections.abc import Callable
+from datetime import UTC, datetime
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from time import monotonic
+from typing import TYPE_CHECKING
+
+from staker.config import METRICS_HOST, METRICS_PORT, PREFIXES
+
+if TYPE_CHECKING:
+    from staker.node import Node
+
+CONTENT_TYPE = "text/plain; version=0.0.4; charset=utf-8"
+
+
+def escape(value: str) -> str:
+    """Escape a label value for the Prometheus text format.
+
+    Args:
+        value: The raw label value.
+
+    Returns:
+        The escaped value.
+    """
+    return value.replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n")
+
+
+def quantile(name: str) -> str:
+    """Convert a percentile name to a Prometheus quantile label value.
+
+    Args:
+        name: Percentile name such as "p90".
+
+    Returns:
+        The quantile, e.g. "0.9".
+    """
+    return f"{int(name[1:]) / 100:g}"
+
+
+class Metrics:
+    """Per-process counters and the renderer for everything exported.
+
+    Attributes:
+        names: Process names, in the order of the counter arrays.
+        lines: Log lines printed per process.
+        bytes: Log bytes printed per process.
+        restarts: Times each process was started again after its first start.
+        started_at: Monotonic time each process last started (0 if never).
+    """
+
+    def __init__(self, names: tuple[str, ...] = tuple(PREFIXES)) -> None:
+        """Allocate zeroed counters for each process.
+
+        Args:
+            names: Process names; each must have a prefix in PREFIXES.
+        """
+        self.names = names
+        self._by_prefix = {PREFIXES[name]: i for i, name in enumerate(names)}
+        self._by_name = {name: i for i, name in enumerate(names)}
+        self.lines = array("Q", bytes(8 * len(names)))
+        self.bytes = array("Q", bytes(8 * len(names)))
+        self.restarts = array("Q", bytes(8 * len(names)))
+        self.started_at = array("d", bytes(8 * len(names)))
+
+    def count_line(self, prefix: str, size: int) -> None:
+        """Count one printed log line.
+
+        Args:
+            prefix: The process prefix of the line.
+            size: Length of the raw line in bytes.
+        """
+        i = self._by_prefix.get(prefix)
+        if i is not None:
+            self.lines[i] += 1
+            self.bytes[i] += size
+
+    def process_started(self, name: str, now: float | None = None) -> None:
+        """Record that a process was (re)started.
+
+        Args:
+            name: The process name.
+            now: Monotonic timestamp (defaults to now).
+        """
+        i = self._by_name[name]
+        if self.started_at[i]:
+            self.restarts[i] += 1
+        self.started_at[i] = monotonic() if now is None else now
+
+    def render(self, node: Node) -> str:
+        """Format all metrics in the Prometheus text format.
+
+        Args:
+            node: The node whose state is exported.
+
+        Returns:
+            The exposition text.
+        """
+        now = monotonic()
+        running = {meta["name"] for meta in list(node.processes) if meta["process"].poll() is None}
+        out: list[str] = []
+
+        def family(name: str, kind: str, help_text: str, samples: list[tuple[str, float]]) -> None:
+            out.append(f"# HELP {name} {help_text}")
+            out.append(f"# TYPE {name} {kind}")
+            out.extend(f"{name}{labels} {value:g}" for labels, value in samples)
+
+        processes = [(name, f'{{process="{name}"}}') for name in self.names]
+        family(
+            "staker_process_up",
+            "gauge",
+            "Whether the process is running.",
+            [(labels, float(name in running)) for name, labels in processes],
+        )
+        family(
+            "staker_process_restarts_total",
+            "counter",
+            "Times the process was started again.",
+            [(labels, self.restarts[i]) for i, (_, labels) in enumerate(processes)],
+        )
+        family(
+            "staker_process_uptime_seconds",
+            "gauge",
+            "Seconds since the running process started.",
+            [
+                (labels, now - self.started_at[i])
+                for i, (name, labels) in enumerate(processes)
+                if name in running and self.started_at[i]
+            ],
+        )
+        family(
+            "staker_log_lines_total",
+            "counter",
+            "Log lines printed by the process.",
+            [(labels, self.lines[i]) for i, (_, labels) in enumerate(processes)],
+        )
+        family(
+            "staker_log_bytes_total",
+            "counter",
+            "Log bytes printed by the process.",
+            [(labels, self.bytes[i]) for i, (_, labels) in enumerate(processes)],
+        )
+        throttle = node.throttle
+        family(
+            "staker_console_repeats_total",
+            "counter",
+            "Repeated log lines collapsed on the console.",
+            [(labels, throttle.repeats.get(PREFIXES[name], 0)) for name, labels in processes],
+        )
+        family(
+            "staker_console_dropped_total",
+            "counter",
+            "Log lines held back from the console by the rate limit.",
+            [(labels, throttle.dropped.get(PREFIXES[name], 0)) for name, labels in processes],
+        )
+
+        snapshot = node.most_recent
+        if snapshot and "StartTime" in snapshot:
+            created = snapshot["StartTime"].replace(tzinfo=None)
+            age = datetime.now(UTC).replace(tzinfo=None) - created
+            family(
+                "staker_snapshot_age_seconds",
+                "gauge",
+                "Seconds since the most recent snapshot was started.",
+                [("", age.total_seconds())],
+            )
+
+        chain = node.chain.status
+        if chain is not None:
+            family("staker_execution_block", "gauge", "geth's head block.", [("", chain.block)])
+            family(
+                "staker_execution_highest_block",
+                "gauge",
+                "Highest block geth knows of.",
+                [("", chain.highest)],
+            )
+            family(
+                "staker_execution_syncing",
+                "gauge",
+                "Whether geth is syncing.",
+                [("", float(chain.syncing))],
+            )
+            family("staker_execution_peers", "gauge", "geth's peer count.", [("", chain.peers)])
+            family(
+                "staker_execution_stalled",
+                "gauge",
+                "Whether geth's head has not advanced for its stall time.",
+                [("", float(node.chain.stalled()))],
+            )
+            if chain.inbound is not None:
+                family(
+                    "staker_execution_inbound_peers",
+                    "gauge",
+                    "geth's inbound peer count.",
+                    [("", chain.inbound)],
+                )
+
+        beacon = node.beacon
+        beacon_gauges = [
+            ("staker_beacon_head_slot", "Slot of the latest head event.", beacon.head_slot),
+            (
+                "staker_beacon_finalized_epoch",
+                "Epoch of the latest finalized checkpoint.",
+                beacon.finalized_epoch,
+            ),
+            ("staker_beacon_peers", "Beacon node's connected peers.", beacon.peers),
+        ]
+        sync = beacon.sync
+        if sync is not None:
+            beacon_gauges += [
+                (
+                    "staker_beacon_sync_distance",
+                    "Slots behind the chain head.",
+                    sync["sync_distance"],
+                ),
+                (
+                    "staker_beacon_syncing",
+                    "Whether the beacon node is syncing.",
+                    sync["is_syncing"],
+                ),
+            ]
+        for name, help_text, value in beacon_gauges:
+            if value is not None:
+                family(name, "gauge", help_text, [("", float(value))])
+        family("staker_beacon_reorgs_total", "counter", "Chain reorgs seen.", [("", beacon.reorgs)])
+
+        family(
+            "staker_relay_probe_latency_seconds",
+            "gauge",
+            "Warm relay ping latency percentiles.",
+            [
+                (f'{{relay="{escape(relay)}",quantile="{quantile(name)}"}}', seconds)
+                for relay, stats in node.booster.latency_percentiles().items()
+                for name, seconds in stats.items()
+            ],
+        )
+        feedback = node.booster.feedback.summary()
+        requests: list[tuple[str, float]] = []
+        errors: list[tuple[str, float]] = []
+        latency: list[tuple[str, float]] = []
+        for relay, methods in feedback.items():
+            for method, stats in methods.items():
+                labels = f'relay="{escape(relay)}",method="{method}"'
+                requests.append((f"{{{labels}}}", stats.pop("requests")))
+                errors.append((f"{{{labels}}}", stats.pop("errors")))
+                latency.extend(
+                    (f'{{{labels},quantile="{quantile(name)}"}}', seconds)
+                    for name, seconds in stats.items()
+                )
+        family(
+            "staker_relay_requests_total",
+            "counter",
+            "Builder API requests mev-boost logged per relay.",
+            requests,
+        )
+        family(
+            "staker_relay_request_errors_total",
+            "counter",
+            "Failed builder API requests mev-boost logged per relay.",
+            errors,
+        )
+        family(
+            "staker_relay_request_latency_seconds",
+            "gauge",
+            "Builder API request latency percentiles from mev-boost's logs.",
+            latency,
+        )
+
+        startup = node.startup
+        family(
+            "staker_startup_phase_seconds",
+            "gauge",
+            "Duration of each startup phase of the latest start.",
+            [
+                (f'{{phase="{phase}"}}', seconds)
+                for phase, seconds in (dict(startup.durations) if startup else {}).items()
+            ],
+        )
+        family(
+            "staker_shutdown_stage_seconds",
+            "gauge",
+            "Seconds each process took to stop in the latest shutdown.",
+            [
+                (f'{{process="{escape(name)}"}}', seconds)
+                for name, seconds in dict(node.shutdown_durations).items()
+            ],
+        )
+        rules = node.rules
+        family(
+            "staker_error_rule_hits_total",
+            "counter",
+            "Log lines matching the error rule's pattern.",
+            [(f'{{rule="{escape(name)}"}}', hits) for name, hits in rules.hits.items()],
+        )
+        family(
+            "staker_error_rule_fired_total",
+            "counter",
+            "Times the error rule reached its threshold and acted.",
+            [
+                (f'{{rule="{escape(rule.name)}",action="{rule.action}"}}', rules.fired[rule.name])
+                for rule in rules.rules
+            ],
+        )
+        return "\n".join(out) + "\n"
+
+
+class MetricsHandler(BaseHTTPRequestHandler):
+    """Serves the exposition text on /metrics."""
+
+    def do_GET(self) -> None:
+        """Respond with the current metrics, or 404 for other paths."""
+        if self.path.split("?")[0] != "/metrics":
+            self.send_error(404)
+            return
+        body = self.server.render().encode()
+        self.send_response(200)
+        self.send_header("Content-Type", CONTENT_TYPE)
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, *args) -> None:
+        """Keep scrapes out of the node's logs."""
+
+
+class MetricsServer:
+    """Built-in HTTP endpoint for Prometheus scrapes.
+
+    Attributes:
+        host: Address to bind.
+        port: Port to bind (0 disables the endpoint unless started explicitly).
+    """
+
+    def __init__(
+        self,
+        render: Callable[[], str],
+        host: str = METRICS_HOST,
+        port: int = METRICS_PORT,
+    ) -> None:
+        """Initialize the endpoint without binding it yet.
+
+        Args:
+            render: Produces the exposition text for each scrape.
+            host: Address to bind.
+            port: Port to bind.
+        """
+        self.render = render
+        self.host = host
+        self.port = port
+        self._server: ThreadingHTTPServer | None = None
+
+    def start(self) -> None:
+        """Bind the endpoint and serve scrapes from a daemon thread."""
+        server = ThreadingHTTPServer((self.host, self.port), MetricsHandler)
+        server.daemon_threads = True
+        server.render = self.render
+        self.port = server.server_port
+        self._server = server
+        threading.Thread(target=server.serve_forever, name="metrics", daemon=True).start()
+        print(f"Serving metrics on http://{self.host}:{self.port}/metrics")
+
+    def stop(self) -> None:
+        """Stop serving, if started."""
+        if self._server is not None:
+            self._server.shutdown()
+            self._server.server_close()
+            self._server = None
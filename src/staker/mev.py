@@ -1,87 +1,676 @@
 """MEV-Boost relay management for the Ethereum staking node.
 
 This module handles the selection of reliable MEV relays by testing their
-response times and filtering out unreliable ones.
+response times over pooled keep-alive connections and filtering out
+unreliable ones.
 """
 
-from statistics import mean, stdev
-from time import sleep, time
+import contextlib
+import http.client
+import json
+import os
+import socket
+import ssl
+import threading
+from concurrent.futures import ThreadPoolExecutor, wait
+from time import monotonic, perf_counter, sleep, time
+from typing import NamedTuple
+from urllib.parse import urlsplit
 
-import requests
+from rich.console import Console
 
-from staker.config import RELAYS
+from staker.config import (
+    MEV_TIMEOUT_BOUNDS,
+    MEV_TIMEOUT_MARGIN,
+    RELAY_CACHE_TTL,
+    RELAY_HEALTH_ALPHA,
+    RELAY_HEALTH_HIGH,
+    RELAY_HEALTH_LOW,
+    RELAY_HISTORY,
+    RELAY_MAX_ERROR_RATE,
+    RELAY_MIN_EXCESS,
+    RELAY_MIN_OBSERVATIONS,
+    RELAY_MONITOR_INTERVAL,
+    RELAY_OUTLIER_SCORE,
+    RELAY_PROBE_DEADLINE,
+    RELAY_SLOT_BUDGET,
+    RELAY_STATUS_PATH,
+    RELAY_TIMEOUT,
+    RELAY_TRIALS,
+    RELAYS,
+)
+from staker.latency import LatencyWindow, robust_scores
+from staker.mevlog import RelayLogStats
+
+console = Console(highlight=False)
+print = console.print
+
+
+class Timing(NamedTuple):
+    """Phase breakdown of a single relay request, in seconds."""
+
+    connect: float
+    tls: float
+    ttfb: float
+    total: float
+
+
+class RelayConnection:
+    """A pooled keep-alive HTTP(S) connection to one relay.
+
+    Opens the TCP connection and TLS session itself so that each phase can
+    be timed separately, then reuses them for later requests.
+
+    Attributes:
+        url: The relay URL.
+        host: The relay hostname (the pubkey userinfo is dropped).
+        port: The relay port.
+        handshake: Timing of the most recent request that had to connect.
+    """
+
+    def __init__(self, url: str, context: ssl.SSLContext | None = None) -> None:
+        """Initialize the connection without opening it.
+
+        Args:
+            url: The relay URL, e.g. ``https://0xpubkey@relay.example``.
+            context: TLS context for https relays (defaults to system CAs).
+        """
+        parts = urlsplit(url)
+        self.url = url
+        self.host = parts.hostname or ""
+        self._tls = parts.scheme == "https"
+        self.port = parts.port or (443 if self._tls else 80)
+        self._base_path = parts.path.rstrip("/")
+        self._context = context or (ssl.create_default_context() if self._tls else None)
+        self._conn: http.client.HTTPConnection | None = None
+        self.handshake: Timing | None = None
+
+    def _connect(self, timeout: float) -> tuple[float, float]:
+        """Open the TCP connection and, for https, the TLS session.
+
+        Args:
+            timeout: Socket timeout in seconds.
+
+        Returns:
+            Tuple of (TCP connect seconds, TLS handshake seconds).
+        """
+        start = perf_counter()
+        sock = socket.create_connection((self.host, self.port), timeout=timeout)
+        connected = perf_counter()
+        if self._context is not None:
+            try:
+                sock = self._context.wrap_socket(sock, server_hostname=self.host)
+            except (OSError, ValueError):
+                sock.close()
+                raise
+        conn = http.client.HTTPConnection(self.host, self.port, timeout=timeout)
+        conn.sock = sock
+        self._conn = conn
+        return connected - start, perf_counter() - connected
+
+    def request(self, path: str, timeout: float = RELAY_TIMEOUT) -> tuple[int, Timing]:
+        """GET a path on the relay, reusing the open connection if possible.
+
+        A kept-alive connection the relay has closed in the meantime is
+        replaced once before giving up.
+
+        Args:
+            path: Path relative to the relay URL.
+            timeout: Timeout in seconds for each socket operation.
+
+        Returns:
+            Tuple of (HTTP status, timing breakdown).
+
+        Raises:
+            OSError: If the relay could not be reached.
+            http.client.HTTPException: If the response was malformed.
+        """
+        reused = self._conn is not None
+        try:
+            return self._request(path, timeout)
+        except (OSError, http.client.HTTPException):
+            if not reused:
+                raise
+        return self._request(path, timeout)
+
+    def _request(self, path: str, timeout: float) -> tuple[int, Timing]:
+        """Make a single GET request, connecting first if needed.
+
+        Args:
+            path: Path relative to the relay URL.
+            timeout: Timeout in seconds for each socket operation.
+
+        Returns:
+            Tuple of (HTTP status, timing breakdown).
+        """
+        connect = tls = 0.0
+        reused = self._conn is not None
+        try:
+            if not reused:
+                connect, tls = self._connect(timeout)
+            conn = self._conn
+            conn.sock.settimeout(timeout)
+            start = perf_counter()
+            conn.request("GET", self._base_path + path)
+            response = conn.getresponse()
+            ttfb = perf_counter() - start
+            # Drain the (small) body so the connection can be reused
+            response.read()
+            total = connect + tls + perf_counter() - start
+        except (OSError, http.client.HTTPException):
+            self.close()
+            raise
+        if response.will_close:
+            self.close()
+        timing = Timing(connect, tls, ttfb, total)
+        if not reused:
+            self.handshake = timing
+        return response.status, timing
+
+    def close(self) -> None:
+        """Close the underlying connection, if open."""
+        if self._conn is not None:
+            self._conn.close()
+            self._conn = None
 
 
 class Booster:
     """Manages MEV relay selection and health checking.
 
     This class tests MEV relays for reliability and filters out those
-    with poor response times or connectivity issues.
+    with poor response times or connectivity issues. Selection is based on
+    warm-connection latency, which is what mev-boost sees once running.
+
+    Probe results are kept in a scoreboard that can be persisted to disk,
+    so a restart shortly after a probe can reuse its selection.
+
+    Attributes:
+        deadline: Seconds after which probing gives up on unfinished relays.
+        connections: Pooled keep-alive connection per relay URL.
+        cache_path: Scoreboard file, or None to keep it in memory only.
+        ttl: Seconds a persisted selection stays valid.
+        scoreboard: Per-relay latency history and success counts, plus the
+            last selection and when it was made.
+        probe_failed: Whether the last probe fell back to all relays.
+        feedback: Relay request aggregates parsed from mev-boost's logs.
     """
 
+    def __init__(
+        self,
+        deadline: float = RELAY_PROBE_DEADLINE,
+        cache_path: str | None = None,
+        ttl: float = RELAY_CACHE_TTL,
+    ) -> None:
+        """Initialize the booster, loading the scoreboard if one is persisted.
+
+        Args:
+            deadline: Seconds after which probing gives up on unfinished relays.
+            cache_path: Scoreboard file, or None to keep it in memory only.
+            ttl: Seconds a persisted selection stays valid.
+        """
+        self.deadline = deadline
+        self.connections: dict[str, RelayConnection] = {}
+        self.cache_path = cache_path
+        self.ttl = ttl
+        self.scoreboard = self._load()
+        self.probe_failed = False
+        self.feedback = RelayLogStats(RELAYS)
+        self._lock = threading.Lock()
+        # Connections are not thread-safe, so only one probe runs at a time
+        self._probe_lock = threading.Lock()
+
     def get_relays(self) -> list[str]:
         """Determine which MEV relays are reliable.
 
-        Tests each relay multiple times for response time and availability.
-        Filters out relays that fail to respond or have inconsistent latency.
+        Reuses the persisted selection if it is younger than the TTL and
+        refreshes it in the background; otherwise probes the relays now.
+
+        Returns:
+            List of relay URLs that passed the reliability tests.
+        """
+        cached = self._cached_selection()
+        if cached is None:
+            return self.select_relays()
+        print("Using cached relay selection, refreshing in the background...")
+        threading.Thread(target=self.select_relays, name="relay-refresh", daemon=True).start()
+        return cached
+
+    def select_relays(self) -> list[str]:
+        """Probe the relays and select the reliable ones.
+
+        Tests all relays concurrently, each multiple times, for response time
+        and availability. Filters out relays that fail to respond, do not
+        finish within the deadline, whose median latency exceeds the slot's
+        getHeader budget, or whose p90 latency is a slow outlier: more than
+        RELAY_OUTLIER_SCORE scaled MADs and RELAY_MIN_EXCESS seconds above
+        the median p90 across relays. Fast relays are never dropped.
+
+        Returns:
+            List of relay URLs that passed the reliability tests.
+        """
+        with self._probe_lock:
+            return self._select_relays()
+
+    def _select_relays(self) -> list[str]:
+        """Probe and select relays; the caller holds the probe lock.
 
         Returns:
             List of relay URLs that passed the reliability tests.
         """
         print("Determining reliable relays...")
-        relays: dict[str, float] = dict.fromkeys(RELAYS, 0)
-        bad_relays: set[str] = set()
-        num_trials = 5
+        deadline = monotonic() + self.deadline
+        executor = ThreadPoolExecutor(max_workers=max(len(RELAYS), 1), thread_name_prefix="relay")
+        futures = {relay: executor.submit(self._probe, relay, deadline) for relay in RELAYS}
+        wait(futures.values(), timeout=self.deadline)
+        # Workers check the deadline themselves, so don't wait for stragglers
+        executor.shutdown(wait=False, cancel_futures=True)
 
-        for _ in range(num_trials):
-            for relay in RELAYS:
-                if relay in bad_relays:
-                    continue
-                pong = self.ping(relay)
-                if pong:
-                    relays[relay] += pong / num_trials
-                else:
-                    bad_relays.add(relay)
-            sleep(1)
-
-        for relay in bad_relays:
-            print(f"Invalid relay: {relay}")
-            del relays[relay]
-
-        ping_times = list(relays.values())
-        if len(ping_times) < 2:
+        samples = {
+            relay: future.result() if future.done() else None for relay, future in futures.items()
+        }
+        self._record(samples)
+
+        relays: dict[str, dict[str, float]] = {}
+        for relay, pongs in samples.items():
+            if pongs is None:
+                print(f"Invalid relay: {relay}")
+            else:
+                with self._lock:
+                    relays[relay] = self.scoreboard["relays"][relay]["latencies"].percentiles()
+
+        relays = self._apply_feedback(relays)
+        if len(relays) < 2:
             print("Error in relay testing. Defaulting to using all specified relays.")
+            self.probe_failed = True
+            self._save()
             return list(RELAYS)
+        self.probe_failed = False
 
-        dev = stdev(ping_times)
-        avg = mean(ping_times)
+        center, mad, scores = robust_scores(
+            {relay: stats["p90"] for relay, stats in relays.items()}
+        )
+        print(f"Relay p90 median {center * 1000:.0f}ms, MAD {mad * 1000:.0f}ms")
+        late = {relay for relay, stats in relays.items() if stats["p50"] > RELAY_SLOT_BUDGET}
+        if late == relays.keys():
+            print("Every relay is slower than the slot budget; keeping them all")
+            late = set()
 
         valid_relays: list[str] = []
-        for relay, res_time in relays.items():
-            if abs(avg - res_time) < (2 * dev):
-                print(f"Valid relay: {relay}")
+        for relay, stats in relays.items():
+            numbers = self._describe(relay, stats, scores[relay])
+            if relay in late:
+                print(f"Late relay: {relay} {numbers}")
+            elif scores[relay] > RELAY_OUTLIER_SCORE and stats["p90"] - center > RELAY_MIN_EXCESS:
+                print(f"Slow relay: {relay} {numbers}")
+            else:
+                print(f"Valid relay: {relay} {numbers}")
                 valid_relays.append(relay)
 
+        with self._lock:
+            self.scoreboard["selection"] = valid_relays
+            self.scoreboard["selected_at"] = time()
+        self._save()
         return valid_relays
 
-    def ping(self, domain: str) -> float | None:
-        """Ping a relay to measure response time.
+    def _apply_feedback(self, relays: dict[str, dict[str, float]]) -> dict[str, dict[str, float]]:
+        """Refine ping results with what mev-boost observed for real requests.
+
+        Relays whose getHeader requests failed too often are dropped. Once
+        every remaining relay has enough getHeader samples, their observed
+        latency replaces the synthetic ping latency for scoring.
+
+        Args:
+            relays: Ping latency percentiles per responsive relay.
+
+        Returns:
+            Latency percentiles per relay to score.
+        """
+        feedback = self.feedback
+        refined = {}
+        for relay, stats in relays.items():
+            requests = feedback.requests.get((relay, "getHeader"), 0)
+            rate = feedback.error_rate(relay)
+            if (
+                requests >= RELAY_MIN_OBSERVATIONS
+                and rate is not None
+                and rate > RELAY_MAX_ERROR_RATE
+            ):
+                print(f"Failing relay: {relay} (getHeader errors {rate:.0%} of {requests})")
+            else:
+                refined[relay] = stats
+
+        if refined and all(
+            feedback.sample_count(relay) >= RELAY_MIN_OBSERVATIONS for relay in refined
+        ):
+            print("Scoring relays on observed getHeader latency")
+            refined = {relay: feedback.percentiles(relay) for relay in refined}
+        return refined
+
+    def request_timeouts(self, relays: list[str]) -> dict[str, float]:
+        """Derive mev-boost's request timeouts from the relays' tail latency.
+
+        Each builder API call gets the slowest relay's p99 plus a margin,
+        clamped to MEV_TIMEOUT_BOUNDS. Latency observed in mev-boost's logs
+        is preferred; ping latency is used until there are enough samples,
+        and the maximum applies when nothing has been measured.
+
+        Args:
+            relays: The selected relay URLs.
+
+        Returns:
+            Timeout in seconds per builder API method.
+        """
+        timeouts = {}
+        for method, (low, high) in MEV_TIMEOUT_BOUNDS.items():
+            p99s = [p99 for relay in relays if (p99 := self._p99(relay, method)) is not None]
+            seconds = max(p99s) * MEV_TIMEOUT_MARGIN if p99s else high
+            timeouts[method] = min(max(seconds, low), high)
+        return timeouts
+
+    def latency_percentiles(self) -> dict[str, dict[str, float]]:
+        """Get the warm ping latency percentiles of every probed relay.
+
+        Returns:
+            Mapping of relay URL to "p50"/"p90"/"p99" in seconds.
+        """
+        with self._lock:
+            return {
+                relay: stats["latencies"].percentiles()
+                for relay, stats in self.scoreboard["relays"].items()
+            }
+
+    def _p99(self, relay: str, method: str) -> float | None:
+        """Get a relay's p99 latency for a builder API method.
+
+        Args:
+            relay: The relay URL.
+            method: The builder API method, e.g. "getHeader".
+
+        Returns:
+            p99 in seconds, or None if the relay has no samples.
+        """
+        if self.feedback.sample_count(relay, method) >= RELAY_MIN_OBSERVATIONS:
+            return self.feedback.percentiles(relay, method)["p99"]
+        with self._lock:
+            stats = self.scoreboard["relays"].get(relay)
+            return stats["latencies"].percentiles().get("p99") if stats else None
+
+    def _load(self) -> dict:
+        """Read the persisted scoreboard.
+
+        Returns:
+            The scoreboard, or an empty one if none is persisted or it is
+            unreadable or malformed, so the relays are probed again.
+        """
+        empty = {"relays": {}, "selection": [], "selected_at": 0.0}
+        if not self.cache_path:
+            return empty
+        try:
+            with open(self.cache_path) as f:
+                saved = json.load(f)
+            relays = {
+                relay: {
+                    "latencies": LatencyWindow(
+                        RELAY_HISTORY, [float(latency) for latency in stats["latencies"]]
+                    ),
+                    "attempts": int(stats["attempts"]),
+                    "successes": int(stats["successes"]),
+                }
+                for relay, stats in saved.get("relays", {}).items()
+            }
+            selection = list(saved.get("selection", []))
+            selected_at = float(saved.get("selected_at", 0.0))
+        except (OSError, ValueError, TypeError, KeyError, AttributeError):
+            return empty
+        if not all(isinstance(relay, str) for relay in selection):
+            return empty
+        return {"relays": relays, "selection": selection, "selected_at": selected_at}
+
+    def _save(self) -> None:
+        """Persist the scoreboard atomically, if a cache path is set."""
+        if not self.cache_path:
+            return
+        tmp_path = f"{self.cache_path}.tmp"
+        try:
+            with self._lock, open(tmp_path, "w") as f:
+                json.dump(self.scoreboard, f, default=LatencyWindow.tolist)
+            os.replace(tmp_path, self.cache_path)
+        except OSError as e:
+            print(f"[bright_yellow]WARNING: Failed to save relay scoreboard: {e}[/bright_yellow]")
+
+    def _record(self, samples: dict[str, list[float] | None]) -> None:
+        """Add one probe round to each relay's history.
+
+        Args:
+            samples: Warm latencies per relay, or None if its probe failed.
+        """
+        with self._lock:
+            for relay, pongs in samples.items():
+                stats = self.scoreboard["relays"].get(relay)
+                if stats is None:
+                    stats = self.scoreboard["relays"][relay] = {
+                        "latencies": LatencyWindow(RELAY_HISTORY),
+                        "attempts": 0,
+                        "successes": 0,
+                    }
+                stats["attempts"] += 1
+                if pongs is not None:
+                    stats["successes"] += 1
+                    stats["latencies"].extend(pongs)
+
+    def _cached_selection(self) -> list[str] | None:
+        """Get the last selection if it is still fresh and still applies.
+
+        Returns:
+            The cached relay URLs, or None if they must be re-probed.
+        """
+        selection = self.scoreboard["selection"]
+        age = time() - self.scoreboard["selected_at"]
+        if not selection or not 0 <= age < self.ttl or not set(selection) <= set(RELAYS):
+            return None
+        return list(selection)
+
+    def success_rate(self, relay: str) -> float | None:
+        """Get the fraction of probes a relay has passed.
+
+        Args:
+            relay: The relay URL.
+
+        Returns:
+            Success rate between 0 and 1, or None if never probed.
+        """
+        stats = self.scoreboard["relays"].get(relay)
+        if not stats or not stats["attempts"]:
+            return None
+        return stats["successes"] / stats["attempts"]
+
+    def _describe(self, relay: str, stats: dict[str, float], score: float) -> str:
+        """Format the numbers behind a relay's selection decision.
+
+        Args:
+            relay: The relay URL.
+            stats: The relay's warm latency percentiles in seconds.
+            score: How many scaled MADs its p90 lies above the median.
+
+        Returns:
+            A summary such as
+            "(p50 41ms, p90 60ms, p99 75ms, score 0.3; cold connect 12ms, tls 25ms, ttfb 44ms)".
+        """
+        warm = ", ".join(f"{name} {seconds * 1000:.0f}ms" for name, seconds in stats.items())
+        warm += f", score {score:.1f}"
+        connection = self.connections.get(relay)
+        handshake = connection.handshake if connection else None
+        if handshake is None:
+            return f"({warm})"
+        return (
+            f"({warm}; cold connect {handshake.connect * 1000:.0f}ms, "
+            f"tls {handshake.tls * 1000:.0f}ms, ttfb {handshake.ttfb * 1000:.0f}ms)"
+        )
+
+    def _probe(self, relay: str, deadline: float) -> list[float] | None:
+        """Ping a relay repeatedly and collect its warm response times.
+
+        The first request opens the pooled connection and is not counted.
+
+        Args:
+            relay: The relay URL to probe.
+            deadline: Monotonic time by which all trials must be done.
+
+        Returns:
+            Warm response times in seconds, or None if any trial failed or
+            the deadline passed first.
+        """
+        pongs: list[float] = []
+        for trial in range(RELAY_TRIALS + 1):
+            if trial > 1:
+                sleep(1)
+            remaining = deadline - monotonic()
+            if remaining <= 0:
+                return None
+            pong = self.ping(relay, timeout=min(RELAY_TIMEOUT, remaining))
+            if not pong:
+                return None
+            if trial:
+                pongs.append(pong)
+        return pongs
+
+    def ping(self, domain: str, timeout: float = RELAY_TIMEOUT) -> float | None:
+        """Ping a relay's builder status endpoint over its pooled connection.
 
         Args:
             domain: The relay URL to ping.
+            timeout: Request timeout in seconds.
 
         Returns:
             Response time in seconds if successful, None if the request failed.
+            Includes connection setup only if the connection had to be opened.
         """
+        connection = self.connections.get(domain)
+        if connection is None:
+            connection = self.connections[domain] = RelayConnection(domain)
         try:
-            start = time()
-            response = requests.get(
-                f"{domain}/relay/v1/data/bidtraces/proposer_payload_delivered",
-                timeout=10,
-            )
-            end = time()
-            if response.ok:
-                return end - start
-        except requests.exceptions.RequestException:
-            pass
-        return None
+            status, timing = connection.request(RELAY_STATUS_PATH, timeout)
+        except (OSError, http.client.HTTPException):
+            return None
+        return timing.total if 200 <= status < 300 else None
+
+
+class RelayMonitor:
+    """Re-probes relays in the background and tracks their rolling health.
+
+    Each probe moves every relay's health score towards 1 if it was
+    selected and towards 0 otherwise. The active set only changes with
+    hysteresis: a relay is added once its score reaches ``high`` and removed
+    once it falls to ``low``. Implements ``fileno()`` so the supervisor can
+    select on it; it becomes readable when the active set has changed.
+
+    Attributes:
+        booster: The relay selector used to probe.
+        interval: Seconds between probes.
+        active: Relays mev-boost should currently use.
+        health: Rolling health score between 0 and 1 per relay.
+    """
+
+    def __init__(
+        self,
+        booster: Booster,
+        interval: float = RELAY_MONITOR_INTERVAL,
+        alpha: float = RELAY_HEALTH_ALPHA,
+        low: float = RELAY_HEALTH_LOW,
+        high: float = RELAY_HEALTH_HIGH,
+    ) -> None:
+        """Initialize the monitor without starting it.
+
+        Args:
+            booster: The relay selector used to probe.
+            interval: Seconds between probes.
+            alpha: Weight of the newest probe in the health scores.
+            low: Score at or below which an active relay is removed.
+            high: Score at or above which an inactive relay is added.
+        """
+        self.booster = booster
+        self.interval = interval
+        self.alpha = alpha
+        self.low = low
+        self.high = high
+        self.active: list[str] = []
+        self.health: dict[str, float] = {}
+        self._update: list[str] | None = None
+        self._lock = threading.Lock()
+        self._stop = threading.Event()
+        self._read_fd, self._write_fd = os.pipe()
+        os.set_blocking(self._read_fd, False)
+
+    def fileno(self) -> int:
+        """Return the descriptor that becomes readable on an update."""
+        return self._read_fd
+
+    def reset(self, relays: list[str]) -> None:
+        """Start tracking from a freshly selected relay list.
+
+        Args:
+            relays: The relays mev-boost was started with.
+        """
+        with self._lock:
+            self.active = list(relays)
+            self.health = {relay: float(relay in relays) for relay in RELAYS}
+            self._update = None
+
+    def start(self) -> None:
+        """Probe on the interval in a daemon thread until stopped."""
+        threading.Thread(target=self._run, name="relay-monitor", daemon=True).start()
+
+    def _run(self) -> None:
+        """Probe once per interval until stopped."""
+        while not self._stop.wait(self.interval):
+            try:
+                self.check()
+            except Exception as e:
+                print(f"[bright_yellow]WARNING: Relay health check failed: {e}[/bright_yellow]")
+
+    def check(self) -> bool:
+        """Probe the relays and update health scores and the active set.
+
+        Returns:
+            True if the active set changed.
+        """
+        healthy = set(self.booster.select_relays())
+        if self.booster.probe_failed:
+            # Says nothing about individual relays
+            return False
+
+        with self._lock:
+            for relay in RELAYS:
+                observed = float(relay in healthy)
+                score = self.health.get(relay, observed)
+                self.health[relay] = (1 - self.alpha) * score + self.alpha * observed
+            active = [
+                relay
+                for relay in RELAYS
+                if self.health[relay] >= self.high
+                or (relay in self.active and self.health[relay] > self.low)
+            ]
+            if not active or set(active) == set(self.active):
+                return False
+            scores = ", ".join(f"{relay} {self.health[relay]:.2f}" for relay in RELAYS)
+            print(f"Relay health changed ({scores})")
+            self.active = active
+            self._update = active
+        os.write(self._write_fd, b"!")
+        return True
+
+    def take_update(self) -> list[str] | None:
+        """Consume a pending change of the active set.
+
+        Returns:
+            The new relay list, or None if nothing changed.
+        """
+        with contextlib.suppress(BlockingIOError):
+            os.read(self._read_fd, 4096)
+        with self._lock:
+            update, self._update = self._update, None
+        return update
+
+    def stop(self) -> None:
+        """Stop probing after the current round."""
+        self._stop.set()
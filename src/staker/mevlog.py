@@ -0,0 +1,198 @@
+"""Relay feedback from mev-boost's own logs.
+
+This module parses the getHeader and getPayload lines mev-boost logs for
+each relay request and keeps per-relay latency and error aggregates, so relay
+selection can use real bid latency instead of only synthetic pings.
+"""
+
+from __future__ import annotations
+
+import re
+import threading
+from urllib.parse import urlsplit
+
+from staker.config import RELAY_HISTORY, RELAYS
+from staker.latency import LatencyWindow
+from staker.utils import parse_fields
+
+METHODS: tuple[str, ...] = ("getHeader", "getPayload")
+# Fields mev-boost versions have used for the request duration
+DURATION_FIELDS: tuple[str, ...] = ("durationMs", "duration", "latency")
+# Go duration components, e.g. "1m2.5s", "850ms", "120µs"
+DURATION_PATTERN = re.compile(r"([\d.]+)(h|ms|m|s|µs|us|ns)")
+DURATION_UNITS: dict[str, float] = {
+    "h": 3600,
+    "m": 60,
+    "s": 1,
+    "ms": 1e-3,
+    "µs": 1e-6,
+    "us": 1e-6,
+    "ns": 1e-9,
+}
+
+
+def parse_duration(key: str, value: str) -> float | None:
+    """Parse a logged duration into seconds.
+
+    Args:
+        key: The field name; names ending in "Ms" hold plain milliseconds.
+        value: The field value, e.g. "123" or "1.5s".
+
+    Returns:
+        Duration in seconds, or None if the value is not a duration.
+    """
+    try:
+        number = float(value)
+    except ValueError:
+        parts = DURATION_PATTERN.findall(value)
+        if not parts or "".join(n + u for n, u in parts) != value:
+            return None
+        return sum(float(n) * DURATION_UNITS[unit] for n, unit in parts)
+    return number / 1000 if key.endswith("Ms") else number
+
+
+def relay_hosts(relays: list[str]) -> dict[str, str]:
+    """Map relay hostnames to their configured relay URLs.
+
+    Args:
+        relays: Relay URLs.
+
+    Returns:
+        Mapping of hostname to relay URL.
+    """
+    return {urlsplit(relay).hostname or relay: relay for relay in relays}
+
+
+class RelayLogStats:
+    """Per-relay aggregates of mev-boost's getHeader/getPayload requests.
+
+    Lines are checked with a plain substring test first, so the cost for the
+    vast majority of log lines is negligible.
+
+    Attributes:
+        requests: Request count per (relay, method).
+        errors: Failed request count per (relay, method).
+        latencies: Recent request durations per (relay, method).
+    """
+
+    def __init__(self, relays: list[str] | None = None) -> None:
+        """Initialize empty aggregates.
+
+        Args:
+            relays: Relay URLs to attribute requests to (defaults to RELAYS).
+        """
+        self._hosts = relay_hosts(RELAYS if relays is None else relays)
+        self.requests: dict[tuple[str, str], int] = {}
+        self.errors: dict[tuple[str, str], int] = {}
+        self.latencies: dict[tuple[str, str], LatencyWindow] = {}
+        self._lock = threading.Lock()
+
+    def observe(self, line: str) -> bool:
+        """Record a mev-boost log line if it reports a relay request.
+
+        Args:
+            line: The log line without prefix.
+
+        Returns:
+            True if the line was recorded.
+        """
+        if "getHeader" not in line and "getPayload" not in line:
+            return False
+        return self.observe_fields(parse_fields(line))
+
+    def observe_fields(self, fields: dict[str, str]) -> bool:
+        """Record a parsed mev-boost log line if it reports a relay request.
+
+        Args:
+            fields: The line's key=value fields, including its level.
+
+        Returns:
+            True if the line was recorded.
+        """
+        method = fields.get("method")
+        url = fields.get("url") or fields.get("relay")
+        if method not in METHODS or not url:
+            return False
+        host = urlsplit(url).hostname or url
+        relay = self._hosts.get(host, host)
+
+        failed = fields.get("level") in ("error", "warning") or "error" in fields
+        duration = next(
+            (
+                seconds
+                for key in DURATION_FIELDS
+                if key in fields and (seconds := parse_duration(key, fields[key])) is not None
+            ),
+            None,
+        )
+
+        key = (relay, method)
+        with self._lock:
+            self.requests[key] = self.requests.get(key, 0) + 1
+            if failed:
+                self.errors[key] = self.errors.get(key, 0) + 1
+            elif duration is not None:
+                window = self.latencies.get(key)
+                if window is None:
+                    window = self.latencies[key] = LatencyWindow(RELAY_HISTORY)
+                window.add(duration)
+        return True
+
+    def error_rate(self, relay: str, method: str = "getHeader") -> float | None:
+        """Get the fraction of a relay's requests that failed.
+
+        Args:
+            relay: The relay URL.
+            method: "getHeader" or "getPayload".
+
+        Returns:
+            Error rate between 0 and 1, or None if there were no requests.
+        """
+        count = self.requests.get((relay, method), 0)
+        if not count:
+            return None
+        return self.errors.get((relay, method), 0) / count
+
+    def percentiles(self, relay: str, method: str = "getHeader") -> dict[str, float]:
+        """Get latency percentiles of a relay's successful requests.
+
+        Args:
+            relay: The relay URL.
+            method: "getHeader" or "getPayload".
+
+        Returns:
+            Mapping of "p50"/"p90"/"p99" to seconds; empty without samples.
+        """
+        with self._lock:
+            window = self.latencies.get((relay, method))
+            return window.percentiles() if window is not None else {}
+
+    def sample_count(self, relay: str, method: str = "getHeader") -> int:
+        """Get the number of latency samples held for a relay.
+
+        Args:
+            relay: The relay URL.
+            method: "getHeader" or "getPayload".
+
+        Returns:
+            Number of samples in the window.
+        """
+        window = self.latencies.get((relay, method))
+        return len(window) if window is not None else 0
+
+    def summary(self) -> dict[str, dict[str, dict[str, float]]]:
+        """Get all aggregates, e.g. for exporting as metrics.
+
+        Returns:
+            Per relay and method: request and error counts plus percentiles.
+        """
+        with self._lock:
+            counts = sorted(self.requests.items())
+        summary: dict[str, dict[str, dict[str, float]]] = {}
+        for (relay, method), count in counts:
+            summary.setdefault(relay, {})[method] = {
+                "requests": count,
+                "errors": self.errors.get((relay, method), 0),
+                **self.percentiles(relay, method),
+            }
+        return summary
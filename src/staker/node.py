@@ -6,6 +6,8 @@ consensus, validation, and MEV-boost processes for an Ethereum staking node.
 
 from __future__ import annotations
 
+import asyncio
+import contextlib
 import logging
 import os
 import select
@@ -13,27 +15,57 @@ import signal
 import subprocess
 import sys
 import tempfile
+from collections.abc import Callable
 from glob import glob
 from random import choice
-from time import sleep, time
-from typing import IO
+from time import monotonic, sleep, time
 
 from rich.console import Console
 
+from staker.beacon import BeaconMonitor
 from staker.config import (
+    AGGREGATE_LOG_FILE,
+    ASYNC_ENGINE,
     AWS,
+    BEACON_API_URL,
+    CRASH_LOOP_WINDOW,
     DEV,
     DOCKER,
     ETH_ADDR,
-    KILL_TIME,
+    JSON_LOGS,
+    LOG_DRAIN_TIMEOUT,
+    MEV_TIMEOUT_FLAGS,
+    PREFIXES,
+    RELAY_CACHE_FILE,
     SNAPSHOT_DAYS,
+    STARTUP_POLL_INTERVAL,
     VPN,
     VPN_TIMEOUT,
 )
+from staker.duties import DutyScheduler
 from staker.environment import AWSEnvironment, Environment, LocalEnvironment
-from staker.mev import Booster
+from staker.history import LogHistory, LogServer
+from staker.logs import LogSink
+from staker.metrics import Metrics, MetricsServer
+from staker.mev import Booster, RelayMonitor
+from staker.records import SOURCES, Record, parse_record
+from staker.restarts import (
+    STACK,
+    CrashTracker,
+    RestartPolicy,
+    get_policy,
+    get_restart_group,
+    get_shutdown_budget,
+    get_shutdown_order,
+)
+from staker.rpc import ExecutionMonitor
+from staker.rules import ErrorRule, RuleAction, RuleEngine
 from staker.snapshot import NoOpSnapshotManager, Snapshot, SnapshotManager
-from staker.utils import colorize_log, get_checkpoint, get_checkpoint_url, get_public_ip
+from staker.startup import StartupPipeline, http_is_ready, ipc_is_ready
+from staker.streams import LineReader, LogDrain
+from staker.supervisor import AsyncSupervisor
+from staker.throttle import ConsoleThrottle
+from staker.utils import colorize_log_ansi, get_checkpoint, get_checkpoint_url, get_public_ip
 
 home_dir = os.path.expanduser("~")
 platform = sys.platform.lower()
@@ -52,6 +84,23 @@ class Node:
         env: The runtime environment (AWS or Local).
         snapshot: The snapshot manager for EBS backups.
         booster: The MEV relay selector.
+        sink: The buffered writer for the logs file.
+        monitor: The background relay health monitor.
+        metrics: Process and log counters exported on /metrics.
+        metrics_server: The optional Prometheus endpoint.
+        history: The last lines of each process, kept in memory.
+        log_server: The optional localhost endpoint for querying the history.
+        chain: The poller of geth's sync and peer state over IPC.
+        beacon: The beacon node's head, finality, sync and peer state.
+        duties: Picks duty-free times for planned interruptions.
+        planned: Monotonic time each planned interruption is due, by name.
+        snapshot_due: Monotonic time the most recent snapshot becomes too old.
+        shutdown_durations: Seconds each process took to stop in the latest shutdown.
+        record_consumers: Called with every parsed log record when JSON_LOGS is set.
+        rules: Matches log lines against the configured error rules.
+        triggered: Rules fired since the last check, with the process they fired on.
+        throttle: Collapses repeated lines and rate-limits console output.
+        stop_requested: Set by a signal handler to make ``run`` return.
     """
 
     def __init__(
@@ -69,10 +118,15 @@ class Node:
         """
         self.env = env
         self.snapshot = snapshot
-        self.booster = booster or Booster()
 
         on_mac = platform == "darwin"
         prefix = env.get_data_prefix() if DOCKER else home_dir
+        self.booster = booster or Booster(cache_path=f"{prefix}/{RELAY_CACHE_FILE}")
+        self.monitor = RelayMonitor(self.booster)
+        self.metrics = Metrics()
+        self.metrics_server = MetricsServer(lambda: self.metrics.render(self))
+        self.history = LogHistory()
+        self.log_server = LogServer(self.history)
         geth_dir_base = f"/{'Library/Ethereum' if on_mac else '.ethereum'}"
         prysm_dir_base = f"/{'Library/Eth2' if on_mac else '.eth2'}"
         prysm_wallet_postfix = f"{'V' if on_mac else 'v'}alidators/prysm-wallet-v2"
@@ -84,16 +138,34 @@ class Node:
 
         ipc_postfix = "/geth.ipc"
         self.ipc_path = self.geth_data_dir + ipc_postfix
+        self.chain = ExecutionMonitor(self.ipc_path)
+        self.beacon = BeaconMonitor()
+        self.duties = DutyScheduler()
+        self.planned: dict[str, float] = {}
         self.kill_in_progress = False
         self.terminating = False
+        self.stop_requested = False
+        # Wakes the select loop when a signal asks it to stop
+        self._wake_read, self._wake_write = os.pipe()
+        os.set_blocking(self._wake_write, False)
         self.processes: list[dict] = []
-        self.streams: list[IO[bytes]] = []
+        self.streams: list[LineReader] = []
         self.relays: list[str] = []
+        self.checkpoint: str | None = None
+        self.startup: StartupPipeline | None = None
         self.most_recent: dict | None = None
+        self.snapshot_due: float | None = None
+        self.crashes = CrashTracker()
+        self.pending_restarts: dict[str, float] = {}
+        self.shutdown_durations: dict[str, float] = {}
+        self.record_consumers: list[Callable[[Record], object]] = [self._observe_relays]
+        self.rules = RuleEngine()
+        self.triggered: list[tuple[ErrorRule, str]] = []
+        self.throttle = ConsoleThrottle()
         self.logs_file = env.get_logs_path()
-
-        with open(self.logs_file, "w") as _:
-            pass
+        self.sink = LogSink(self.logs_file)
+        # Keep the previous run's log as a segment instead of truncating it
+        self.sink.rotate()
 
     def _run_cmd(self, cmd: list[str]) -> subprocess.Popen:
         """Run a command and return the process handle.
@@ -119,6 +191,14 @@ class Node:
         Returns:
             The Geth process handle.
         """
+        return self._run_cmd(self._execution_cmd())
+
+    def _execution_cmd(self) -> list[str]:
+        """Build the Geth execution client command.
+
+        Returns:
+            The command and arguments.
+        """
         args = [
             "--http",
             "--http.api",
@@ -134,8 +214,7 @@ class Node:
         if DOCKER:
             args.append(f"--datadir={self.geth_data_dir}")
 
-        cmd = ["geth"] + args
-        return self._run_cmd(cmd)
+        return ["geth"] + args
 
     def _consensus(self) -> subprocess.Popen:
         """Start the Prysm beacon chain.
@@ -143,6 +222,14 @@ class Node:
         Returns:
             The beacon-chain process handle.
         """
+        return self._run_cmd(self._consensus_cmd())
+
+    def _consensus_cmd(self) -> list[str]:
+        """Build the Prysm beacon chain command.
+
+        Returns:
+            The command and arguments.
+        """
         args = [
             "--accept-terms-of-use",
             f"--execution-endpoint={self.ipc_path}",
@@ -161,14 +248,9 @@ class Node:
         args.append(f"--checkpoint-sync-url={checkpoint_url}")
         args.append(f"--genesis-beacon-api-url={checkpoint_url}")
 
-        # Try to fetch weak subjectivity checkpoint, but don't fail if unavailable
-        try:
-            checkpoint = get_checkpoint(network)
-            args.append(f"--weak-subjectivity-checkpoint={checkpoint}")
-        except Exception as e:
-            print(
-                f"[bright_yellow]WARNING: Failed to fetch weak subjectivity checkpoint: {e}[/bright_yellow]"
-            )
+        # Prefetched during startup preparation, see _fetch_checkpoint
+        if self.checkpoint:
+            args.append(f"--weak-subjectivity-checkpoint={self.checkpoint}")
 
         if DOCKER:
             args.append(f"--datadir={self.prysm_data_dir}")
@@ -177,8 +259,82 @@ class Node:
         if p2p_host:
             args.append(f"--p2p-host-dns={p2p_host}")
 
-        cmd = ["beacon-chain"] + args
-        return self._run_cmd(cmd)
+        return ["beacon-chain"] + args
+
+    def _fetch_checkpoint(self) -> None:
+        """Fetch the weak subjectivity checkpoint for the beacon chain.
+
+        Failure is not fatal: the beacon chain just starts without it.
+        """
+        network = "hoodi" if DEV else "mainnet"
+        try:
+            self.checkpoint = get_checkpoint(network)
+        except Exception as e:
+            self.checkpoint = None
+            print(
+                f"[bright_yellow]WARNING: Failed to fetch weak subjectivity checkpoint: {e}[/bright_yellow]"
+            )
+
+    def _refresh_relays(self) -> None:
+        """Probe the MEV relays and keep the responsive ones for mev-boost."""
+        self.relays = self.booster.get_relays()
+        self.monitor.reset(self.relays)
+
+    def _apply_relay_update(self) -> None:
+        """Plan a restart of only mev-boost when the monitor changed the healthy relays."""
+        relays = self.monitor.take_update()
+        if relays is None:
+            return
+        self.relays = relays
+        if "mev" not in self.planned:
+            self.planned["mev"] = self._defer("mev-boost restart")
+
+    def _restart_mev(self) -> None:
+        """Restart mev-boost so it picks up the current relays."""
+        running = [
+            meta
+            for meta in self.processes
+            if meta["name"] == "mev" and "mev" not in self.pending_restarts
+        ]
+        if not running:
+            # Not started yet (or already restarting): it picks up the new list
+            return
+        print(f"Restarting mev-boost with relays: {', '.join(self.relays)}")
+        self.pending_restarts["mev"] = monotonic()
+        if running[0]["process"].poll() is None:
+            self._handle_gracefully(running, hard=False)
+
+    def _defer(self, reason: str) -> float:
+        """Pick when a planned interruption should happen.
+
+        Uses the duties fetched in the background, so the loop never waits
+        on the beacon API.
+
+        Args:
+            reason: What is being planned, for the log.
+
+        Returns:
+            Monotonic time at the start of the longest duty-free window.
+        """
+        delay = self.duties.delay()
+        if delay:
+            print(f"Deferring {reason} by {delay:.0f}s to avoid validator duties")
+        return monotonic() + delay
+
+    def _planned_due(self, name: str) -> bool:
+        """Take a planned interruption off the schedule once it is due.
+
+        Args:
+            name: The planned interruption.
+
+        Returns:
+            True if it was planned and is due now.
+        """
+        due = self.planned.get(name)
+        if due is None or due > monotonic():
+            return False
+        del self.planned[name]
+        return True
 
     def _validation(self) -> subprocess.Popen:
         """Start the Prysm validator client.
@@ -186,6 +342,14 @@ class Node:
         Returns:
             The validator process handle.
         """
+        return self._run_cmd(self._validation_cmd())
+
+    def _validation_cmd(self) -> list[str]:
+        """Build the Prysm validator client command.
+
+        Returns:
+            The command and arguments.
+        """
         args = [
             "--accept-terms-of-use",
             "--enable-builder",
@@ -199,8 +363,7 @@ class Node:
         else:
             args.append("--mainnet")
 
-        cmd = ["validator"] + args
-        return self._run_cmd(cmd)
+        return ["validator"] + args
 
     def _mev(self) -> subprocess.Popen:
         """Start the MEV-Boost relay.
@@ -208,6 +371,14 @@ class Node:
         Returns:
             The mev-boost process handle.
         """
+        return self._run_cmd(self._mev_cmd())
+
+    def _mev_cmd(self) -> list[str]:
+        """Build the MEV-Boost relay command.
+
+        Returns:
+            The command and arguments.
+        """
         args = ["-relay-check"]
         if DEV:
             args.append("-hoodi")
@@ -215,16 +386,27 @@ class Node:
             args.append("-mainnet")
 
         args += ["-relays", ",".join(self.relays)]
-        cmd = ["mev-boost"] + args
-        return self._run_cmd(cmd)
+        # Recomputed on every (re)start from the latest relay latency
+        for method, seconds in self.booster.request_timeouts(self.relays).items():
+            args += [MEV_TIMEOUT_FLAGS[method], str(round(seconds * 1000))]
+        return ["mev-boost"] + args
 
     def _vpn(self) -> tuple[subprocess.Popen, str]:
         """Start the OpenVPN client.
 
+        Returns:
+            Tuple of (openvpn process handle, path to credentials file).
+        """
+        cmd, creds_path = self._vpn_cmd()
+        return self._run_cmd(cmd), creds_path
+
+    def _vpn_cmd(self) -> tuple[list[str], str]:
+        """Build the OpenVPN client command.
+
         Creates a secure temp file for credentials with restrictive permissions.
 
         Returns:
-            Tuple of (openvpn process handle, path to credentials file).
+            Tuple of (command and arguments, path to credentials file).
         """
         vpn_user = os.environ["VPN_USER"]
         vpn_pass = os.environ["VPN_PASS"]
@@ -237,8 +419,7 @@ class Node:
 
         cfg = choice(glob("config/us*.tcp.ovpn"))
         args = ["--config", cfg, "--auth-user-pass", creds_path]
-        cmd = ["openvpn"] + args
-        return self._run_cmd(cmd), creds_path
+        return ["openvpn"] + args, creds_path
 
     def _cleanup_creds(self, path: str | None) -> None:
         """Remove credentials file if it exists.
@@ -265,7 +446,7 @@ class Node:
 
         while not vpn_connected:
             vpn_process, creds_path = self._vpn()
-            processes.append({"process": vpn_process, "prefix": "xxx OPENVPN__ xxx"})
+            processes.append({"name": "vpn", "process": vpn_process, "prefix": PREFIXES["vpn"]})
             elapsed = 0
 
             while start_ip == get_public_ip() and elapsed < VPN_TIMEOUT:
@@ -286,62 +467,131 @@ class Node:
 
         return processes
 
-    def _start(self) -> tuple[list[dict], list[IO[bytes]]]:
-        """Start all node processes.
+    def _prepare(self) -> StartupPipeline:
+        """Begin startup preparation and register when each client may start.
+
+        Relay probing and the checkpoint fetch run in the background. Geth
+        starts right away, the beacon chain once geth.ipc accepts connections,
+        the validator once the beacon REST API answers, and mev-boost once
+        the relays have been probed.
+
+        Returns:
+            The startup pipeline, also stored on the node.
+        """
+        startup = StartupPipeline(STARTUP_POLL_INTERVAL)
+        relays = startup.submit("relays", self._refresh_relays)
+        checkpoint = startup.submit("checkpoint", self._fetch_checkpoint)
+        startup.gate("execution", lambda: True)
+        startup.gate(
+            "consensus",
+            lambda: checkpoint.done() and ipc_is_ready(self.ipc_path),
+            after=("execution",),
+        )
+        startup.gate(
+            "validation",
+            lambda: http_is_ready(f"{BEACON_API_URL}/eth/v1/node/version"),
+            after=("consensus",),
+        )
+        startup.gate("mev", relays.done)
+        self.startup = startup
+        return startup
+
+    def _start(self) -> tuple[list[dict], list[LineReader]]:
+        """Start the VPN and every client that is ready to start.
 
-        Optionally connects to VPN first, then starts execution, consensus,
-        validation, and MEV-boost processes.
+        Optionally connects to VPN first. Clients still waiting on their
+        dependencies are started later from the main loop by _start_ready.
 
         Returns:
-            Tuple of (processes list, stdout streams list).
+            Tuple of (processes list, stdout line readers list).
         """
         processes: list[dict] = []
 
         if VPN:
             processes = self._wait_for_vpn()
+            self.metrics.process_started("vpn")
 
-        processes += [
-            {"process": self._execution(), "prefix": "<<< EXECUTION >>>"},
-            {"process": self._consensus(), "prefix": "[[[ CONSENSUS ]]]"},
-            {"process": self._validation(), "prefix": "(( _VALIDATION ))"},
-            {"process": self._mev(), "prefix": "+++ MEV_BOOST +++"},
-        ]
-
-        streams: list[IO[bytes]] = []
+        streams: list[LineReader] = []
         for meta in processes:
-            meta["process"].stdout.prefix = meta["prefix"]
-            streams.append(meta["process"].stdout)
+            meta.setdefault("reader", LineReader(meta["process"].stdout, meta["prefix"]))
+            streams.append(meta["reader"])
 
         self.processes = processes
         self.streams = streams
+        if self.startup is None:
+            self._prepare()
+        self._start_ready()
         return processes, streams
 
-    def _signal_processes(self, sig: signal.Signals, prefix: str, hard: bool = True) -> None:
-        """Send a signal to all managed processes.
+    def _start_ready(self) -> None:
+        """Start clients whose startup dependencies have become ready."""
+        startup = self.startup
+        if startup is None or not startup.pending:
+            return
+        for name in startup.ready():
+            meta = self._spawn(name)
+            self.processes.append(meta)
+            self.streams.append(meta["reader"])
+        if not startup.pending:
+            print(f"Startup phases: {startup.summary()}")
+
+    def _spawn(self, name: str) -> dict:
+        """Start a single client process.
+
+        Args:
+            name: The client name (e.g. "execution").
+
+        Returns:
+            The process metadata dict.
+        """
+        process = getattr(self, f"_{name}")()
+        self.metrics.process_started(name)
+        prefix = PREFIXES[name]
+        return {
+            "name": name,
+            "process": process,
+            "prefix": prefix,
+            "reader": LineReader(process.stdout, prefix),
+        }
+
+    def _signal_processes(
+        self,
+        sig: signal.Signals,
+        prefix: str,
+        hard: bool = True,
+        processes: list[dict] | None = None,
+    ) -> None:
+        """Send a signal to managed processes.
 
         Args:
             sig: The signal to send.
             prefix: Log message prefix.
             hard: If False and kill_in_progress, skip signaling.
+            processes: Processes to signal (defaults to all).
         """
         if hard or not self.kill_in_progress:
-            print(f"{prefix} all processes... [{'HARD' if hard else 'SOFT'}]")
-            for meta in self.processes:
+            if processes is None:
+                processes = self.processes
+                target = "all processes"
+            else:
+                target = ", ".join(meta.get("name", "?") for meta in processes)
+            print(f"{prefix} {target}... [{'HARD' if hard else 'SOFT'}]")
+            for meta in processes:
                 try:
                     os.kill(meta["process"].pid, sig)
                 except OSError as e:
                     logging.exception(e)
 
     def _interrupt(self, **kwargs) -> None:
-        """Send SIGINT to all processes."""
+        """Send SIGINT to all (or the given) processes."""
         self._signal_processes(signal.SIGINT, "Interrupting", **kwargs)
 
     def _terminate(self, **kwargs) -> None:
-        """Send SIGTERM to all processes."""
+        """Send SIGTERM to all (or the given) processes."""
         self._signal_processes(signal.SIGTERM, "Terminating", **kwargs)
 
     def _kill(self, **kwargs) -> None:
-        """Send SIGKILL to all processes."""
+        """Send SIGKILL to all (or the given) processes."""
         self._signal_processes(signal.SIGKILL, "Killing", **kwargs)
 
     def _print_line(self, prefix: str, line: bytes) -> str | None:
@@ -356,50 +606,119 @@ class Node:
         """
         decoded = line.decode("UTF-8").strip()
         if decoded:
+            self.metrics.count_line(prefix, len(line))
             log = f"{prefix} {decoded}"
-            colored = colorize_log(log)
-            print(colored if self.env.use_colored_logs() else log)
-            with open(self.logs_file, "a") as file:
-                file.write(f"{log}\n")
+            self._show(self.throttle.admit(prefix, log))
+            source = SOURCES.get(prefix, prefix)
+            now = time()
+            # Parsed once for the sink, history and consumers; the rules search the text
+            record = parse_record(source, decoded, now) if JSON_LOGS else None
+            self.history.record(source, decoded, now, record)
+            if rule := self.rules.match(source, decoded):
+                self.triggered.append((rule, source))
+            if record is not None:
+                self.sink.write(record.to_json())
+                for consume in self.record_consumers:
+                    consume(record)
+            else:
+                if not AGGREGATE_LOG_FILE:
+                    self.sink.write(log)
+                if prefix == PREFIXES["mev"]:
+                    self.booster.feedback.observe(decoded)
             return log
         return None
 
-    def _stream_logs(self, rstreams: list[IO[bytes]]) -> list[str | None]:
-        """Read and print available log lines from streams.
+    def _show(self, logs: list[str]) -> None:
+        """Print lines let through by the throttle.
+
+        They are logged too when AGGREGATE_LOG_FILE replaces the full stream.
+
+        Args:
+            logs: Prefixed log lines.
+        """
+        colored = self.env.use_colored_logs()
+        for log in logs:
+            # Raw output: ANSI colors are applied directly, so Rich markup is not parsed
+            console.out(colorize_log_ansi(log) if colored else log)
+            if AGGREGATE_LOG_FILE and not JSON_LOGS:
+                self.sink.write(log)
+
+    def _observe_relays(self, record: Record) -> None:
+        """Feed mev-boost's relay request records into relay feedback.
 
         Args:
-            rstreams: List of ready streams to read from.
+            record: A parsed log record.
+        """
+        if record.source == "mev" and "method" in record.fields:
+            self.booster.feedback.observe_fields({**record.fields, "level": record.level or ""})
+
+    def _stream_logs(self, rstreams: list[LineReader]) -> list[str | None]:
+        """Read and print every complete log line available on ready streams.
+
+        Args:
+            rstreams: List of ready line readers.
 
         Returns:
             List of formatted log lines.
         """
-        return [self._print_line(stream.prefix, stream.readline()) for stream in rstreams]
+        return [
+            self._print_line(reader.prefix, line)
+            for reader in rstreams
+            for line in reader.read_lines()
+        ]
 
-    def _squeeze_logs(self, processes: list[dict]) -> None:
-        """Drain remaining output from all processes.
+    def _drain_logs(self, processes: list[dict]) -> LogDrain:
+        """Start printing the remaining output of processes in the background.
+
+        The other clients' output is printed meanwhile too, so a partial stop
+        never leaves them blocked on a full pipe.
 
         Args:
             processes: List of process metadata dicts.
+
+        Returns:
+            The running drain, to be finished with ``_squeeze_logs``.
         """
-        for meta in processes:
-            stream = meta["process"].stdout
-            for line in iter(stream.readline, b""):
-                self._print_line(stream.prefix, line)
+        stopping = {id(meta) for meta in processes}
+        others = [meta["reader"] for meta in self.processes if id(meta) not in stopping]
+        drain = LogDrain([meta["reader"] for meta in processes], self._print_line, others)
+        drain.start()
+        return drain
 
-    def _interrupt_on_error(self, logs: list[str | None]) -> bool:
-        """Check for known error conditions and interrupt if found.
+    def _squeeze_logs(self, drain: LogDrain) -> None:
+        """Wait up to LOG_DRAIN_TIMEOUT for a drain to read every pipe to EOF.
 
         Args:
-            logs: List of log lines to check.
+            drain: A drain started by ``_drain_logs``.
+        """
+        if not drain.close(LOG_DRAIN_TIMEOUT):
+            print(f"Gave up on remaining output after {LOG_DRAIN_TIMEOUT:.0f}s")
+
+    def _interrupt_on_error(self) -> bool:
+        """Act on the error rules that fired since the last check.
 
         Returns:
-            True if an error was detected and interrupt sent.
+            True if the whole stack was interrupted.
         """
-        for log in logs:
-            if log and "Beacon backfilling failed" in log:
-                self._interrupt(hard=False)
-                return True
-        return False
+        triggered, self.triggered = self.triggered, []
+        interrupted = False
+        for rule, source in triggered:
+            print(f"[bright_red]{rule.name} matched {source} output: {rule.action}[/bright_red]")
+            if rule.action == RuleAction.ALERT or interrupted:
+                continue
+            if rule.action == RuleAction.RESTART_PROCESS:
+                # The exit is picked up as a crash and restarted per its policy
+                processes = [meta for meta in self.processes if meta.get("name") == source]
+                if processes:
+                    self._interrupt(hard=False, processes=processes)
+                continue
+            if rule.action == RuleAction.TERMINATE and self.env.should_manage_snapshots():
+                print("Terminating instance to replace its volume...")
+                self.terminating = True
+                self.snapshot.terminate()
+            self._interrupt(hard=False)
+            interrupted = True
+        return interrupted
 
     def _poll_processes(self, processes: list[dict]):
         """Generate poll results for all processes.
@@ -423,6 +742,17 @@ class Node:
         """
         return all(self._poll_processes(processes))
 
+    def _dead_processes(self, processes: list[dict]) -> list[dict]:
+        """Get the processes that have terminated.
+
+        Args:
+            processes: List of process metadata dicts.
+
+        Returns:
+            Metadata dicts of dead processes.
+        """
+        return [meta for meta in processes if meta["process"].poll() is not None]
+
     def _any_process_is_dead(self, processes: list[dict]) -> bool:
         """Check if any process has terminated.
 
@@ -434,31 +764,267 @@ class Node:
         """
         return any(self._poll_processes(processes))
 
+    def _wait_for_exit(self, meta: dict, timeout: float) -> bool:
+        """Block until a process exits or the timeout passes.
+
+        Waits on a pidfd where the platform has one, and on Popen.wait
+        elsewhere, so an exit is noticed as soon as it happens.
+
+        Args:
+            meta: Process metadata dict.
+            timeout: Longest seconds to wait.
+
+        Returns:
+            True if the process has exited.
+        """
+        process = meta["process"]
+        if process.poll() is not None:
+            return True
+        try:
+            pidfd = os.pidfd_open(process.pid)
+        except (AttributeError, OSError):
+            try:
+                process.wait(timeout)
+            except subprocess.TimeoutExpired:
+                return False
+            return True
+        try:
+            select.select([pidfd], [], [], timeout)
+        finally:
+            os.close(pidfd)
+        return process.poll() is not None
+
+    def _print_shutdown_stages(self) -> None:
+        """Print how long each process took to stop."""
+        if self.shutdown_durations:
+            stages = ", ".join(
+                f"{name} {seconds:.1f}s" for name, seconds in self.shutdown_durations.items()
+            )
+            print(f"Shutdown stages: {stages}")
+
     def _handle_gracefully(self, processes: list[dict], hard: bool) -> None:
-        """Gracefully stop all processes with escalating signals.
+        """Stop processes one at a time in shutdown order with escalating signals.
 
-        Sends SIGINT, waits for KILL_TIME, escalates to SIGTERM,
-        waits again, then SIGKILL if needed.
+        Dependents stop before the clients they use, so geth is only signalled
+        once nothing needs it. Each process gets SIGINT, then SIGTERM once its
+        shutdown budget has passed, then SIGKILL. Output from all of them is
+        drained concurrently the whole time, as is the output of every
+        process left running.
 
         Args:
             processes: List of process metadata dicts.
             hard: Whether this is a hard stop (ignores kill_in_progress).
         """
+        self.shutdown_durations = {}
+        # Keep every pipe flowing so no child blocks on output while stopping
+        drain = self._drain_logs(processes)
+        for meta in get_shutdown_order(processes):
+            if meta["process"].poll() is not None:
+                continue
+            started = monotonic()
+            budget = get_shutdown_budget(meta.get("name", ""))
+            for stop in (self._interrupt, self._terminate):
+                stop(hard=hard, processes=[meta])
+                if self._wait_for_exit(meta, budget):
+                    break
+            else:
+                self._kill(hard=hard, processes=[meta])
+                # Reap it, so the exit is seen as soon as this returns
+                self._wait_for_exit(meta, budget)
+            self.shutdown_durations[meta.get("name", "?")] = monotonic() - started
+        self._print_shutdown_stages()
+        # Log rest of output
+        self._squeeze_logs(drain)
+        self._show(self.throttle.pending())
+        self.sink.flush()
+
+    def _escalate(self, name: str) -> None:
+        """Terminate the instance because a process is crash looping.
+
+        Terminating forces a fresh volume from the latest snapshot. Outside
+        AWS there is no instance to replace, so the stack is just restarted.
+
+        Args:
+            name: The crash looping process name.
+        """
+        count = self.crashes.count(name)
+        print(f"[bright_red]{name} crashed {count} times in {CRASH_LOOP_WINDOW}s[/bright_red]")
+        if self.env.should_manage_snapshots():
+            print("Terminating instance to replace its volume...")
+            self.terminating = True
+            self.snapshot.terminate()
+        # The restarted stack gets a fresh count, not an escalation per crash
+        self.crashes.reset(name)
 
-        def wait_for_exit() -> bool:
-            start = time()
-            while not self._all_processes_are_dead(processes) and time() - start < KILL_TIME:
-                sleep(1)
-            return self._all_processes_are_dead(processes)
+    def _dump_incident(self, name: str, code: int | None) -> None:
+        """Write the last lines of a dead process to an incident file.
 
-        # Send SIGINT first for graceful shutdown
-        self._interrupt(hard=hard)
-        if not wait_for_exit():
-            self._terminate(hard=hard)
-        if not wait_for_exit():
-            self._kill(hard=hard)
-        # Log rest of output
-        self._squeeze_logs(self.processes)
+        Args:
+            name: The process name.
+            code: The process's exit code.
+        """
+        reason = f"exited with code {code}"
+        directory = os.path.join(os.path.dirname(self.logs_file), "incidents")
+        try:
+            path = self.history.dump(name, directory, reason)
+        except OSError as e:
+            logging.exception(e)
+            return
+        print(f"{name} {reason}, last lines saved to {path}")
+
+    def _plan_recovery(self, name: str, code: int | None) -> tuple[list[str], float] | None:
+        """Record a crash and decide what to restart, per the process's policy.
+
+        Shared by both engines, after the dead process's output was drained.
+
+        Args:
+            name: The dead process's name.
+            code: Its exit code.
+
+        Returns:
+            (names of the started processes to restart, backoff delay), or
+            None if the whole stack must be restarted instead.
+        """
+        self._dump_incident(name, code)
+        delay = self.crashes.record(name)
+        if self.crashes.is_crash_looping(name):
+            self._escalate(name)
+            return None
+
+        policy = get_policy(name)
+        if policy is RestartPolicy.ALL:
+            return None
+        group = get_restart_group(name) if policy is RestartPolicy.DEPENDENTS else [name]
+        # Members still waiting on a startup gate are started once it opens
+        started = {meta["name"] for meta in self.processes}
+        group = [member for member in group if member in started]
+        print(f"{name} exited, restarting {', '.join(group)} in {delay:.0f}s [{policy}]")
+        return group, delay
+
+    def _recover(self, dead: list[dict]) -> bool:
+        """Schedule restarts for dead processes according to their policies.
+
+        Processes restarted together with a dead one are stopped right away;
+        the whole group is respawned once its backoff delay has passed.
+
+        Args:
+            dead: Metadata dicts of dead processes.
+
+        Returns:
+            False if the whole stack must be restarted instead.
+        """
+        for meta in dead:
+            name = meta["name"]
+            if name in self.pending_restarts:
+                continue
+            self._squeeze_logs(self._drain_logs([meta]))
+            plan = self._plan_recovery(name, meta["process"].poll())
+            if plan is None:
+                return False
+            group, delay = plan
+            due = monotonic() + delay
+            running = [
+                other
+                for other in self.processes
+                if other["name"] in group
+                and other["name"] not in self.pending_restarts
+                and other["process"].poll() is None
+            ]
+            for member in group:
+                self.pending_restarts[member] = due
+            if running:
+                self._handle_gracefully(running, hard=False)
+        return True
+
+    def _restart_due(self) -> None:
+        """Respawn processes whose restart delay has passed, in start order."""
+        now = monotonic()
+        for i, meta in enumerate(self.processes):
+            due = self.pending_restarts.get(meta["name"])
+            if due is not None and due <= now:
+                del self.pending_restarts[meta["name"]]
+                if meta["process"].poll() is None:
+                    # Never run two copies of a client on the same data
+                    self._handle_gracefully([meta], hard=False)
+                self.processes[i] = self._spawn(meta["name"])
+
+    def _execution_stalled(self) -> bool:
+        """Check whether geth is stuck rather than waiting on the beacon node.
+
+        After the merge, geth only imports the blocks the beacon node hands
+        it, so its head standing still only counts while the beacon node is
+        reachable and in sync.
+
+        Returns:
+            True if geth's head has not advanced for its stall time while the
+            beacon node was in sync.
+        """
+        since = self.beacon.synced_since
+        return since is not None and self.chain.stalled(since=since)
+
+    def _check_execution(self) -> None:
+        """Restart geth if it is in sync but its head has stopped advancing."""
+        if not self._execution_stalled() or "execution" in self.pending_restarts:
+            return
+        execution = [
+            meta
+            for meta in self.processes
+            if meta["name"] == "execution" and meta["process"].poll() is None
+        ]
+        if not execution:
+            return
+        block = self.chain.status.block
+        print(
+            f"[bright_red]Execution head stuck at block {block} for "
+            f"{self.chain.stall_time:.0f}s, restarting[/bright_red]"
+        )
+        self.chain.reset()
+        # The exit is picked up as a crash and restarted per its policy
+        self._handle_gracefully(execution, hard=False)
+
+    def _set_snapshot_due(self) -> None:
+        """Compute when the most recent snapshot becomes too old, once per run."""
+        remaining = self.snapshot.seconds_until_older_than(self.most_recent, SNAPSHOT_DAYS)
+        self.snapshot_due = None if remaining is None else monotonic() + remaining
+
+    def _select_timeout(self, open_streams: list[LineReader]) -> float | None:
+        """Get how long select may block before a restart or start is due.
+
+        Args:
+            open_streams: Readers that have not reached EOF.
+
+        Returns:
+            Timeout in seconds, or None to block until output arrives.
+        """
+        timeouts = []
+        if self.pending_restarts:
+            timeouts.append(max(0.0, min(self.pending_restarts.values()) - monotonic()))
+        if self.planned:
+            timeouts.append(max(0.0, min(self.planned.values()) - monotonic()))
+        if self.snapshot_due is not None:
+            timeouts.append(max(0.0, self.snapshot_due - monotonic()))
+        if self.startup is not None:
+            startup_timeout = self.startup.timeout()
+            if startup_timeout is not None:
+                timeouts.append(startup_timeout)
+        if timeouts:
+            return min(timeouts)
+        return None if open_streams else 1
+
+    def _pause(self, seconds: float) -> None:
+        """Wait before restarting the stack, returning early if asked to stop.
+
+        Args:
+            seconds: Longest seconds to wait.
+        """
+        print(f"Restarting the stack in {seconds:.0f}s")
+        select.select([self._wake_read], [], [], seconds)
+
+    def _wait_for_termination(self) -> None:
+        """Block while the EC2 instance is being terminated, unless asked to stop."""
+        while self.terminating and not self.stop_requested:
+            print("Waiting for stale EC2 instance to terminate...")
+            sleep(5)
 
     def run(self) -> None:
         """Run the staking node main loop.
@@ -471,30 +1037,86 @@ class Node:
             if terminate:
                 self.terminating = True
                 self.snapshot.terminate()
-                while self.terminating:
-                    print("Waiting for stale EC2 instance to terminate...")
-                    sleep(5)
-
-        while True:
-            self.most_recent = self.snapshot.backup()
-            self.relays = self.booster.get_relays()
-            processes, streams = self._start()
+                self._wait_for_termination()
+
+        if self.monitor.interval:
+            self.monitor.start()
+        if self.metrics_server.port:
+            self.metrics_server.start()
+        if self.log_server.port:
+            self.log_server.start()
+        self.chain.start()
+        self.beacon.start()
+        self.duties.start()
+
+        while not self.stop_requested:
+            startup = self._prepare()
+            # Geth must not start before the snapshot has been taken
+            self.most_recent = startup.run("backup", self.snapshot.backup)
+            self._set_snapshot_due()
+            self._start()
+            self.pending_restarts = {}
+            self.planned = {}
+            # Lines printed while the previous stack stopped must not act on the new one
+            self.triggered = []
             sent_interrupt = False
+            restart_delay = 0.0
 
             while True:
-                rstreams, _, _ = select.select(streams, [], [])
-                backup_is_recent = not self.snapshot.is_older_than(self.most_recent, SNAPSHOT_DAYS)
-                if not backup_is_recent and not sent_interrupt:
+                # Drained pipes stay readable forever, so only select on open ones
+                open_streams = [meta["reader"] for meta in self.processes if not meta["reader"].eof]
+                timeout = self._select_timeout(open_streams)
+                rstreams, _, _ = select.select(
+                    [*open_streams, self.monitor, self._wake_read], [], [], timeout
+                )
+                if self.stop_requested:
+                    break
+                if self.monitor in rstreams:
+                    rstreams.remove(self.monitor)
+                    self._apply_relay_update()
+                if self.snapshot_due is not None and self.snapshot_due <= monotonic():
+                    self.snapshot_due = None
+                    self.planned["snapshot"] = self._defer("snapshot pause")
+                if self._planned_due("snapshot") and not sent_interrupt:
                     print("Pausing node to initiate snapshot.")
                     self._interrupt(hard=False)
                     sent_interrupt = True
+                if self._planned_due("mev"):
+                    self._restart_mev()
 
-                logs = self._stream_logs(rstreams)
-                self._interrupt_on_error(logs)
-                if self._any_process_is_dead(processes):
+                self._stream_logs(rstreams)
+                if self._interrupt_on_error():
+                    sent_interrupt = True
+                # Anything dying after a stack-wide interrupt means a full restart
+                dead = self._dead_processes(self.processes)
+                if dead and sent_interrupt:
                     break
-
+                if dead and not self._recover(dead):
+                    # Crash-driven stack restarts back off like process restarts
+                    restart_delay = self.crashes.record(STACK)
+                    break
+                self._restart_due()
+                self._start_ready()
+                self._check_execution()
+
+            startup.close()
+            if self.stop_requested:
+                # stop() takes the processes down
+                return
             self._handle_gracefully(self.processes, hard=False)
+            self._wait_for_termination()
+            if restart_delay and not self.stop_requested:
+                self._pause(restart_delay)
+
+    def request_stop(self, *_) -> None:
+        """Ask the main loop to return so the node can be stopped.
+
+        Only sets a flag and wakes select, so it is safe as a signal handler
+        even while the main thread holds the log sink's lock.
+        """
+        self.stop_requested = True
+        with contextlib.suppress(BlockingIOError):
+            os.write(self._wake_write, b"\0")
 
     def stop(self) -> None:
         """Stop the node gracefully and exit.
@@ -503,8 +1125,20 @@ class Node:
         then exits the process.
         """
         self.kill_in_progress = True
+        self.monitor.stop()
+        self.metrics_server.stop()
+        self.log_server.stop()
+        self.chain.stop()
+        self.beacon.stop()
+        self.duties.stop()
         self._handle_gracefully(self.processes, hard=True)
+        self.sink.close()
         print("Node stopped")
+        self._snapshot_if_draining()
+        exit(0)
+
+    def _snapshot_if_draining(self) -> None:
+        """Create a final snapshot if the ECS instance is draining."""
         if (
             self.env.should_manage_snapshots()
             and self.snapshot.instance_is_draining()
@@ -512,7 +1146,6 @@ class Node:
         ):
             self.snapshot.force_create()
             self.snapshot.update()
-        exit(0)
 
 
 def main() -> None:
@@ -521,19 +1154,22 @@ def main() -> None:
     snapshot = Snapshot() if AWS else NoOpSnapshotManager()
     node = Node(env=env, snapshot=snapshot)
 
-    def handle_signal(*_) -> None:
-        node.stop()
+    if ASYNC_ENGINE:
+        # The supervisor installs its own signal handlers and returns once stopped
+        asyncio.run(AsyncSupervisor(node).run())
+        return
 
-    signal.signal(signal.SIGINT, handle_signal)
-    signal.signal(signal.SIGTERM, handle_signal)
+    # Stopping from inside the handler could deadlock on locks held by the main loop
+    signal.signal(signal.SIGINT, node.request_stop)
+    signal.signal(signal.SIGTERM, node.request_stop)
     node.run()
+    node.stop()
 
 
 if __name__ == "__main__":
     main()
 
 # TODO:
-# - export metrics / have an easy way to monitor, Prometheus and Grafana Cloud free, node exporter
 # for prod, use savings plan (strictly better alt to reserved instances)
 #   - compute savings plan ec2 - r6g.xlarge $0.10 53% 3 yrs upfront / $0.14 32% 1 yr upfront
 #       ∧∧∧ More flexible
@@ -544,8 +1180,6 @@ if __name__ == "__main__":
 # Extra:
 # turn off node for 10 min every 24 hrs?
 # - data integrity protection
-#   - shutdown / terminate instance if process fails and others continue => forces new vol
-#       - perhaps implement counter so if 3 process failures in a row, terminate instance
 #   - use `geth --exec '(eth?.syncing?.currentBlock/eth?.syncing?.highestBlock)*100' attach`
 #       - will yield NaN if already synced or 68.512213 if syncing
 # - enable swap space if need more memory w 4vCPUs
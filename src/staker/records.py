@@ -0,0 +1,107 @@
+"""Structured records parsed from client log lines.
+
+This module parses each line the clients print exactly once into a compact
+record of receive time, source, level, message and key=value fields. It
+understands geth's terminal format, prysm's prefixed text format and the
+logfmt lines logrus writes for prysm and mev-boost, so records can be written
+as JSONL and handed to in-process consumers without rescanning the text.
+"""
+
+from __future__ import annotations
+
+import json
+import re
+from typing import NamedTuple
+
+from staker.config import PREFIXES
+from staker.utils import FIELD_PATTERN, parse_fields
+
+# Process name for each log prefix
+SOURCES: dict[str, str] = {prefix: name for name, prefix in PREFIXES.items()}
+
+# geth: 'INFO [10-18|12:00:00.123] Imported new chain segment    number=1 hash=0x..'
+GETH_PATTERN = re.compile(r"(TRACE|DEBUG|INFO|WARN|ERROR|CRIT)\s*\[[^\]]*\]\s*(.*)")
+# prysm: '[2026-10-18 12:00:00.00]  INFO blockchain: Synced new block slot=1'
+PRYSM_PATTERN = re.compile(
+    r"\[[^\]]*\]\s+(TRACE|DEBUG|INFO|WARN|WARNING|ERROR|FATAL|PANIC)\s+(?:([\w-]+): )?(.*)"
+)
+
+
+class Record(NamedTuple):
+    """One parsed log line.
+
+    Attributes:
+        ts: Unix time the line was received.
+        source: Process name, e.g. "execution".
+        level: Lowercase log level, or None if the line has none.
+        msg: The message without level, timestamp or fields.
+        fields: The line's key=value fields.
+    """
+
+    ts: float
+    source: str
+    level: str | None
+    msg: str
+    fields: dict[str, str]
+
+    def to_json(self) -> str:
+        """Serialize the record as one compact JSON line.
+
+        Returns:
+            The JSON text, without a trailing newline.
+        """
+        data: dict = {"ts": round(self.ts, 3), "src": self.source}
+        if self.level:
+            data["level"] = self.level
+        data["msg"] = self.msg
+        if self.fields:
+            data["fields"] = self.fields
+        return json.dumps(data, separators=(",", ":"), ensure_ascii=False)
+
+
+def split_message(text: str) -> tuple[str, dict[str, str]]:
+    """Split text into its leading message and trailing key=value fields.
+
+    Args:
+        text: Text after the level and timestamp.
+
+    Returns:
+        (message, fields).
+    """
+    match = FIELD_PATTERN.search(text)
+    # Only a key=value preceded by whitespace starts the fields
+    while match and match.start() and not text[match.start() - 1].isspace():
+        match = FIELD_PATTERN.search(text, match.end())
+    if not match:
+        return text.strip(), {}
+    return text[: match.start()].strip(), parse_fields(text[match.start() :])
+
+
+def parse_record(source: str, line: str, ts: float) -> Record:
+    """Parse a client log line into a record.
+
+    Args:
+        source: Process name of the client that printed the line.
+        line: The decoded line without prefix.
+        ts: Unix time the line was received.
+
+    Returns:
+        The record; unrecognized lines keep the whole text as the message.
+    """
+    if line.startswith(("time=", "level=")):
+        fields = parse_fields(line)
+        level = fields.pop("level", None)
+        msg = fields.pop("msg", "")
+        fields.pop("time", None)
+        return Record(ts, source, level, msg, fields)
+    if match := GETH_PATTERN.match(line):
+        level, rest = match.groups()
+        msg, fields = split_message(rest)
+        return Record(ts, source, level.lower(), msg, fields)
+    if match := PRYSM_PATTERN.match(line):
+        level, package, rest = match.groups()
+        msg, fields = split_message(rest)
+        if package:
+            fields = {"prefix": package, **fields}
+        return Record(ts, source, level.lower(), msg, fields)
+    return Record(ts, source, None, line, {})
@@ -0,0 +1,171 @@
+"""Per-process restart policies for the Ethereum staking node.
+
+This module decides how the supervisor reacts when a single process dies:
+restart it alone, restart it together with the processes that depend on it,
+or restart the whole stack. It also tracks recent crashes to compute
+exponential backoff and detect crash loops, and orders processes for shutdown.
+"""
+
+from __future__ import annotations
+
+from collections import deque
+from enum import StrEnum
+from time import monotonic
+
+from staker.config import (
+    CRASH_LOOP_THRESHOLD,
+    CRASH_LOOP_WINDOW,
+    DEPENDENTS,
+    KILL_TIME,
+    MAX_RESTART_BACKOFF,
+    RESTART_BACKOFF,
+    RESTART_POLICIES,
+    SHUTDOWN_BUDGETS,
+    SHUTDOWN_ORDER,
+)
+
+# CrashTracker name under which whole-stack restarts are backed off
+STACK = "stack"
+
+
+class RestartPolicy(StrEnum):
+    """How to recover when a process dies."""
+
+    ALONE = "restart-alone"
+    DEPENDENTS = "restart-dependents"
+    ALL = "restart-all"
+
+
+def get_policy(name: str) -> RestartPolicy:
+    """Get the configured restart policy for a process.
+
+    Args:
+        name: The process name (e.g. "mev").
+
+    Returns:
+        The process's policy, defaulting to restarting everything.
+    """
+    return RestartPolicy(RESTART_POLICIES.get(name, RestartPolicy.ALL))
+
+
+def get_restart_group(name: str) -> list[str]:
+    """Get a process and everything that transitively depends on it.
+
+    Args:
+        name: The process name.
+
+    Returns:
+        Process names in start order, starting with ``name``.
+    """
+    group = [name]
+    for member in group:
+        group += [dep for dep in DEPENDENTS.get(member, ()) if dep not in group]
+    return group
+
+
+def get_shutdown_order(processes: list[dict]) -> list[dict]:
+    """Sort processes so dependents stop before the clients they use.
+
+    Args:
+        processes: Process metadata dicts.
+
+    Returns:
+        The processes in shutdown order; unknown names keep their order last.
+    """
+
+    def rank(meta: dict) -> int:
+        name = meta.get("name")
+        return SHUTDOWN_ORDER.index(name) if name in SHUTDOWN_ORDER else len(SHUTDOWN_ORDER)
+
+    return sorted(processes, key=rank)
+
+
+def get_shutdown_budget(name: str) -> float:
+    """Get how long a process may take to exit after each shutdown signal.
+
+    Args:
+        name: The process name.
+
+    Returns:
+        Seconds to wait before escalating to the next signal.
+    """
+    return SHUTDOWN_BUDGETS.get(name, KILL_TIME)
+
+
+class CrashTracker:
+    """Tracks recent crashes per process for backoff and crash-loop detection.
+
+    Attributes:
+        backoff: Delay before the first restart, in seconds.
+        max_backoff: Upper bound on the restart delay, in seconds.
+        threshold: Crashes within the window that count as a crash loop.
+        window: Sliding window in seconds over which crashes are counted.
+    """
+
+    def __init__(
+        self,
+        backoff: float = RESTART_BACKOFF,
+        max_backoff: float = MAX_RESTART_BACKOFF,
+        threshold: int = CRASH_LOOP_THRESHOLD,
+        window: float = CRASH_LOOP_WINDOW,
+    ) -> None:
+        """Initialize the tracker.
+
+        Args:
+            backoff: Delay before the first restart, in seconds.
+            max_backoff: Upper bound on the restart delay, in seconds.
+            threshold: Crashes within the window that count as a crash loop.
+            window: Sliding window in seconds over which crashes are counted.
+        """
+        self.backoff = backoff
+        self.max_backoff = max_backoff
+        self.threshold = threshold
+        self.window = window
+        self._crashes: dict[str, deque[float]] = {}
+
+    def record(self, name: str, now: float | None = None) -> float:
+        """Record a crash and return how long to wait before restarting.
+
+        Args:
+            name: The process name.
+            now: Monotonic timestamp of the crash (defaults to now).
+
+        Returns:
+            Restart delay in seconds, doubling with each recent crash.
+        """
+        now = monotonic() if now is None else now
+        crashes = self._crashes.setdefault(name, deque())
+        crashes.append(now)
+        while crashes and now - crashes[0] > self.window:
+            crashes.popleft()
+        return min(self.backoff * 2 ** (len(crashes) - 1), self.max_backoff)
+
+    def count(self, name: str) -> int:
+        """Get the number of crashes within the window.
+
+        Args:
+            name: The process name.
+
+        Returns:
+            Number of recorded crashes still in the window.
+        """
+        return len(self._crashes.get(name, ()))
+
+    def reset(self, name: str) -> None:
+        """Forget a process's crashes, e.g. once a crash loop was acted on.
+
+        Args:
+            name: The process name.
+        """
+        self._crashes.pop(name, None)
+
+    def is_crash_looping(self, name: str) -> bool:
+        """Check whether a process has crashed too often recently.
+
+        Args:
+            name: The process name.
+
+        Returns:
+            True if the crash count reached the threshold.
+        """
+        return self.count(name) >= self.threshold
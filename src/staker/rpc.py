@@ -0,0 +1,311 @@
+"""JSON-RPC client for geth over its IPC socket.
+
+This module keeps a persistent Unix socket connection to ``geth.ipc``, sends
+batched JSON-RPC requests over it, and polls geth's sync and peer state at
+an adaptive interval for supervisor decisions and metrics.
+"""
+
+from __future__ import annotations
+
+import json
+import socket
+import threading
+from time import monotonic
+from typing import Any, NamedTuple
+
+from rich.console import Console
+
+from staker.config import (
+    EXECUTION_POLL_MAX,
+    EXECUTION_POLL_MIN,
+    EXECUTION_STALL_TIME,
+    IPC_TIMEOUT,
+    READ_CHUNK_BYTES,
+)
+
+console = Console(highlight=False)
+print = console.print
+
+# Polled together in one batch
+STATUS_CALLS: list[tuple[str, list]] = [
+    ("eth_syncing", []),
+    ("net_peerCount", []),
+    ("eth_blockNumber", []),
+    ("admin_peers", []),
+]
+
+
+class RpcError(Exception):
+    """An error response from the JSON-RPC server."""
+
+
+class IpcClient:
+    """JSON-RPC client over a persistent Unix socket connection.
+
+    geth writes each response as one JSON value followed by a newline.
+
+    Attributes:
+        path: Path to the IPC socket.
+        timeout: Socket timeout in seconds.
+    """
+
+    def __init__(self, path: str, timeout: float = IPC_TIMEOUT) -> None:
+        """Initialize the client without connecting yet.
+
+        Args:
+            path: Path to the IPC socket.
+            timeout: Socket timeout in seconds.
+        """
+        self.path = path
+        self.timeout = timeout
+        self._sock: socket.socket | None = None
+        self._id = 0
+
+    def call(self, method: str, params: list | None = None) -> Any:
+        """Call a single method.
+
+        Args:
+            method: The JSON-RPC method.
+            params: The method's parameters.
+
+        Returns:
+            The method's result.
+
+        Raises:
+            RpcError: If the server returned an error.
+            OSError: If the socket could not be used.
+        """
+        response = self._exchange([(method, params or [])])[0]
+        if "error" in response:
+            raise RpcError(response["error"].get("message", response["error"]))
+        return response.get("result")
+
+    def batch(self, calls: list[tuple[str, list]]) -> list[Any]:
+        """Send several calls as one batch request.
+
+        Args:
+            calls: (method, params) pairs.
+
+        Returns:
+            Results in call order; None for calls that returned an error.
+
+        Raises:
+            OSError: If the socket could not be used.
+        """
+        return [
+            None if "error" in response else response.get("result")
+            for response in self._exchange(calls)
+        ]
+
+    def _exchange(self, calls: list[tuple[str, list]]) -> list[dict]:
+        """Send a batch and collect its responses, reconnecting once if needed.
+
+        Args:
+            calls: (method, params) pairs.
+
+        Returns:
+            Response objects in call order.
+        """
+        first_id = self._id + 1
+        self._id += len(calls)
+        payload = [
+            {"jsonrpc": "2.0", "id": first_id + i, "method": method, "params": params}
+            for i, (method, params) in enumerate(calls)
+        ]
+        data = json.dumps(payload).encode() + b"\n"
+
+        reused = self._sock is not None
+        try:
+            responses = self._send(data)
+        except (OSError, ValueError):
+            self.close()
+            if not reused:
+                raise
+            # geth may have restarted since the last call
+            responses = self._send(data)
+
+        by_id = {response.get("id"): response for response in responses}
+        missing = {"error": {"message": "missing response"}}
+        return [by_id.get(first_id + i, missing) for i in range(len(calls))]
+
+    def _send(self, data: bytes) -> list[dict]:
+        """Write a request and read one newline-terminated response.
+
+        Args:
+            data: The encoded request.
+
+        Returns:
+            The decoded batch response.
+        """
+        if self._sock is None:
+            sock = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+            sock.settimeout(self.timeout)
+            try:
+                sock.connect(self.path)
+            except OSError:
+                sock.close()
+                raise
+            self._sock = sock
+        self._sock.sendall(data)
+
+        chunks = []
+        while True:
+            chunk = self._sock.recv(READ_CHUNK_BYTES)
+            if not chunk:
+                raise ConnectionError("IPC connection closed")
+            chunks.append(chunk)
+            if chunk.endswith(b"\n"):
+                response = json.loads(b"".join(chunks))
+                return response if isinstance(response, list) else [response]
+
+    def close(self) -> None:
+        """Close the connection; the next call reconnects."""
+        if self._sock is not None:
+            self._sock.close()
+            self._sock = None
+
+
+class ChainStatus(NamedTuple):
+    """geth's sync and peer state from one poll."""
+
+    block: int
+    highest: int
+    syncing: bool
+    peers: int
+    inbound: int | None
+
+
+def parse_status(results: list[Any]) -> ChainStatus:
+    """Build a ChainStatus from the results of STATUS_CALLS.
+
+    Args:
+        results: Results of eth_syncing, net_peerCount, eth_blockNumber and
+            admin_peers; admin_peers may be None if the admin API is off.
+
+    Returns:
+        The parsed status.
+    """
+    syncing, peer_count, block_number, peers = results
+    block = int(block_number, 16)
+    highest = int(syncing["highestBlock"], 16) if syncing else block
+    inbound = None
+    if peers is not None:
+        inbound = sum(1 for peer in peers if peer.get("network", {}).get("inbound"))
+    return ChainStatus(block, highest, bool(syncing), int(peer_count, 16), inbound)
+
+
+class ExecutionMonitor:
+    """Polls geth's sync and peer state in the background.
+
+    The interval starts at ``min_interval`` and doubles up to
+    ``max_interval`` while the sync state and peer count stay the same; any
+    change, or geth being unreachable, resets it.
+
+    Attributes:
+        client: The IPC JSON-RPC client.
+        status: The latest status, or None if geth was unreachable.
+        interval: Seconds until the next poll.
+    """
+
+    def __init__(
+        self,
+        path: str,
+        min_interval: float = EXECUTION_POLL_MIN,
+        max_interval: float = EXECUTION_POLL_MAX,
+        stall_time: float = EXECUTION_STALL_TIME,
+    ) -> None:
+        """Initialize the monitor without starting it.
+
+        Args:
+            path: Path to geth's IPC socket.
+            min_interval: Shortest seconds between polls.
+            max_interval: Longest seconds between polls.
+            stall_time: Seconds without a new head after which a synced
+                geth counts as stalled.
+        """
+        self.client = IpcClient(path)
+        self.min_interval = min_interval
+        self.max_interval = max_interval
+        self.stall_time = stall_time
+        self.interval = min_interval
+        self.status: ChainStatus | None = None
+        self._head_changed_at = monotonic()
+        self._stop = threading.Event()
+
+    def start(self) -> None:
+        """Poll in a daemon thread until stopped."""
+        threading.Thread(target=self._run, name="execution-monitor", daemon=True).start()
+
+    def _run(self) -> None:
+        """Poll on the adaptive interval until stopped."""
+        while not self._stop.wait(self.interval):
+            try:
+                self.poll()
+            except Exception as e:
+                print(f"[bright_yellow]WARNING: Execution status poll failed: {e}[/bright_yellow]")
+
+    def poll(self, now: float | None = None) -> ChainStatus | None:
+        """Fetch geth's status and adapt the polling interval.
+
+        Args:
+            now: Monotonic timestamp (defaults to now).
+
+        Returns:
+            The new status, or None if geth was unreachable.
+        """
+        now = monotonic() if now is None else now
+        try:
+            status = parse_status(self.client.batch(STATUS_CALLS))
+        except (OSError, ValueError, TypeError, KeyError):
+            self.client.close()
+            status = None
+
+        previous = self.status
+        if status is None or previous is None or status.block != previous.block:
+            self._head_changed_at = now
+        if (
+            status is None
+            or previous is None
+            or (status.syncing, status.peers) != (previous.syncing, previous.peers)
+        ):
+            self.interval = self.min_interval
+        else:
+            self.interval = min(self.interval * 2, self.max_interval)
+
+        if status is not None and (previous is None or status.syncing != previous.syncing):
+            if status.syncing:
+                print(f"Execution client syncing: block {status.block} of {status.highest}")
+            else:
+                print(f"Execution client in sync at block {status.block}")
+        self.status = status
+        return status
+
+    def stalled(self, now: float | None = None, since: float | None = None) -> bool:
+        """Check whether a synced geth has stopped importing blocks.
+
+        Args:
+            now: Monotonic timestamp (defaults to now).
+            since: Monotonic time before which a stalled head does not count,
+                e.g. when the beacon node got in sync.
+
+        Returns:
+            True if geth reports being in sync but its head has not advanced
+            for the stall time.
+        """
+        status = self.status
+        if status is None or status.syncing:
+            return False
+        now = monotonic() if now is None else now
+        started = self._head_changed_at if since is None else max(self._head_changed_at, since)
+        return now - started >= self.stall_time
+
+    def reset(self) -> None:
+        """Forget the current status, e.g. after restarting geth."""
+        self.status = None
+        self.interval = self.min_interval
+        self._head_changed_at = monotonic()
+
+    def stop(self) -> None:
+        """Stop polling and close the connection."""
+        self._stop.set()
+        self.client.close()
@@ -0,0 +1,168 @@
+"""Configurable rules that act on client log lines.
+
+This module compiles every error rule from ERROR_RULES into one regex
+alternation per source process, so each line is scanned once no matter how
+many rules exist. A rule fires once its pattern has matched ``threshold``
+times within ``window`` seconds, and names the action the node should take.
+"""
+
+from __future__ import annotations
+
+import re
+from collections import deque
+from enum import StrEnum
+from time import monotonic
+from typing import NamedTuple
+
+from staker.config import ERROR_RULES, PREFIXES
+
+# Global inline flags such as "(?i)" are only valid at the start of a whole
+# regex, so they break once a pattern is part of the alternation
+GLOBAL_FLAGS = re.compile(r"\(\?[aiLmsux]+\)")
+# Escaped backslashes first, so "\\1" is not taken for a backreference
+BACKREFERENCE = re.compile(r"\\\\|(\\[1-9]|\(\?P=)")
+
+
+class RuleAction(StrEnum):
+    """What the node does when a rule fires."""
+
+    SOFT_RESTART = "soft-restart"
+    RESTART_PROCESS = "restart-process"
+    ALERT = "alert"
+    TERMINATE = "terminate"
+
+
+class ErrorRule(NamedTuple):
+    """A pattern to watch for and what to do about it.
+
+    Attributes:
+        name: Unique rule name, used in metrics.
+        pattern: Compiled regex searched for in each line.
+        source: Process whose lines are checked, or None for all.
+        threshold: Matches within the window that fire the rule.
+        window: Seconds over which matches are counted.
+        action: What to do when the rule fires.
+    """
+
+    name: str
+    pattern: re.Pattern
+    source: str | None
+    threshold: int
+    window: float
+    action: RuleAction
+
+    @classmethod
+    def from_config(cls, rule: dict) -> ErrorRule:
+        """Build a rule from its config entry.
+
+        Args:
+            rule: Dict with "name", "pattern", "action" and optionally
+                "source", "threshold" (default 1) and "window" (default 0).
+
+        Returns:
+            The rule.
+
+        Raises:
+            ValueError: If the action is unknown, the threshold is not
+                positive, or the pattern uses global inline flags or
+                backreferences, which break in the combined regex.
+            re.error: If the pattern is not a valid regex.
+        """
+        name, pattern = rule["name"], rule["pattern"]
+        threshold = int(rule.get("threshold", 1))
+        if threshold < 1:
+            raise ValueError(f"Rule {name} needs a positive threshold")
+        if GLOBAL_FLAGS.match(pattern):
+            raise ValueError(f"Rule {name} uses global inline flags; scope them, e.g. (?i:...)")
+        if any(found.group(1) for found in BACKREFERENCE.finditer(pattern)):
+            raise ValueError(f"Rule {name} uses a backreference")
+        return cls(
+            name=name,
+            pattern=re.compile(pattern),
+            source=rule.get("source"),
+            threshold=threshold,
+            window=float(rule.get("window", 0)),
+            action=RuleAction(rule["action"]),
+        )
+
+
+class RuleEngine:
+    """Matches lines against all rules with one compiled search per line.
+
+    Attributes:
+        rules: The configured rules, in priority order.
+        hits: Pattern matches per rule name.
+        fired: Times each rule reached its threshold.
+    """
+
+    def __init__(self, rules: list[dict] = ERROR_RULES) -> None:
+        """Validate the rules and compile the matcher of every source.
+
+        Args:
+            rules: Rule config entries.
+
+        Raises:
+            ValueError: If a rule is invalid.
+            re.error: If a pattern is invalid, alone or combined with the others.
+        """
+        self.rules = [ErrorRule.from_config(rule) for rule in rules]
+        self.hits = {rule.name: 0 for rule in self.rules}
+        self.fired = {rule.name: 0 for rule in self.rules}
+        self._recent: dict[str, deque[float]] = {rule.name: deque() for rule in self.rules}
+        sources = {None, *PREFIXES, *(rule.source for rule in self.rules)}
+        # Lines of any other source only see the rules for all sources (key None)
+        self._matchers = {source: self._compile(source) for source in sources}
+
+    def _compile(self, source: str | None) -> tuple[re.Pattern, list[ErrorRule]] | None:
+        """Compile the combined pattern of every rule that applies to a source.
+
+        The alternation has no capturing groups of its own: a group per rule
+        stops the regex engine from skipping ahead on literal prefixes and
+        makes it several times slower than searching each pattern in turn.
+
+        Args:
+            source: The process name, or None for rules that apply to all.
+
+        Returns:
+            (compiled alternation, its rules in order), or None if no rule applies.
+        """
+        rules = [rule for rule in self.rules if rule.source in (None, source)]
+        if not rules:
+            return None
+        return re.compile("|".join(f"(?:{rule.pattern.pattern})" for rule in rules)), rules
+
+    def match(self, source: str, text: str, now: float | None = None) -> ErrorRule | None:
+        """Check a line and return the rule it made fire, if any.
+
+        The leftmost match wins, and among rules matching there the first
+        configured one, so at most one rule counts each line.
+
+        Args:
+            source: The process that printed the line.
+            text: The line.
+            now: Monotonic time of the line (defaults to now).
+
+        Returns:
+            The rule that reached its threshold with this line, or None.
+        """
+        matcher = self._matchers.get(source, self._matchers[None])
+        if matcher is None:
+            return None
+        combined, rules = matcher
+        found = combined.search(text)
+        if found is None:
+            return None
+        # Matches are rare, so only then find the first rule matching where the alternation did
+        rule = next(rule for rule in rules if rule.pattern.match(text, found.start()))
+        self.hits[rule.name] += 1
+
+        now = monotonic() if now is None else now
+        recent = self._recent[rule.name]
+        while recent and now - recent[0] > rule.window:
+            recent.popleft()
+        recent.append(now)
+        if len(recent) < rule.threshold:
+            return None
+        recent.clear()
+        self.fired[rule.name] += 1
+        return rule
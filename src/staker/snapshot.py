@@ -46,6 +46,22 @@ class SnapshotManager(ABC):
         """
         ...
 
+    @abstractmethod
+    def seconds_until_older_than(
+        self, snapshot: dict[str, Any] | None, num_days: int
+    ) -> float | None:
+        """Get how long until a snapshot becomes older than the given number of days.
+
+        Args:
+            snapshot: The snapshot to check.
+            num_days: Maximum age in days.
+
+        Returns:
+            Seconds until it is too old (0 if it already is), or None if it
+            never will be.
+        """
+        ...
+
     @abstractmethod
     def update(self) -> bool:
         """Update launch template with latest snapshot.
@@ -94,6 +110,10 @@ class NoOpSnapshotManager(SnapshotManager):
         """Always returns False (never triggers backup)."""
         return False
 
+    def seconds_until_older_than(self, snapshot: dict[str, Any] | None, num_days: int) -> None:
+        """Always returns None (never triggers backup)."""
+        return None
+
     def update(self) -> bool:
         """No-op update."""
         return False
@@ -143,6 +163,15 @@ class Snapshot(SnapshotManager):
         max_delta = timedelta(days=num_days)
         return actual_delta > max_delta
 
+    def seconds_until_older_than(self, snapshot: dict[str, Any] | None, num_days: int) -> float:
+        """Get how long until a snapshot becomes older than the given number of days."""
+        if snapshot is None:
+            return 0.0
+        created = self._get_snapshot_time(snapshot)
+        now = datetime.now(UTC).replace(tzinfo=None)
+        remaining = created + timedelta(days=num_days) - now
+        return max(0.0, remaining.total_seconds())
+
     def force_create(self) -> dict[str, Any]:
         """Force create a new snapshot immediately."""
         snapshot = self.ec2.create_snapshot(
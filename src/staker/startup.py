@@ -0,0 +1,184 @@
+"""Readiness-gated startup pipeline for the Ethereum staking node.
+
+This module runs independent startup preparation (relay probing, checkpoint
+fetch) in background threads and starts each client only once the things it
+depends on are ready, recording how long every phase took.
+"""
+
+from __future__ import annotations
+
+import socket
+from collections.abc import Callable
+from concurrent.futures import Future, ThreadPoolExecutor
+from time import monotonic
+from typing import Any
+
+import requests
+
+from staker.config import STARTUP_POLL_INTERVAL
+
+
+def ipc_is_ready(path: str) -> bool:
+    """Check whether a Unix socket (e.g. geth.ipc) accepts connections.
+
+    Args:
+        path: Path to the socket.
+
+    Returns:
+        True if a connection could be opened.
+    """
+    with socket.socket(socket.AF_UNIX, socket.SOCK_STREAM) as sock:
+        sock.settimeout(1)
+        try:
+            sock.connect(path)
+        except OSError:
+            return False
+    return True
+
+
+def http_is_ready(url: str) -> bool:
+    """Check whether an HTTP endpoint answers at all.
+
+    Any response counts, since e.g. a syncing beacon node reports 206/503
+    on its health endpoint while its REST API is already usable.
+
+    Args:
+        url: The URL to request.
+
+    Returns:
+        True if the server sent a response.
+    """
+    try:
+        requests.get(url, timeout=1)
+    except requests.exceptions.RequestException:
+        return False
+    return True
+
+
+class StartupPipeline:
+    """Starts clients as their dependencies become ready.
+
+    Preparation tasks run concurrently in a thread pool; gated phases are
+    released in registration order once their readiness check passes.
+
+    Attributes:
+        durations: Seconds each preparation task took, and seconds from
+            pipeline start until each gated phase was released.
+        poll_interval: Minimum seconds between readiness checks.
+    """
+
+    def __init__(self, poll_interval: float = STARTUP_POLL_INTERVAL) -> None:
+        """Initialize the pipeline and start its clock.
+
+        Args:
+            poll_interval: Minimum seconds between readiness checks.
+        """
+        self.poll_interval = poll_interval
+        self.durations: dict[str, float] = {}
+        self._started_at = monotonic()
+        self._last_poll: float | None = None
+        self._gates: dict[str, tuple[Callable[[], bool], tuple[str, ...]]] = {}
+        self._executor = ThreadPoolExecutor(thread_name_prefix="startup")
+
+    @property
+    def pending(self) -> bool:
+        """Whether any gated phase has not been released yet."""
+        return bool(self._gates)
+
+    def submit(self, name: str, fn: Callable[[], Any]) -> Future:
+        """Run a preparation task in the background and time it.
+
+        Args:
+            name: Phase name used for its duration.
+            fn: The task to run.
+
+        Returns:
+            Future for the task's result.
+        """
+
+        def timed() -> Any:
+            start = monotonic()
+            try:
+                return fn()
+            finally:
+                self.durations[name] = monotonic() - start
+
+        return self._executor.submit(timed)
+
+    def run(self, name: str, fn: Callable[[], Any]) -> Any:
+        """Run a task in the calling thread and time it.
+
+        Args:
+            name: Phase name used for its duration.
+            fn: The task to run.
+
+        Returns:
+            The task's result.
+        """
+        start = monotonic()
+        try:
+            return fn()
+        finally:
+            self.durations[name] = monotonic() - start
+
+    def gate(self, name: str, is_ready: Callable[[], bool], after: tuple[str, ...] = ()) -> None:
+        """Register a phase that is released once ``is_ready`` returns True.
+
+        Args:
+            name: Phase name (e.g. the client to start).
+            is_ready: Readiness check; must not block for long.
+            after: Phases that must be released first.
+        """
+        self._gates[name] = (is_ready, after)
+
+    def ready(self, now: float | None = None) -> list[str]:
+        """Release every gated phase whose readiness check passes.
+
+        Checks are throttled to one round per poll interval.
+
+        Args:
+            now: Monotonic timestamp (defaults to now).
+
+        Returns:
+            Released phase names in registration order.
+        """
+        now = monotonic() if now is None else now
+        if self._last_poll is not None and now - self._last_poll < self.poll_interval:
+            return []
+        self._last_poll = now
+
+        released = []
+        for name, (is_ready, after) in list(self._gates.items()):
+            if not any(dep in self._gates for dep in after) and is_ready():
+                del self._gates[name]
+                self.durations[name] = monotonic() - self._started_at
+                released.append(name)
+        return released
+
+    def timeout(self, now: float | None = None) -> float | None:
+        """Get how long the caller may wait before the next readiness check.
+
+        Args:
+            now: Monotonic timestamp (defaults to now).
+
+        Returns:
+            Seconds until the next check, or None if nothing is pending.
+        """
+        if not self._gates:
+            return None
+        if self._last_poll is None:
+            return 0.0
+        now = monotonic() if now is None else now
+        return max(0.0, self.poll_interval - (now - self._last_poll))
+
+    def summary(self) -> str:
+        """Format all recorded phase durations.
+
+        Returns:
+            A one-line summary such as "backup 1.2s, execution 1.2s".
+        """
+        return ", ".join(f"{name} {seconds:.1f}s" for name, seconds in self.durations.items())
+
+    def close(self) -> None:
+        """Abandon queued preparation tasks and stop the thread pool."""
+        self._executor.shutdown(wait=False, cancel_futures=True)
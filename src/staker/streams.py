@@ -0,0 +1,180 @@
+"""Chunked line readers for child process output.
+
+This module provides a reader that pulls whatever a ready pipe holds with a
+single ``os.read`` and splits complete lines out of a reusable buffer, so a
+partial line from one client can never block the supervisor loop, and a
+drainer that empties several pipes at once while processes shut down.
+"""
+
+from __future__ import annotations
+
+import os
+import select
+import threading
+from collections.abc import Callable
+from typing import IO
+
+from staker.config import READ_CHUNK_BYTES
+
+
+class LineReader:
+    """Reassembles lines from a child's stdout pipe.
+
+    Implements ``fileno()`` so it can be passed to ``select.select`` directly.
+    Each call to ``read_lines`` performs exactly one ``os.read``, which never
+    blocks once select has reported the pipe as readable.
+
+    Attributes:
+        stream: The underlying stdout pipe.
+        prefix: The process prefix for log lines.
+        eof: True once the pipe has been fully drained.
+    """
+
+    def __init__(self, stream: IO[bytes], prefix: str, chunk_size: int = READ_CHUNK_BYTES) -> None:
+        """Initialize the reader.
+
+        Args:
+            stream: The stdout pipe to read from.
+            prefix: The process prefix for log lines.
+            chunk_size: Maximum bytes read per call.
+        """
+        self.stream = stream
+        self.prefix = prefix
+        self.chunk_size = chunk_size
+        self.eof = False
+        self._buffer = bytearray()
+
+    def fileno(self) -> int:
+        """Return the pipe's file descriptor."""
+        return self.stream.fileno()
+
+    def read_lines(self) -> list[bytearray]:
+        """Read one chunk and return every complete line in it.
+
+        At EOF any trailing partial line is returned as the final line.
+
+        Returns:
+            Complete lines without their newline, possibly empty.
+        """
+        return self.feed(os.read(self.fileno(), self.chunk_size))
+
+    def feed(self, chunk: bytes) -> list[bytearray]:
+        """Append a chunk to the buffer and split out complete lines.
+
+        Used directly by readers that fetch chunks themselves, such as the
+        asyncio engine. An empty chunk signals EOF.
+
+        Args:
+            chunk: Raw bytes read from the pipe.
+
+        Returns:
+            Complete lines without their newline, possibly empty.
+        """
+        buffer = self._buffer
+        if not chunk:
+            self.eof = True
+            if not buffer:
+                return []
+            tail = buffer[:]
+            buffer.clear()
+            return [tail]
+
+        buffer += chunk
+        end = buffer.rfind(b"\n")
+        if end < 0:
+            return []
+        lines = buffer[:end].split(b"\n")
+        del buffer[: end + 1]
+        return lines
+
+
+class LogDrain:
+    """Reads several pipes to EOF at once on a background thread.
+
+    A single thread selects over every reader, so a child blocked writing to
+    a full pipe never waits behind another child's output. ``close`` wakes the
+    thread through a self-pipe once the deadline passes.
+
+    Attributes:
+        readers: The readers being drained.
+        on_line: Called with each reader's prefix and every line it yields.
+        others: Readers kept flowing meanwhile without waiting for their EOF.
+    """
+
+    def __init__(
+        self,
+        readers: list[LineReader],
+        on_line: Callable[[str, bytearray], object],
+        others: list[LineReader] | None = None,
+    ) -> None:
+        """Initialize the drainer without starting it.
+
+        Args:
+            readers: The readers to drain.
+            on_line: Called with each reader's prefix and every line it yields.
+            others: Readers of processes that keep running, read while
+                draining so their pipes do not fill up.
+        """
+        self.readers = readers
+        self.on_line = on_line
+        self.others = others or []
+        self._stopped = False
+        self._wake_read, self._wake_write = os.pipe()
+        # Guards the self-pipe, which the thread closes when it exits
+        self._wake_lock = threading.Lock()
+        self._thread = threading.Thread(target=self._drain, name="log-drain", daemon=True)
+
+    def start(self) -> None:
+        """Start draining in the background."""
+        self._thread.start()
+
+    def _drain(self) -> None:
+        """Read every ready pipe until all reach EOF or the drain is stopped.
+
+        Once stopped, no reader is touched again, so a drain given up on never
+        reads a pipe that is back in the caller's hands. The self-pipe is
+        closed on exit.
+        """
+        try:
+            while True:
+                pending = [reader for reader in self.readers if not reader.eof]
+                if not pending:
+                    return
+                flowing = [reader for reader in self.others if not reader.eof]
+                ready, _, _ = select.select([*pending, *flowing, self._wake_read], [], [])
+                if self._stopped:
+                    return
+                for reader in ready:
+                    for line in reader.read_lines():
+                        self.on_line(reader.prefix, line)
+                        if self._stopped:
+                            return
+        finally:
+            with self._wake_lock:
+                os.close(self._wake_read)
+                os.close(self._wake_write)
+                self._wake_read = self._wake_write = -1
+
+    def close(self, timeout: float) -> bool:
+        """Wait for every pipe to reach EOF, then stop draining.
+
+        A thread stuck in ``on_line`` cannot see the wake-up, so it is given
+        up on after another ``timeout``; it exits without reading again once
+        ``on_line`` returns.
+
+        Args:
+            timeout: Longest seconds to wait for the remaining output.
+
+        Returns:
+            True if every pipe was drained to EOF.
+        """
+        self._thread.join(timeout)
+        if self._thread.is_alive():
+            self._stopped = True
+            with self._wake_lock:
+                if self._wake_write >= 0:
+                    os.write(self._wake_write, b"\0")
+            self._thread.join(timeout)
+            if self._thread.is_alive():
+                return False
+        return all(reader.eof for reader in self.readers)
@@ -0,0 +1,440 @@
+"""Asyncio supervisor engine for the Ethereum staking node.
+
+This module provides an alternative to ``Node.run``'s blocking select loop.
+Each process stream gets its own reader task, the snapshot pause sleeps until
+the snapshot's deadline, and shutdown waits on process exit events instead of
+polling. Dead processes are restarted with the same policies and crash-loop
+escalation as the select loop.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import signal
+from time import monotonic
+from typing import TYPE_CHECKING
+
+from rich.console import Console
+
+from staker.config import (
+    LOG_DRAIN_TIMEOUT,
+    PREFIXES,
+    READ_CHUNK_BYTES,
+    VPN,
+    VPN_TIMEOUT,
+)
+from staker.restarts import STACK, get_shutdown_budget, get_shutdown_order
+from staker.streams import LineReader
+from staker.utils import get_public_ip
+
+if TYPE_CHECKING:
+    from staker.node import Node
+
+console = Console(highlight=False)
+print = console.print
+
+
+class AsyncSupervisor:
+    """Runs a Node's processes on an asyncio event loop.
+
+    Reuses the Node's command builders, log handling and signalling, so both
+    engines start the same processes and write the same logs.
+
+    Attributes:
+        node: The node whose processes are supervised.
+        readers: One reader task per process stdout.
+        exits: One task per process that completes when it exits.
+        interrupted: Whether the whole stack was interrupted on purpose, so
+            the next exit restarts the stack rather than one process.
+        restarting: Names of the processes being restarted right now.
+    """
+
+    def __init__(self, node: Node) -> None:
+        """Initialize the supervisor.
+
+        Args:
+            node: The node whose processes are supervised.
+        """
+        self.node = node
+        self.readers: list[asyncio.Task] = []
+        self.exits: list[asyncio.Task] = []
+        self.interrupted = False
+        self.restarting: set[str] = set()
+        self._stop_requested = asyncio.Event()
+        # Set when processes start or the relays change, to re-check what to wait on
+        self._wake = asyncio.Event()
+
+    async def _run_cmd(self, cmd: list[str]) -> asyncio.subprocess.Process:
+        """Run a command and return the process handle.
+
+        Args:
+            cmd: Command and arguments to run.
+
+        Returns:
+            The asyncio subprocess handle.
+        """
+        print(f"Running cmd: {' '.join(cmd)}")
+        return await asyncio.create_subprocess_exec(
+            *cmd,
+            stdout=asyncio.subprocess.PIPE,
+            stderr=asyncio.subprocess.STDOUT,
+        )
+
+    async def _wait_for_vpn(self, start_ip: str) -> list[dict]:
+        """Wait for VPN connection with timeout and retry.
+
+        Args:
+            start_ip: Public IP address before connecting.
+
+        Returns:
+            List containing the VPN process metadata.
+        """
+
+        async def ip_changed() -> bool:
+            return start_ip != await asyncio.to_thread(get_public_ip)
+
+        while True:
+            cmd, creds_path = self.node._vpn_cmd()
+            process = await self._run_cmd(cmd)
+            elapsed = 0.0
+            connected = await ip_changed()
+            while not connected and elapsed < VPN_TIMEOUT:
+                print("Waiting for VPN...")
+                await asyncio.sleep(VPN_TIMEOUT / 3)
+                elapsed += VPN_TIMEOUT / 3
+                connected = await ip_changed()
+
+            # OpenVPN has read the creds file by now, or is about to be killed
+            self.node._cleanup_creds(creds_path)
+            if connected:
+                return [{"name": "vpn", "process": process, "prefix": PREFIXES["vpn"]}]
+            print(f"VPN connection timed out after {VPN_TIMEOUT}s, retrying...")
+            process.kill()
+            await process.wait()
+
+    def _track(self, meta: dict) -> None:
+        """Register a started process and create its reader and exit tasks.
+
+        Args:
+            meta: Process metadata dict.
+        """
+        self.node.processes.append(meta)
+        self.node.metrics.process_started(meta["name"])
+        self.readers.append(asyncio.create_task(self._read(meta)))
+        self.exits.append(asyncio.create_task(meta["process"].wait()))
+        self._wake.set()
+
+    async def _respawn(self, i: int) -> None:
+        """Start a process again in place of its dead predecessor.
+
+        Args:
+            i: Index of the process in the node's processes.
+        """
+        node = self.node
+        name = node.processes[i]["name"]
+        cmd = getattr(node, f"_{name}_cmd")()
+        meta = {"name": name, "process": await self._run_cmd(cmd), "prefix": PREFIXES[name]}
+        node.processes[i] = meta
+        node.metrics.process_started(name)
+        self.readers[i] = asyncio.create_task(self._read(meta))
+        self.exits[i] = asyncio.create_task(meta["process"].wait())
+
+    async def _start(self) -> list[dict]:
+        """Start node processes as the node's startup gates open.
+
+        Each process gets a reader and exit task as soon as it starts. Stops
+        waiting on the remaining gates if a started process exits.
+
+        Returns:
+            List of process metadata dicts.
+        """
+        node = self.node
+        node.processes = []
+        self.readers = []
+        self.exits = []
+        if VPN:
+            start_ip = await asyncio.to_thread(get_public_ip)
+            for meta in await self._wait_for_vpn(start_ip):
+                self._track(meta)
+
+        if node.startup is None:
+            node._prepare()
+        await self._start_ready(until_exit=True)
+        return node.processes
+
+    async def _start_ready(self, until_exit: bool = False) -> None:
+        """Start clients as their startup gates open, until none are pending.
+
+        Args:
+            until_exit: Stop waiting on the gates once a started process exits.
+        """
+        node = self.node
+        startup = node.startup
+        while startup.pending and not (until_exit and any(task.done() for task in self.exits)):
+            # Readiness checks open sockets, so keep them off the event loop
+            for name in await asyncio.to_thread(startup.ready):
+                cmd = getattr(node, f"_{name}_cmd")()
+                self._track(
+                    {"name": name, "process": await self._run_cmd(cmd), "prefix": PREFIXES[name]}
+                )
+            await asyncio.sleep(startup.timeout() or 0)
+        if not startup.pending:
+            print(f"Startup phases: {startup.summary()}")
+
+    async def _read(self, meta: dict) -> None:
+        """Print and check a process's output until EOF.
+
+        Args:
+            meta: Process metadata dict.
+        """
+        stream = meta["process"].stdout
+        reader = LineReader(stream, meta["prefix"])
+        while not reader.eof:
+            lines = reader.feed(await stream.read(READ_CHUNK_BYTES))
+            if lines:
+                for line in lines:
+                    self.node._print_line(reader.prefix, line)
+                if self.node._interrupt_on_error():
+                    self.interrupted = True
+
+    async def _watch_snapshot(self) -> None:
+        """Pause the node once the most recent snapshot is too old."""
+        node = self.node
+        if node.snapshot_due is None:
+            return
+        await asyncio.sleep(max(0.0, node.snapshot_due - monotonic()))
+        node.snapshot_due = None
+        delay = node.duties.delay()
+        if delay:
+            print(f"Deferring snapshot pause by {delay:.0f}s to avoid validator duties")
+            await asyncio.sleep(delay)
+        print("Pausing node to initiate snapshot.")
+        self.interrupted = True
+        node._interrupt(hard=False)
+
+    async def _watch_execution(self) -> None:
+        """Stop geth whenever it is in sync but its head stops advancing.
+
+        The exit is picked up as a crash and restarted per its policy.
+        """
+        node = self.node
+        while True:
+            await asyncio.sleep(node.chain.min_interval)
+            if not node._execution_stalled() or "execution" in self.restarting:
+                continue
+            execution = [
+                meta
+                for meta, exited in zip(node.processes, self.exits, strict=True)
+                if meta["name"] == "execution" and not exited.done()
+            ]
+            if not execution:
+                continue
+            print(
+                f"[bright_red]Execution head stuck at block {node.chain.status.block} for "
+                f"{node.chain.stall_time:.0f}s, restarting[/bright_red]"
+            )
+            node.chain.reset()
+            await self._handle_gracefully(hard=False, processes=execution)
+
+    async def _handle_gracefully(self, hard: bool, processes: list[dict] | None = None) -> None:
+        """Stop processes in shutdown order with escalating signals, then drain output.
+
+        Args:
+            hard: Whether this is a hard stop (ignores kill_in_progress).
+            processes: Processes to stop (defaults to all).
+        """
+        node = self.node
+        processes = node.processes if processes is None else processes
+        node.shutdown_durations = {}
+        tasks = {
+            id(meta): (exited, reader)
+            for meta, exited, reader in zip(node.processes, self.exits, self.readers, strict=True)
+        }
+        for meta in get_shutdown_order(processes):
+            exited, _ = tasks[id(meta)]
+            if exited.done():
+                continue
+            started = monotonic()
+            budget = get_shutdown_budget(meta["name"])
+            for stop in (node._interrupt, node._terminate):
+                stop(hard=hard, processes=[meta])
+                done, _ = await asyncio.wait([exited], timeout=budget)
+                if done:
+                    break
+            else:
+                node._kill(hard=hard, processes=[meta])
+                await asyncio.wait([exited], timeout=budget)
+            node.shutdown_durations[meta["name"]] = monotonic() - started
+        node._print_shutdown_stages()
+        # Log rest of output; readers ran concurrently all along
+        readers = [tasks[id(meta)][1] for meta in processes]
+        if readers:
+            _, pending = await asyncio.wait(readers, timeout=LOG_DRAIN_TIMEOUT)
+            for reader in pending:
+                reader.cancel()
+            if pending:
+                print(f"Gave up on remaining output after {LOG_DRAIN_TIMEOUT:.0f}s")
+        node._show(node.throttle.pending())
+        node.sink.flush()
+
+    async def _restart(self, names: list[str], delay: float) -> None:
+        """Stop the named processes, wait out a delay, then start them again.
+
+        Args:
+            names: Names of the processes to restart.
+            delay: Seconds to wait between stopping and starting.
+        """
+        node = self.node
+        indices = [i for i, meta in enumerate(node.processes) if meta["name"] in names]
+        self.restarting.update(names)
+        try:
+            await self._handle_gracefully(
+                hard=False, processes=[node.processes[i] for i in indices]
+            )
+            await asyncio.sleep(delay)
+            if self.interrupted:
+                # The whole stack is restarting anyway
+                return
+            for i in indices:
+                await self._respawn(i)
+        finally:
+            self.restarting.difference_update(names)
+
+    async def _recover(self) -> float:
+        """Restart dead processes per their policies until the stack must restart.
+
+        Also restarts mev-boost once a planned relay change is due.
+
+        Returns:
+            Seconds to back off before restarting the stack; 0 if it was
+            interrupted on purpose.
+        """
+        node = self.node
+        while True:
+            self._wake.clear()
+            woken = asyncio.create_task(self._wake.wait())
+            due = node.planned.get("mev")
+            timeout = None if due is None else max(0.0, due - monotonic())
+            await asyncio.wait(
+                [*self.exits, woken], timeout=timeout, return_when=asyncio.FIRST_COMPLETED
+            )
+            woken.cancel()
+
+            dead = [i for i, exited in enumerate(self.exits) if exited.done()]
+            if dead and self.interrupted:
+                return 0.0
+            for i in dead:
+                if not self.exits[i].done():
+                    # Restarted with an earlier dead process's group
+                    continue
+                meta = node.processes[i]
+                # Let its last lines reach the history before they are dumped
+                await asyncio.wait([self.readers[i]], timeout=LOG_DRAIN_TIMEOUT)
+                plan = node._plan_recovery(meta["name"], meta["process"].returncode)
+                if plan is None:
+                    return node.crashes.record(STACK)
+                await self._restart(*plan)
+                if self.interrupted:
+                    return 0.0
+
+            if node._planned_due("mev") and any(meta["name"] == "mev" for meta in node.processes):
+                print(f"Restarting mev-boost with relays: {', '.join(node.relays)}")
+                await self._restart(["mev"], 0.0)
+
+    def _on_relay_update(self) -> None:
+        """Plan a mev-boost restart when the relay monitor changed the relays."""
+        self.node._apply_relay_update()
+        self._wake.set()
+
+    async def _wait_for_termination(self) -> None:
+        """Wait while the EC2 instance is being terminated."""
+        while self.node.terminating:
+            print("Waiting for stale EC2 instance to terminate...")
+            await asyncio.sleep(5)
+
+    async def _supervise(self) -> None:
+        """Run the staking node main loop until cancelled."""
+        node = self.node
+        if node.monitor.interval:
+            node.monitor.start()
+        asyncio.get_running_loop().add_reader(node.monitor.fileno(), self._on_relay_update)
+        if node.metrics_server.port:
+            node.metrics_server.start()
+        if node.log_server.port:
+            node.log_server.start()
+        node.chain.start()
+        node.beacon.start()
+        node.duties.start()
+        if node.env.should_manage_snapshots():
+            terminate = await asyncio.to_thread(node.snapshot.update)
+            if terminate:
+                node.terminating = True
+                await asyncio.to_thread(node.snapshot.terminate)
+                await self._wait_for_termination()
+
+        while True:
+            startup = node._prepare()
+            # Geth must not start before the snapshot has been taken
+            node.most_recent = await asyncio.to_thread(startup.run, "backup", node.snapshot.backup)
+            node._set_snapshot_due()
+            node.planned = {}
+            # Lines printed while the previous stack stopped must not act on the new one
+            node.triggered = []
+            self.interrupted = False
+            await self._start()
+            watchers = [
+                asyncio.create_task(self._watch_snapshot()),
+                asyncio.create_task(self._watch_execution()),
+            ]
+            if startup.pending:
+                # A process exited before every gate opened; keep opening them
+                watchers.append(asyncio.create_task(self._start_ready()))
+            try:
+                restart_delay = await self._recover()
+            finally:
+                for watcher in watchers:
+                    watcher.cancel()
+            startup.close()
+            await self._handle_gracefully(hard=False)
+            await self._wait_for_termination()
+            if restart_delay:
+                print(f"Restarting the stack in {restart_delay:.0f}s")
+                await asyncio.sleep(restart_delay)
+
+    async def stop(self) -> None:
+        """Stop all processes and create a final snapshot if draining."""
+        node = self.node
+        node.kill_in_progress = True
+        asyncio.get_running_loop().remove_reader(node.monitor.fileno())
+        node.monitor.stop()
+        node.metrics_server.stop()
+        node.log_server.stop()
+        node.chain.stop()
+        node.beacon.stop()
+        node.duties.stop()
+        await self._handle_gracefully(hard=True)
+        node.sink.close()
+        print("Node stopped")
+        await asyncio.to_thread(node._snapshot_if_draining)
+
+    def request_stop(self) -> None:
+        """Ask the supervisor to stop; safe to call from a signal handler."""
+        self._stop_requested.set()
+
+    async def run(self) -> None:
+        """Supervise the node until SIGINT/SIGTERM, then stop it gracefully."""
+        loop = asyncio.get_running_loop()
+        for sig in (signal.SIGINT, signal.SIGTERM):
+            loop.add_signal_handler(sig, self.request_stop)
+
+        supervise = asyncio.create_task(self._supervise())
+        stop_requested = asyncio.create_task(self._stop_requested.wait())
+        await asyncio.wait({supervise, stop_requested}, return_when=asyncio.FIRST_COMPLETED)
+        stop_requested.cancel()
+        supervise.cancel()
+        try:
+            await supervise
+        except asyncio.CancelledError:
+            pass
+        finally:
+            await self.stop()
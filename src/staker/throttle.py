@@ -0,0 +1,157 @@
+"""Console flood control for client log lines.
+
+This module collapses a process's repeated lines into one "repeated xN" line
+per window and rate-limits each process's console output with a token
+bucket, counting what it held back. It decides what reaches the console (and
+CloudWatch behind it) before any line is colorized or rendered.
+"""
+
+from __future__ import annotations
+
+import re
+from time import monotonic
+
+from staker.config import CONSOLE_BURST, CONSOLE_RATE, CONSOLE_REPEAT_WINDOW
+
+# Timestamps that differ between otherwise identical lines: geth's
+# "[10-18|12:00:00.123]", prysm's "[2026-10-18 12:00:00.00]" and logrus' time="..."
+TIMESTAMP_PATTERN = re.compile(r'\[[\d|:. -]+\]|time="[^"]*"')
+
+
+class ConsoleThrottle:
+    """Decides which log lines each process gets to print.
+
+    A line equal to the process's previous one, ignoring timestamps, is
+    held back for ``window`` seconds after the first copy; the process's
+    next line that is printed brings one line with the count first.
+    Printed lines then spend a token from the process's bucket, which
+    refills at ``rate`` per second up to ``burst``.
+
+    Attributes:
+        window: Seconds repeats of a line are collapsed for.
+        rate: Lines per second each process may print (0 disables the limit).
+        burst: Lines a process may print at once after being quiet.
+        repeats: Lines collapsed per prefix.
+        dropped: Lines dropped by the rate limit per prefix.
+    """
+
+    def __init__(
+        self,
+        window: float = CONSOLE_REPEAT_WINDOW,
+        rate: float = CONSOLE_RATE,
+        burst: int = CONSOLE_BURST,
+    ) -> None:
+        """Initialize with empty per-process state.
+
+        Args:
+            window: Seconds repeats of a line are collapsed for.
+            rate: Lines per second each process may print (0 disables the limit).
+            burst: Lines a process may print at once after being quiet.
+        """
+        self.window = window
+        self.rate = rate
+        self.burst = burst
+        self.repeats: dict[str, int] = {}
+        self.dropped: dict[str, int] = {}
+        self._states: dict[str, dict] = {}
+
+    def admit(self, prefix: str, log: str, now: float | None = None) -> list[str]:
+        """Get the lines to print for a new line of a process.
+
+        Args:
+            prefix: The process prefix.
+            log: The prefixed line.
+            now: Monotonic time of the line (defaults to now).
+
+        Returns:
+            Lines to print in order: any summary of held back lines, then
+            the line itself unless it was collapsed or rate-limited.
+        """
+        now = monotonic() if now is None else now
+        state = self._states.get(prefix)
+        if state is None:
+            state = self._states[prefix] = {
+                "key": None,
+                "log": "",
+                "count": 0,
+                "since": now,
+                "tokens": float(self.burst),
+                "updated": now,
+                "held": 0,
+            }
+            self.repeats[prefix] = 0
+            self.dropped[prefix] = 0
+
+        key = TIMESTAMP_PATTERN.sub("", log)
+        if key == state["key"] and now - state["since"] < self.window:
+            state["count"] += 1
+            self.repeats[prefix] += 1
+            return []
+        lines = self._repeated(state)
+        state.update(key=key, log=log, count=0, since=now)
+        lines.append(log)
+        return self._limit(prefix, state, lines, now)
+
+    def pending(self) -> list[str]:
+        """Get and clear the summaries of every process's held back lines.
+
+        Called when the processes stop, so counts are not lost to silence.
+
+        Returns:
+            Summary lines to print.
+        """
+        lines = []
+        for prefix, state in self._states.items():
+            lines.extend(self._repeated(state))
+            lines.extend(self._held(prefix, state))
+        return lines
+
+    def _repeated(self, state: dict) -> list[str]:
+        """Take the summary of a process's collapsed repeats.
+
+        Args:
+            state: The process's throttle state.
+
+        Returns:
+            The summary line, if any lines were collapsed.
+        """
+        count, state["count"] = state["count"], 0
+        return [f"{state['log']} (repeated x{count})"] if count else []
+
+    def _held(self, prefix: str, state: dict) -> list[str]:
+        """Take the note about a process's rate-limited lines.
+
+        Args:
+            prefix: The process prefix.
+            state: The process's throttle state.
+
+        Returns:
+            The note, if any lines were dropped since the last one.
+        """
+        held, state["held"] = state["held"], 0
+        return [f"{prefix} ({held} lines not shown on the console)"] if held else []
+
+    def _limit(self, prefix: str, state: dict, lines: list[str], now: float) -> list[str]:
+        """Spend a token per line, holding back lines the bucket cannot pay for.
+
+        Args:
+            prefix: The process prefix.
+            state: The process's throttle state.
+            lines: Lines that would be printed.
+            now: Monotonic time of the line.
+
+        Returns:
+            The lines that may be printed.
+        """
+        if not self.rate:
+            return lines
+        tokens = min(self.burst, state["tokens"] + (now - state["updated"]) * self.rate)
+        state["updated"] = now
+        allowed = min(len(lines), int(tokens))
+        state["tokens"] = tokens - allowed
+        # Lines are flowing again, so say how many went missing first
+        note = self._held(prefix, state) if allowed else []
+        held = len(lines) - allowed
+        state["held"] += held
+        self.dropped[prefix] += held
+        return note + lines[:allowed]
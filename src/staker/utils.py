@@ -1,6 +1,10 @@
 """Utility functions for the Ethereum staking node."""
 
+import re
+
 import requests
+from rich.errors import StyleSyntaxError
+from rich.style import Style
 
 from staker.config import LOG_STYLES
 
@@ -27,6 +31,69 @@ def get_public_ip() -> str:
             domain_idx = (domain_idx + 1) % len(IP_CHECK_DOMAINS)
 
 
+class LogColorizer:
+    """Single-pass keyword colorizer for log lines.
+
+    Compiles all style keywords into one alternation, longest first, so each
+    line is scanned once and overlapping keys (e.g. WARN and WARNING) are
+    only ever wrapped once, by the longest match.
+    """
+
+    def __init__(self, styles: dict[str, str]) -> None:
+        """Precompile the matcher and replacements for a style table.
+
+        Args:
+            styles: Mapping of keyword to Rich style definition.
+        """
+        keys = sorted(styles, key=len, reverse=True)
+        self.pattern = re.compile("|".join(re.escape(key) for key in keys))
+        self.markup = {key: f"[{style}]{key}[/{style}]" for key, style in styles.items()}
+        self.ansi = {key: self._render_ansi(key, style) for key, style in styles.items()}
+
+    @staticmethod
+    def _render_ansi(key: str, style: str) -> str:
+        """Render a keyword wrapped in ANSI escape codes for its style.
+
+        Args:
+            key: The keyword to render.
+            style: Rich style definition.
+
+        Returns:
+            The styled keyword, or the bare keyword if the style is invalid.
+        """
+        try:
+            return Style.parse(style).render(key)
+        except StyleSyntaxError:
+            return key
+
+    def to_markup(self, text: str) -> str:
+        """Wrap keywords in Rich markup.
+
+        Args:
+            text: The log line to colorize.
+
+        Returns:
+            The text with Rich color markup applied.
+        """
+        markup = self.markup
+        return self.pattern.sub(lambda match: markup[match[0]], text)
+
+    def to_ansi(self, text: str) -> str:
+        """Wrap keywords in ANSI escape codes, bypassing Rich markup parsing.
+
+        Args:
+            text: The log line to colorize.
+
+        Returns:
+            The text with ANSI color codes applied.
+        """
+        ansi = self.ansi
+        return self.pattern.sub(lambda match: ansi[match[0]], text)
+
+
+colorizer = LogColorizer(LOG_STYLES)
+
+
 def colorize_log(text: str) -> str:
     """Apply Rich console color styles to log text.
 
@@ -38,9 +105,40 @@ def colorize_log(text: str) -> str:
     Returns:
         The text with Rich color markup applied.
     """
-    for key, style in LOG_STYLES.items():
-        text = text.replace(key, f"[{style}]{key}[/{style}]")
-    return text
+    return colorizer.to_markup(text)
+
+
+def colorize_log_ansi(text: str) -> str:
+    """Apply log color styles to text as raw ANSI escape codes.
+
+    Args:
+        text: The log line to colorize.
+
+    Returns:
+        The text with ANSI color codes applied.
+    """
+    return colorizer.to_ansi(text)
+
+
+# key=value pairs as logged by logrus/geth/prysm, with optional quoted values
+FIELD_PATTERN = re.compile(r'([\w.\-]+)=("(?:[^"\\]|\\.)*"|\S*)')
+
+
+def parse_fields(text: str) -> dict[str, str]:
+    """Parse the key=value fields of a structured log line.
+
+    Args:
+        text: The log line, e.g. 'level=info msg="bid received" slot=1'.
+
+    Returns:
+        Mapping of field name to value, with quotes and escapes removed.
+    """
+    fields = {}
+    for key, value in FIELD_PATTERN.findall(text):
+        if value.startswith('"'):
+            value = value[1:-1].replace('\\"', '"')
+        fields[key] = value
+    return fields
 
 
 def get_checkpoint_url(network: str) -> str:
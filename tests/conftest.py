@@ -1,5 +1,6 @@
 """Pytest fixtures for Ethereum staking node tests."""
 
+import contextlib
 import os
 
 import pytest
@@ -54,3 +55,13 @@ def mock_env():
 def mock_env_with_snapshots():
     """Provide a mock environment with snapshot management enabled."""
     return MockEnvironment(manage_snapshots=True)
+
+
+@pytest.fixture
+def pipe():
+    """Provide a (readable stream, write fd) pair backed by an OS pipe."""
+    read_fd, write_fd = os.pipe()
+    with os.fdopen(read_fd, "rb") as stream:
+        yield stream, write_fd
+    with contextlib.suppress(OSError):
+        os.close(write_fd)
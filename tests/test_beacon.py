@@ -0,0 +1,189 @@
+"""Tests for the beacon node REST poller and event subscriber."""
+
+import json
+import threading
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+import pytest
+import requests
+
+from staker.beacon import BeaconMonitor, parse_events
+
+EVENTS = (
+    'event: head\ndata: {"slot":"100","block":"0xaa"}\n\n'
+    ": keep-alive comment\n\n"
+    'event: finalized_checkpoint\ndata: {"epoch":"3","block":"0xbb"}\n\n'
+    'event: chain_reorg\ndata: {"slot":"101","depth":"2"}\n\n'
+    'event: head\ndata: {"slot":"102","block":"0xcc"}\n\n'
+)
+
+
+class StubBeaconHandler(BaseHTTPRequestHandler):
+    """Serves the syncing, peer_count and events endpoints of a beacon node."""
+
+    protocol_version = "HTTP/1.1"
+
+    def setup(self):
+        super().setup()
+        self.server.connections += 1
+
+    def do_GET(self):
+        path = self.path.split("?")[0]
+        if path == "/eth/v1/events":
+            self.server.event_queries.append(self.path)
+            self.send_response(200)
+            self.send_header("Content-Type", "text/event-stream")
+            self.send_header("Connection", "close")
+            self.end_headers()
+            self.wfile.write(self.server.events.encode())
+            return
+        data = self.server.data.get(path)
+        body = json.dumps({"data": data}).encode()
+        self.send_response(200 if data is not None else 404)
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, *args):
+        pass
+
+
+@pytest.fixture
+def beacon_server():
+    server = ThreadingHTTPServer(("127.0.0.1", 0), StubBeaconHandler)
+    server.daemon_threads = True
+    server.connections = 0
+    server.event_queries = []
+    server.events = EVENTS
+    server.data = {
+        "/eth/v1/node/syncing": {
+            "head_slot": "100",
+            "sync_distance": "0",
+            "is_syncing": False,
+            "is_optimistic": False,
+            "el_offline": False,
+        },
+        "/eth/v1/node/peer_count": {"connected": "60", "disconnected": "5"},
+    }
+    server.url = f"http://127.0.0.1:{server.server_port}"
+    thread = threading.Thread(target=server.serve_forever, args=(0.05,), daemon=True)
+    thread.start()
+    yield server
+    server.shutdown()
+    server.server_close()
+
+
+class TestParseEvents:
+    """Tests for server-sent event parsing."""
+
+    def test_parses_named_events(self):
+        events = list(parse_events(EVENTS.splitlines()))
+
+        assert events[0] == ("head", '{"slot":"100","block":"0xaa"}')
+        assert [event for event, _ in events] == [
+            "head",
+            "finalized_checkpoint",
+            "chain_reorg",
+            "head",
+        ]
+
+    def test_incomplete_event_is_dropped(self):
+        assert list(parse_events(["event: head", 'data: {"slot":"1"}'])) == []
+
+
+class TestBeaconMonitor:
+    """Tests for beacon state tracking against a stub beacon node."""
+
+    @pytest.fixture
+    def monitor(self, beacon_server):
+        monitor = BeaconMonitor(beacon_server.url, poll_interval=0.01)
+        yield monitor
+        monitor.stop()
+
+    def test_poll_parses_sync_state_and_peers(self, monitor):
+        monitor.poll()
+
+        assert monitor.sync["head_slot"] == 100
+        assert monitor.sync["sync_distance"] == 0
+        assert monitor.sync["el_offline"] is False
+        assert monitor.peers == 60
+
+    def test_synced_since_tracks_sync_state(self, monitor, beacon_server):
+        monitor.poll(now=10)
+        monitor.poll(now=20)
+        assert monitor.synced_since == 10
+
+        beacon_server.data["/eth/v1/node/syncing"]["sync_distance"] = "40"
+        monitor.poll(now=30)
+        assert monitor.synced_since is None
+
+    def test_polls_reuse_the_connection(self, monitor, beacon_server):
+        for _ in range(3):
+            monitor.poll()
+        assert beacon_server.connections == 1
+
+    def test_listen_tracks_head_finality_and_reorgs(self, monitor, beacon_server, capsys):
+        assert monitor.listen() == 4
+
+        assert monitor.head_slot == 102
+        assert monitor.finalized_epoch == 3
+        assert monitor.reorgs == 1
+        assert monitor.last_reorg_depth == 2
+        assert monitor.last_event_at is not None
+        assert "Chain reorg at slot 101, depth 2" in capsys.readouterr().out
+        assert "topics=head%2Cfinalized_checkpoint%2Cchain_reorg" in beacon_server.event_queries[0]
+
+    def test_malformed_events_are_skipped(self, monitor, beacon_server, capsys):
+        beacon_server.events = (
+            'event: head\ndata: {"block":"0xaa"}\n\n'
+            "event: chain_reorg\ndata: [1]\n\n"
+            'event: head\ndata: {"slot":"103","block":"0xdd"}\n\n'
+        )
+
+        assert monitor.listen() == 1
+
+        assert monitor.head_slot == 103
+        out = capsys.readouterr().out
+        assert "Skipped malformed head event" in out
+        assert "Skipped malformed chain_reorg event" in out
+        assert "[bright_yellow]" not in out
+
+    def test_invalid_json_event_is_skipped(self, monitor, beacon_server, capsys):
+        beacon_server.events = (
+            'event: head\ndata: {"slot":\n\nevent: head\ndata: {"slot":"104","block":"0xee"}\n\n'
+        )
+
+        assert monitor.listen() == 1
+
+        assert monitor.head_slot == 104
+        assert beacon_server.connections == 1
+        assert "Skipped malformed head event" in capsys.readouterr().out
+
+    def test_failed_poll_raises(self, monitor, beacon_server):
+        monitor.poll()
+        del beacon_server.data["/eth/v1/node/peer_count"]
+        with pytest.raises(requests.exceptions.HTTPError):
+            monitor.poll()
+
+    def test_background_threads_update_state(self, monitor):
+        monitor.start()
+        for _ in range(500):
+            if monitor.head_slot is not None and monitor.peers is not None:
+                break
+            threading.Event().wait(0.01)
+
+        assert monitor.head_slot == 102
+        assert monitor.peers == 60
+
+    def test_unreachable_beacon_node_resets_poll_state(self, monitor, beacon_server):
+        monitor.poll()
+        beacon_server.data = {}
+        monitor.start()
+        for _ in range(500):
+            if monitor.sync is None:
+                break
+            threading.Event().wait(0.01)
+
+        assert monitor.sync is None
+        assert monitor.peers is None
+        assert monitor.synced_since is None
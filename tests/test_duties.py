@@ -0,0 +1,161 @@
+"""Tests for duty-aware scheduling of planned interruptions."""
+
+import json
+import threading
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+import pytest
+
+from staker.duties import DutyScheduler, longest_free_window
+
+GENESIS = 1_000_000
+SLOT = 12
+EPOCH = 32 * SLOT
+
+
+class StubDutiesHandler(BaseHTTPRequestHandler):
+    """Serves genesis and proposer/attester duties from ``server.duties``.
+
+    ``server.duties`` maps epoch to {"proposer": [...], "attester": [...]}
+    lists of (validator_index, slot) pairs.
+    """
+
+    protocol_version = "HTTP/1.1"
+
+    def do_GET(self):
+        if self.path == "/eth/v1/beacon/genesis":
+            self.reply({"genesis_time": str(GENESIS)})
+        else:
+            epoch = int(self.path.rsplit("/", 1)[1])
+            self.reply(self.duties(epoch, "proposer"))
+
+    def do_POST(self):
+        body = self.rfile.read(int(self.headers["Content-Length"]))
+        self.server.attester_requests.append(json.loads(body))
+        epoch = int(self.path.rsplit("/", 1)[1])
+        self.reply(self.duties(epoch, "attester"))
+
+    def duties(self, epoch, kind):
+        return [
+            {"validator_index": str(index), "slot": str(slot), "pubkey": "0x"}
+            for index, slot in self.server.duties.get(epoch, {}).get(kind, [])
+        ]
+
+    def reply(self, data):
+        body = json.dumps({"data": data}).encode()
+        self.send_response(200)
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, *args):
+        pass
+
+
+@pytest.fixture
+def beacon_api():
+    server = ThreadingHTTPServer(("127.0.0.1", 0), StubDutiesHandler)
+    server.daemon_threads = True
+    server.duties = {}
+    server.attester_requests = []
+    server.url = f"http://127.0.0.1:{server.server_port}"
+    thread = threading.Thread(target=server.serve_forever, args=(0.05,), daemon=True)
+    thread.start()
+    yield server
+    server.shutdown()
+    server.server_close()
+
+
+def slot_start(slot):
+    return GENESIS + slot * SLOT
+
+
+class TestLongestFreeWindow:
+    """Tests for finding duty-free windows."""
+
+    def test_no_busy_intervals(self):
+        assert longest_free_window(0, 100, []) == (0, 100)
+
+    def test_picks_longest_gap(self):
+        busy = [(50, 60), (10, 20), (15, 25)]
+        assert longest_free_window(0, 100, busy) == (60, 40)
+
+    def test_gap_is_clipped_to_range(self):
+        assert longest_free_window(0, 100, [(5, 10), (90, 200)]) == (10, 80)
+
+    def test_fully_busy(self):
+        assert longest_free_window(0, 100, [(-10, 200)]) == (0, 0.0)
+
+
+class TestDutyScheduler:
+    """Tests for duty lookups against a stub beacon API."""
+
+    def test_no_validators_never_defers(self):
+        assert DutyScheduler(indices=(), url="http://127.0.0.1:1").delay() == 0.0
+
+    def test_unknown_duties_do_not_defer(self):
+        # Nothing fetched yet, and delay never fetches itself
+        assert DutyScheduler(indices=(7,), url="http://127.0.0.1:1").delay() == 0.0
+
+    def test_duty_slots_filter_our_validators(self, beacon_api):
+        beacon_api.duties[0] = {
+            "proposer": [(7, 3), (99, 4)],
+            "attester": [(7, 10), (8, 11)],
+        }
+        scheduler = DutyScheduler(indices=(7, 8), url=beacon_api.url)
+
+        assert scheduler.duty_slots(0) == {3, 10, 11}
+        assert beacon_api.attester_requests == [["7", "8"]]
+
+    def test_defers_to_longest_duty_free_window(self, beacon_api):
+        # Attestations at slots 10 and 40, a proposal at slot 20
+        beacon_api.duties[0] = {"proposer": [(7, 20)], "attester": [(7, 10)]}
+        beacon_api.duties[1] = {"attester": [(7, 40)]}
+        scheduler = DutyScheduler(indices=(7,), url=beacon_api.url, grace=40 * SLOT)
+        now = slot_start(5)
+        assert scheduler.refresh(now=now) is True
+
+        delay = scheduler.delay(now=now)
+
+        # Each duty blocks [slot - 1, slot + 1); the longest gap is slots 21-39
+        assert delay == slot_start(21) - now
+
+    def test_stays_put_when_now_starts_the_longest_window(self, beacon_api):
+        beacon_api.duties[0] = {"attester": [(7, 30)]}
+        scheduler = DutyScheduler(indices=(7,), url=beacon_api.url, grace=30 * SLOT)
+        scheduler.refresh(now=slot_start(1))
+
+        assert scheduler.delay(now=slot_start(1)) == 0
+
+    def test_grace_period_bounds_the_search(self, beacon_api):
+        beacon_api.duties[0] = {"attester": [(7, 3)]}
+        scheduler = DutyScheduler(indices=(7,), url=beacon_api.url, grace=5 * SLOT)
+        scheduler.refresh(now=slot_start(0))
+
+        # Searching slots 0-5 with slots 2-4 busy: 0-2 beats 4-5
+        assert scheduler.delay(now=slot_start(0)) == 0
+
+    def test_unreachable_beacon_api_does_not_defer(self, capsys):
+        scheduler = DutyScheduler(indices=(7,), url="http://127.0.0.1:1")
+        scheduler.busy = [(0.0, 1.0)]
+
+        assert scheduler.refresh() is False
+        assert scheduler.busy is None
+        assert scheduler.delay() == 0.0
+        out = capsys.readouterr().out
+        assert "Could not fetch validator duties" in out
+        assert "[bright_yellow]" not in out
+
+    def test_background_refresh(self, beacon_api):
+        scheduler = DutyScheduler(indices=(7,), url=beacon_api.url, refresh_interval=0.01)
+
+        scheduler.start()
+        for _ in range(500):
+            if scheduler.busy is not None:
+                break
+            threading.Event().wait(0.01)
+        scheduler.stop()
+
+        # Fetched, with no duties in the current or next epoch
+        assert scheduler.busy == []
+        assert scheduler.known_until > slot_start(0)
@@ -0,0 +1,144 @@
+"""Tests for the in-memory log history and its query endpoint."""
+
+import json
+import urllib.error
+import urllib.request
+
+import pytest
+
+from staker.history import LogHistory, LogRing, LogServer
+from staker.records import parse_record
+
+
+class TestLogRing:
+    """Tests for the fixed-size ring buffer."""
+
+    def test_keeps_lines_in_order(self):
+        ring = LogRing(3)
+        ring.append("a", 1.0)
+        ring.append("b", 2.0)
+
+        assert ring.entries() == [(1.0, "a"), (2.0, "b")]
+
+    def test_overwrites_oldest(self):
+        ring = LogRing(3)
+        for i in range(5):
+            ring.append(str(i), float(i))
+
+        assert ring.entries() == [(2.0, "2"), (3.0, "3"), (4.0, "4")]
+
+    def test_severities_follow_entries(self):
+        ring = LogRing(2)
+        ring.append("a", 1.0)
+        ring.append("b", 2.0, severity=4)
+        ring.append("c", 3.0, severity=-1)
+
+        assert ring.severities() == [4, -1]
+
+
+class TestLogHistory:
+    """Tests for querying and dumping the rings."""
+
+    @pytest.fixture
+    def history(self):
+        history = LogHistory(size=10, names=("execution", "mev"))
+        history.record("execution", "INFO [10-18|12:00:00.000] Imported block", 1.0)
+        history.record("mev", "level=error msg=timeout", 2.0)
+        history.record("execution", "WARN [10-18|12:00:03.000] Slow block", 3.0)
+        history.record("unknown", "ignored", 4.0)
+        return history
+
+    def test_query_all_sorted_by_time(self, history):
+        assert [entry["ts"] for entry in history.query()] == [1.0, 2.0, 3.0]
+        assert history.query()[1] == {"ts": 2.0, "src": "mev", "line": "level=error msg=timeout"}
+
+    def test_query_process(self, history):
+        assert [entry["ts"] for entry in history.query(source="execution")] == [1.0, 3.0]
+
+    def test_query_tail(self, history):
+        assert [entry["ts"] for entry in history.query(tail=2)] == [2.0, 3.0]
+        assert history.query(tail=0) == []
+        assert len(history.query(tail=100)) == 3
+
+    def test_query_level_uses_stored_records(self, mocker):
+        history = LogHistory(size=10, names=("mev",))
+        line = "level=error msg=timeout"
+        history.record("mev", line, 1.0, parse_record("mev", line, 1.0))
+        parse = mocker.patch("staker.history.parse_record")
+
+        assert [entry["line"] for entry in history.query(level="error")] == [line]
+        parse.assert_not_called()
+
+    def test_query_level_and_more_severe(self, history):
+        assert [entry["ts"] for entry in history.query(level="warn")] == [2.0, 3.0]
+        assert [entry["ts"] for entry in history.query(level="error")] == [2.0]
+
+    def test_query_since(self, history):
+        assert [entry["ts"] for entry in history.query(since=2.0)] == [2.0, 3.0]
+
+    def test_query_rejects_bad_filters(self, history):
+        with pytest.raises(ValueError, match="Unknown process"):
+            history.query(source="vpn")
+        with pytest.raises(ValueError, match="Unknown level"):
+            history.query(level="loud")
+        with pytest.raises(ValueError, match="Negative tail"):
+            history.query(tail=-1)
+
+    def test_dump_writes_incident(self, history, tmp_path):
+        path = history.dump("execution", str(tmp_path / "incidents"), "exited with code 2")
+
+        with open(path) as f:
+            lines = f.read().splitlines()
+        assert path.endswith("-execution.log")
+        assert lines[0] == "# execution: exited with code 2"
+        assert lines[1] == "1970-01-01T00:00:01+00:00 INFO [10-18|12:00:00.000] Imported block"
+        assert len(lines) == 3
+
+    def test_dump_keeps_newest_incidents(self, history, tmp_path, mocker):
+        mocker.patch("staker.history.INCIDENT_RETENTION", 2)
+        paths = [history.dump("mev", str(tmp_path), "exited") for _ in range(3)]
+
+        assert sorted(p.name for p in tmp_path.iterdir()) == sorted(
+            path.rsplit("/", 1)[1] for path in paths[1:]
+        )
+
+
+class TestLogServer:
+    """Tests for the HTTP endpoint, queried locally."""
+
+    @pytest.fixture
+    def server(self):
+        history = LogHistory(size=10, names=("execution",))
+        history.record("execution", "ERROR [10-18|12:00:00.000] Bad block", 5.0)
+        history.record("execution", "INFO [10-18|12:00:01.000] Imported block", 6.0)
+        server = LogServer(history, host="127.0.0.1", port=0)
+        server.start()
+        yield server
+        server.stop()
+
+    def get(self, server, query):
+        url = f"http://127.0.0.1:{server.port}{query}"
+        with urllib.request.urlopen(url, timeout=5) as response:
+            assert response.headers["Content-Type"] == "application/json"
+            return json.loads(response.read())
+
+    def test_query(self, server):
+        lines = self.get(server, "/logs?process=execution&level=ERROR&since=1&tail=5")
+
+        assert lines == [
+            {"ts": 5.0, "src": "execution", "line": "ERROR [10-18|12:00:00.000] Bad block"}
+        ]
+
+    def test_bad_query(self, server):
+        with pytest.raises(urllib.error.HTTPError) as error:
+            self.get(server, "/logs?tail=many")
+        assert error.value.code == 400
+
+    def test_unknown_path(self, server):
+        with pytest.raises(urllib.error.HTTPError) as error:
+            self.get(server, "/")
+        assert error.value.code == 404
+
+    def test_stop_is_idempotent(self, server):
+        server.stop()
+        server.stop()
@@ -0,0 +1,67 @@
+"""Tests for latency statistics helpers."""
+
+import pytest
+
+from staker.latency import LatencyWindow, percentile, robust_scores
+
+
+class TestPercentile:
+    """Tests for percentile interpolation."""
+
+    def test_interpolates_between_ranks(self):
+        samples = [1.0, 2.0, 3.0, 4.0]
+        assert percentile(samples, 50) == 2.5
+        assert percentile(samples, 90) == pytest.approx(3.7)
+
+    def test_extremes(self):
+        samples = [1.0, 2.0, 3.0]
+        assert percentile(samples, 0) == 1.0
+        assert percentile(samples, 100) == 3.0
+
+    def test_single_sample(self):
+        assert percentile([5.0], 99) == 5.0
+
+
+class TestLatencyWindow:
+    """Tests for the ring buffer of latency samples."""
+
+    def test_keeps_most_recent_samples(self):
+        window = LatencyWindow(3, [1.0, 2.0])
+        window.extend([3.0, 4.0, 5.0])
+
+        assert len(window) == 3
+        assert window.tolist() == [3.0, 4.0, 5.0]
+
+    def test_percentiles(self):
+        window = LatencyWindow(100, [i / 100 for i in range(1, 101)])
+
+        stats = window.percentiles()
+
+        assert list(stats) == ["p50", "p90", "p99"]
+        assert stats["p50"] == pytest.approx(0.505)
+        assert stats["p99"] == pytest.approx(0.9901)
+
+    def test_empty_window_has_no_percentiles(self):
+        assert LatencyWindow(5).percentiles() == {}
+
+
+class TestRobustScores:
+    """Tests for median/MAD outlier scoring."""
+
+    def test_scores_distance_above_median(self):
+        center, mad, scores = robust_scores({"a": 1.0, "b": 2.0, "c": 3.0, "d": 10.0})
+
+        assert center == 2.5
+        assert mad == 1.0
+        assert scores["d"] == pytest.approx(7.5 / 1.4826)
+        assert scores["a"] < 0
+
+    def test_zero_mad_falls_back_to_mean_deviation(self):
+        _, mad, scores = robust_scores({"a": 1.0, "b": 1.0, "c": 1.0, "d": 5.0})
+
+        assert mad == 0
+        assert scores["a"] == 0
+        assert scores["d"] == pytest.approx(4 / (1.2533 * 1.0))
+
+    def test_equal_values_score_nothing(self):
+        assert robust_scores({"a": 1.0, "b": 1.0}) == (1.0, 0.0, {"a": 0.0, "b": 0.0})
@@ -0,0 +1,210 @@
+"""Tests for the buffered log sink."""
+
+import glob
+import gzip
+import threading
+
+import pytest
+
+from staker.logs import LogSink
+
+
+class TestLogSink:
+    """Tests for LogSink buffering and flushing."""
+
+    @pytest.fixture
+    def path(self, tmp_path):
+        return str(tmp_path / "logs.txt")
+
+    def read(self, path):
+        with open(path) as f:
+            return f.read()
+
+    def test_buffers_lines_until_flush(self, path):
+        sink = LogSink(path, flush_interval=60)
+        sink.write("line1")
+        sink.write("line2")
+
+        assert self.read(path) == ""
+        sink.flush()
+        assert self.read(path) == "line1\nline2\n"
+        sink.close()
+
+    def test_flushes_when_buffer_is_full(self, path):
+        sink = LogSink(path, buffer_bytes=10, flush_interval=60)
+        sink.write("12345")
+        assert self.read(path) == ""
+        sink.write("67890")
+
+        assert self.read(path) == "12345\n67890\n"
+        sink.close()
+
+    def test_flushes_after_interval(self, path):
+        sink = LogSink(path, flush_interval=0.01)
+        sink.write("stale")
+        sink._closed.wait(0.1)
+
+        assert self.read(path) == "stale\n"
+        sink.close()
+
+    def test_appends_to_existing_file(self, path):
+        with open(path, "w") as f:
+            f.write("existing\n")
+        sink = LogSink(path)
+        sink.write("new")
+        sink.close()
+
+        assert self.read(path) == "existing\nnew\n"
+
+    def test_close_flushes_and_is_idempotent(self, path):
+        sink = LogSink(path, flush_interval=60)
+        sink.write("final")
+        sink.close()
+        sink.close()
+
+        assert self.read(path) == "final\n"
+
+    def test_write_after_close_is_dropped_on_flush(self, path):
+        sink = LogSink(path)
+        sink.close()
+        sink.write("late")
+        sink.flush()
+
+        assert self.read(path) == ""
+
+    def test_fsync_on_every_flush(self, path, mocker):
+        mock_fsync = mocker.patch("staker.logs.os.fsync")
+        sink = LogSink(path, fsync="flush", flush_interval=60)
+        sink.write("a")
+        sink.flush()
+
+        mock_fsync.assert_called_once()
+        sink.close()
+
+    def test_fsync_never(self, path, mocker):
+        mock_fsync = mocker.patch("staker.logs.os.fsync")
+        sink = LogSink(path, fsync="never")
+        sink.write("a")
+        sink.close()
+
+        mock_fsync.assert_not_called()
+
+    def test_fsync_on_close(self, path, mocker):
+        mock_fsync = mocker.patch("staker.logs.os.fsync")
+        sink = LogSink(path, fsync="close", flush_interval=60)
+        sink.write("a")
+        sink.flush()
+        mock_fsync.assert_not_called()
+        sink.close()
+
+        mock_fsync.assert_called_once()
+
+    def test_rejects_unknown_fsync_policy(self, path):
+        with pytest.raises(ValueError, match="fsync"):
+            LogSink(path, fsync="sometimes")
+
+
+class TestLogRotation:
+    """Tests for size and age rotation, compression and retention."""
+
+    @pytest.fixture
+    def path(self, tmp_path):
+        return str(tmp_path / "logs.txt")
+
+    def finish(self, sink):
+        """Close the sink and wait for queued compressions."""
+        sink.close()
+        sink._compressor.join(5)
+
+    def segments(self, path):
+        return sorted(glob.glob(f"{path}.*"))
+
+    def unzip(self, segment):
+        with gzip.open(segment, "rt") as f:
+            return f.read()
+
+    def test_rotates_at_size_and_compresses(self, path):
+        sink = LogSink(path, flush_interval=60, max_bytes=10)
+        sink.write("first line")
+        sink.flush()
+        sink.write("second")
+        self.finish(sink)
+
+        [segment] = self.segments(path)
+        assert segment.endswith(".gz")
+        assert self.unzip(segment) == "first line\n"
+        with open(path) as f:
+            assert f.read() == "second\n"
+
+    def test_rotates_at_age(self, path):
+        sink = LogSink(path, flush_interval=60, max_age=0)
+        sink.write("old")
+        sink.flush()
+        self.finish(sink)
+
+        assert [self.unzip(segment) for segment in self.segments(path)] == ["old\n"]
+
+    def test_rotate_keeps_previous_run(self, path):
+        with open(path, "w") as f:
+            f.write("previous run\n")
+        sink = LogSink(path)
+        sink.rotate()
+        sink.write("this run")
+        self.finish(sink)
+
+        assert [self.unzip(segment) for segment in self.segments(path)] == ["previous run\n"]
+        with open(path) as f:
+            assert f.read() == "this run\n"
+
+    def test_rotate_skips_empty_file(self, path):
+        sink = LogSink(path)
+        sink.rotate()
+        self.finish(sink)
+
+        assert self.segments(path) == []
+
+    def test_rotate_compresses_leftover_segments(self, path):
+        with open(f"{path}.20260101T000000000000", "w") as f:
+            f.write("leftover\n")
+        with open(f"{path}.20260101T000000000000.gz.part", "w") as f:
+            f.write("truncated")
+        sink = LogSink(path)
+        sink.rotate()
+        self.finish(sink)
+
+        assert self.segments(path) == [f"{path}.20260101T000000000000.gz"]
+        assert self.unzip(self.segments(path)[0]) == "leftover\n"
+
+    def test_keeps_newest_segments(self, path):
+        sink = LogSink(path, flush_interval=60, max_bytes=1, retention=2)
+        for i in range(4):
+            sink.write(f"line{i}")
+            sink.flush()
+        self.finish(sink)
+
+        assert [self.unzip(segment) for segment in self.segments(path)] == ["line2\n", "line3\n"]
+
+    def test_rotation_syncs_segments_off_the_write_path(self, path, mocker):
+        threads = []
+        mocker.patch(
+            "staker.logs.os.fsync",
+            side_effect=lambda fd: threads.append(threading.current_thread()),
+        )
+        sink = LogSink(path, fsync="close", flush_interval=60, max_bytes=1)
+        sink.write("rotated")
+        sink.flush()
+        assert threading.current_thread() not in threads
+        self.finish(sink)
+
+        assert threads.count(sink._compressor) == 2
+        assert [self.unzip(segment) for segment in self.segments(path)] == ["rotated\n"]
+
+    def test_rotation_never_syncs_with_policy_never(self, path, mocker):
+        mock_fsync = mocker.patch("staker.logs.os.fsync")
+        sink = LogSink(path, fsync="never", flush_interval=60, max_bytes=1)
+        sink.write("rotated")
+        sink.flush()
+        self.finish(sink)
+
+        mock_fsync.assert_not_called()
+        assert [self.unzip(segment) for segment in self.segments(path)] == ["rotated\n"]
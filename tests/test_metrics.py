@@ -0,0 +1,208 @@
+"""Tests for the Prometheus metrics endpoint."""
+
+import urllib.error
+import urllib.request
+from datetime import UTC, datetime, timedelta
+from types import SimpleNamespace
+from unittest.mock import MagicMock
+
+import pytest
+
+from staker.beacon import BeaconMonitor
+from staker.config import PREFIXES
+from staker.metrics import Metrics, MetricsServer, escape, quantile
+from staker.mev import Booster
+from staker.rpc import ChainStatus
+from staker.rules import RuleEngine
+from staker.startup import StartupPipeline
+from staker.throttle import ConsoleThrottle
+
+
+def process(alive):
+    proc = MagicMock()
+    proc.poll.return_value = None if alive else 1
+    return proc
+
+
+@pytest.fixture
+def node(mocker):
+    """A stand-in exposing the node state the metrics read."""
+    mocker.patch("staker.mev.RELAYS", ["https://a.relay"])
+    booster = Booster()
+    booster._record({"https://a.relay": [0.1, 0.2]})
+    booster.feedback.observe("level=info method=getHeader url=https://a.relay durationMs=300")
+    booster.feedback.observe("level=error method=getHeader url=https://a.relay")
+    startup = StartupPipeline()
+    startup.durations.update({"relays": 1.5, "execution": 0.0})
+    rules = RuleEngine([{"name": "oops", "pattern": "oops", "threshold": 2, "action": "alert"}])
+    rules.match("execution", "oops")
+    throttle = ConsoleThrottle(rate=1, burst=1)
+    for _ in range(3):
+        throttle.admit(PREFIXES["execution"], "same", now=0)
+    throttle.admit(PREFIXES["execution"], "different", now=0)
+    return SimpleNamespace(
+        processes=[
+            {"name": "execution", "process": process(True)},
+            {"name": "mev", "process": process(False)},
+        ],
+        most_recent={"StartTime": datetime.now(UTC) - timedelta(hours=1)},
+        booster=booster,
+        startup=startup,
+        chain=SimpleNamespace(status=ChainStatus(100, 120, True, 8, 2), stalled=lambda: False),
+        beacon=BeaconMonitor(),
+        shutdown_durations={"validation": 0.25},
+        rules=rules,
+        throttle=throttle,
+    )
+
+
+class TestLabels:
+    """Tests for label formatting helpers."""
+
+    def test_escape(self):
+        assert escape('a"b\\c\nd') == 'a\\"b\\\\c\\nd'
+
+    def test_quantile(self):
+        assert quantile("p50") == "0.5"
+        assert quantile("p99") == "0.99"
+
+
+class TestMetrics:
+    """Tests for counters and rendering."""
+
+    @pytest.fixture
+    def metrics(self):
+        return Metrics()
+
+    def test_counts_lines_and_bytes(self, metrics):
+        metrics.count_line(PREFIXES["execution"], 10)
+        metrics.count_line(PREFIXES["execution"], 5)
+        metrics.count_line("UNKNOWN", 7)
+
+        i = metrics.names.index("execution")
+        assert metrics.lines[i] == 2
+        assert metrics.bytes[i] == 15
+        assert sum(metrics.lines) == 2
+
+    def test_first_start_is_not_a_restart(self, metrics):
+        metrics.process_started("mev", now=10.0)
+        metrics.process_started("mev", now=20.0)
+
+        i = metrics.names.index("mev")
+        assert metrics.restarts[i] == 1
+        assert metrics.started_at[i] == 20.0
+
+    def test_render_process_metrics(self, metrics, node, mocker):
+        mocker.patch("staker.metrics.monotonic", return_value=100.0)
+        metrics.process_started("execution", now=40.0)
+        metrics.process_started("mev", now=40.0)
+        metrics.process_started("mev", now=50.0)
+        metrics.count_line(PREFIXES["execution"], 12)
+
+        text = metrics.render(node)
+
+        assert "# TYPE staker_process_up gauge" in text
+        assert 'staker_process_up{process="execution"} 1\n' in text
+        assert 'staker_process_up{process="mev"} 0\n' in text
+        assert 'staker_process_restarts_total{process="mev"} 1\n' in text
+        assert 'staker_process_uptime_seconds{process="execution"} 60\n' in text
+        assert 'staker_process_uptime_seconds{process="mev"}' not in text
+        assert 'staker_log_lines_total{process="execution"} 1\n' in text
+        assert 'staker_log_bytes_total{process="execution"} 12\n' in text
+        assert 'staker_console_repeats_total{process="execution"} 2\n' in text
+        assert 'staker_console_dropped_total{process="execution"} 2\n' in text
+        assert 'staker_console_dropped_total{process="mev"} 0\n' in text
+
+    def test_render_copes_with_shutdown_in_progress(self, metrics, node):
+        class GrowingDict(dict):
+            """Gains a stage while being iterated, as when a process stops mid-scrape."""
+
+            def items(self):
+                for item in super().items():
+                    self["mev"] = 0.5
+                    yield item
+
+        node.shutdown_durations = GrowingDict(validation=0.25)
+
+        text = metrics.render(node)
+
+        assert 'staker_shutdown_stage_seconds{process="validation"} 0.25\n' in text
+
+    def test_render_snapshot_relay_and_startup_metrics(self, metrics, node):
+        text = metrics.render(node)
+
+        age = next(line for line in text.splitlines() if line.startswith("staker_snapshot_age"))
+        assert float(age.split()[1]) == pytest.approx(3600, abs=5)
+        assert 'staker_relay_probe_latency_seconds{relay="https://a.relay",quantile="0.5"}' in text
+        labels = 'relay="https://a.relay",method="getHeader"'
+        assert f"staker_relay_requests_total{{{labels}}} 2\n" in text
+        assert f"staker_relay_request_errors_total{{{labels}}} 1\n" in text
+        assert f'staker_relay_request_latency_seconds{{{labels},quantile="0.9"}} 0.3\n' in text
+        assert 'staker_startup_phase_seconds{phase="relays"} 1.5\n' in text
+        assert 'staker_shutdown_stage_seconds{process="validation"} 0.25\n' in text
+        assert 'staker_error_rule_hits_total{rule="oops"} 1\n' in text
+        assert 'staker_error_rule_fired_total{rule="oops",action="alert"} 0\n' in text
+
+    def test_render_execution_status(self, metrics, node):
+        text = metrics.render(node)
+
+        assert "staker_execution_block 100\n" in text
+        assert "staker_execution_highest_block 120\n" in text
+        assert "staker_execution_syncing 1\n" in text
+        assert "staker_execution_peers 8\n" in text
+        assert "staker_execution_inbound_peers 2\n" in text
+        assert "staker_execution_stalled 0\n" in text
+
+    def test_render_beacon_status(self, metrics, node):
+        node.beacon.handle("head", {"slot": "64"})
+        node.beacon.handle("finalized_checkpoint", {"epoch": "1"})
+        node.beacon.sync = {"sync_distance": 3, "is_syncing": True}
+        node.beacon.peers = 50
+
+        text = metrics.render(node)
+
+        assert "staker_beacon_head_slot 64\n" in text
+        assert "staker_beacon_finalized_epoch 1\n" in text
+        assert "staker_beacon_sync_distance 3\n" in text
+        assert "staker_beacon_syncing 1\n" in text
+        assert "staker_beacon_peers 50\n" in text
+        assert "staker_beacon_reorgs_total 0\n" in text
+
+    def test_render_without_snapshot_or_startup(self, metrics, node):
+        node.most_recent = None
+        node.startup = None
+        node.chain.status = None
+
+        text = metrics.render(node)
+
+        assert "staker_snapshot_age_seconds" not in text
+        assert "staker_execution" not in text
+        assert "staker_beacon_head_slot" not in text
+        assert "# TYPE staker_startup_phase_seconds gauge" in text
+        assert "staker_startup_phase_seconds{" not in text
+
+
+class TestMetricsServer:
+    """Tests for the HTTP endpoint, scraped locally."""
+
+    @pytest.fixture
+    def server(self):
+        server = MetricsServer(lambda: "staker_test 1\n", host="127.0.0.1", port=0)
+        server.start()
+        yield server
+        server.stop()
+
+    def test_scrape(self, server):
+        url = f"http://127.0.0.1:{server.port}/metrics"
+        with urllib.request.urlopen(url, timeout=5) as response:
+            assert response.headers["Content-Type"].startswith("text/plain; version=0.0.4")
+            assert response.read() == b"staker_test 1\n"
+
+    def test_unknown_path(self, server):
+        with pytest.raises(urllib.error.HTTPError) as error:
+            urllib.request.urlopen(f"http://127.0.0.1:{server.port}/", timeout=5)
+        assert error.value.code == 404
+
+    def test_stop_is_idempotent(self, server):
+        server.stop()
+        server.stop()
@@ -1,10 +1,56 @@
 """Tests for the MEV relay booster."""
 
+import json
+import select
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
 from unittest.mock import MagicMock
 
 import pytest
 
-from staker.mev import Booster
+from staker.mev import Booster, RelayConnection, RelayMonitor, Timing
+
+
+class StubRelayHandler(BaseHTTPRequestHandler):
+    """Answers relay requests after the delay named in the path.
+
+    A relay URL like ``http://127.0.0.1:PORT/delay-0.2`` responds after 0.2s;
+    ``/fail`` responds with a server error. Connections are kept alive and
+    counted on the server.
+    """
+
+    protocol_version = "HTTP/1.1"
+
+    def setup(self):
+        super().setup()
+        self.server.connections += 1
+
+    def do_GET(self):
+        name = self.path.split("/")[1]
+        if name.startswith("delay-"):
+            time.sleep(float(name.removeprefix("delay-")))
+        self.send_response(500 if name == "fail" else 200)
+        self.send_header("Content-Length", "2")
+        self.end_headers()
+        self.wfile.write(b"[]")
+
+    def log_message(self, *args):
+        pass
+
+
+@pytest.fixture
+def stub_relay():
+    """Serve StubRelayHandler; ``url(name)`` builds a relay URL for it."""
+    server = ThreadingHTTPServer(("127.0.0.1", 0), StubRelayHandler)
+    server.daemon_threads = True
+    server.connections = 0
+    server.url = lambda name: f"http://127.0.0.1:{server.server_port}/{name}"
+    thread = threading.Thread(target=server.serve_forever, args=(0.05,), daemon=True)
+    thread.start()
+    yield server
+    server.shutdown()
+    server.server_close()
 
 
 class TestBooster:
@@ -15,30 +61,17 @@ class TestBooster:
         booster = Booster()
 
         # Mock ping to return None for bad relays, varied times for good ones
-        ping_times = iter(
-            [
-                0.08,
-                0.10,
-                0.12,
-                0.09,
-                0.11,
-                0.10,
-                0.08,
-                0.12,
-                0.09,
-                0.11,
-                0.08,
-                0.10,
-                0.12,
-                0.09,
-                0.11,
-            ]
-        )  # 5 trials x 3 good relays
-
-        def mock_ping(relay):
+        # Relays are probed concurrently, so give each its own warm-up + 5 trials
+        ping_times = {
+            "https://good.relay": iter([0.5, 0.08, 0.10, 0.12, 0.09, 0.11]),
+            "https://another.good": iter([0.5, 0.10, 0.08, 0.12, 0.09, 0.12]),
+            "https://third.good": iter([0.5, 0.08, 0.10, 0.12, 0.10, 0.11]),
+        }
+
+        def mock_ping(relay, **_):
             if "bad" in relay:
                 return None
-            return next(ping_times)
+            return next(ping_times[relay])
 
         mocker.patch.object(booster, "ping", side_effect=mock_ping)
         # Need at least 2 good relays for stdev calculation
@@ -73,28 +106,531 @@ class TestBooster:
         # Should return original RELAYS as fallback
         assert relays == ["https://relay1", "https://relay2"]
 
-    def test_ping_returns_response_time_on_success(self, mocker):
-        """Verify ping returns elapsed time on successful request."""
+    def test_ping_returns_request_time_on_success(self, mocker):
+        """Verify ping returns the total request time on success."""
         booster = Booster()
-
-        mock_response = MagicMock()
-        mock_response.ok = True
-        mocker.patch("staker.mev.requests.get", return_value=mock_response)
-        mocker.patch("staker.mev.time", side_effect=[1.0, 1.15])  # 150ms elapsed
+        mock_request = mocker.patch.object(
+            RelayConnection, "request", return_value=(200, Timing(0, 0, 0.1, 0.15))
+        )
 
         result = booster.ping("https://test.relay")
 
-        assert result == pytest.approx(0.15, abs=0.01)
+        assert result == pytest.approx(0.15)
+        mock_request.assert_called_once_with("/eth/v1/builder/status", 10.0)
 
-    def test_ping_returns_none_on_failure(self, mocker):
-        """Verify ping returns None when request fails."""
+    def test_ping_returns_none_on_error_status(self, mocker):
+        """Verify ping returns None when the relay responds with an error."""
         booster = Booster()
+        mocker.patch.object(RelayConnection, "request", return_value=(500, Timing(0, 0, 0, 0.1)))
 
-        mock_response = MagicMock()
-        mock_response.ok = False
-        mocker.patch("staker.mev.requests.get", return_value=mock_response)
-        mocker.patch("staker.mev.time", side_effect=[1.0, 1.1])
+        assert booster.ping("https://test.relay") is None
 
-        result = booster.ping("https://test.relay")
+    def test_ping_returns_none_when_unreachable(self, mocker):
+        """Verify ping returns None when the relay cannot be reached."""
+        booster = Booster()
+        mocker.patch.object(RelayConnection, "request", side_effect=ConnectionRefusedError)
+
+        assert booster.ping("https://test.relay") is None
+
+    def test_ping_pools_one_connection_per_relay(self, stub_relay):
+        booster = Booster()
+        url = stub_relay.url("delay-0")
+
+        assert booster.ping(url) is not None
+        assert booster.ping(url) is not None
+
+        assert list(booster.connections) == [url]
+        assert stub_relay.connections == 1
+
+
+class TestRelayConnection:
+    """Tests for pooled relay connections and their timing breakdown."""
+
+    def test_parses_relay_url(self):
+        connection = RelayConnection("https://0xabc@relay.example")
+
+        assert connection.host == "relay.example"
+        assert connection.port == 443
+
+    def test_reuses_connection_with_warm_timing(self, stub_relay):
+        connection = RelayConnection(stub_relay.url("delay-0.05"))
+
+        cold_status, cold = connection.request("/eth/v1/builder/status")
+        warm_status, warm = connection.request("/eth/v1/builder/status")
+        connection.close()
+
+        assert cold_status == warm_status == 200
+        assert stub_relay.connections == 1
+        assert cold.connect > 0
+        assert warm.connect == warm.tls == 0
+        assert warm.ttfb >= 0.05
+        assert warm.total >= warm.ttfb
+        assert connection.handshake == cold
+
+    def test_reconnects_when_kept_alive_connection_is_gone(self, stub_relay):
+        connection = RelayConnection(stub_relay.url("delay-0"))
+        connection.request("/eth/v1/builder/status")
+        connection._conn.sock.close()
+
+        status, timing = connection.request("/eth/v1/builder/status")
+        connection.close()
+
+        assert status == 200
+        assert timing.connect > 0
+        assert stub_relay.connections == 2
+
+    def test_raises_when_unreachable(self, stub_relay):
+        url = stub_relay.url("delay-0")
+        stub_relay.shutdown()
+        stub_relay.server_close()
+
+        with pytest.raises(OSError):
+            RelayConnection(url).request("/eth/v1/builder/status", timeout=1)
+
+    def test_times_tls_handshake(self, stub_relay, mocker):
+        context = MagicMock()
+        context.wrap_socket.side_effect = lambda sock, server_hostname: sock
+        url = stub_relay.url("delay-0").replace("http://", "https://")
+        connection = RelayConnection(url, context=context)
+        connection.port = stub_relay.server_port
+
+        status, timing = connection.request("/eth/v1/builder/status")
+        connection.close()
+
+        assert status == 200
+        context.wrap_socket.assert_called_once_with(mocker.ANY, server_hostname="127.0.0.1")
+        assert timing.tls >= 0
+
+
+class TestBoosterProbing:
+    """Tests for concurrent relay probing against a stub relay server."""
+
+    def test_relays_are_probed_concurrently(self, mocker, stub_relay):
+        relays = [stub_relay.url(f"delay-0.{i}") for i in (10, 11, 15, 16)]
+        mocker.patch("staker.mev.RELAYS", relays)
+        mocker.patch("staker.mev.sleep")
+
+        start = time.monotonic()
+        selected = Booster().get_relays()
+        elapsed = time.monotonic() - start
+
+        assert selected == relays
+        # Sequential probing would take 6 requests x 0.52s of combined delay
+        assert elapsed < 2
+
+    def test_failing_relay_is_dropped(self, mocker, stub_relay):
+        relays = [stub_relay.url("delay-0"), stub_relay.url("fail"), stub_relay.url("delay-0.01")]
+        mocker.patch("staker.mev.RELAYS", relays)
+        mocker.patch("staker.mev.sleep")
+
+        selected = Booster().get_relays()
+
+        assert stub_relay.url("fail") not in selected
+        assert len(selected) == 2
+
+    def test_deadline_bounds_probing(self, mocker, stub_relay):
+        relays = [
+            stub_relay.url("delay-0"),
+            stub_relay.url("delay-0.01"),
+            stub_relay.url("delay-5"),
+        ]
+        mocker.patch("staker.mev.RELAYS", relays)
+        mocker.patch("staker.mev.sleep")
+
+        start = time.monotonic()
+        selected = Booster(deadline=1).get_relays()
+        elapsed = time.monotonic() - start
+
+        assert stub_relay.url("delay-5") not in selected
+        assert len(selected) == 2
+        assert elapsed < 2
+
+    def test_probe_stops_after_deadline(self, mocker):
+        booster = Booster()
+        mock_ping = mocker.patch.object(booster, "ping", return_value=0.1)
+        mocker.patch("staker.mev.sleep")
+        mocker.patch("staker.mev.monotonic", side_effect=[0, 5, 11])
+
+        assert booster._probe("https://relay", deadline=10) is None
+        assert mock_ping.call_count == 2
+        # The last trial only gets the time left before the deadline
+        assert mock_ping.call_args.kwargs["timeout"] == 5
+
+    def test_probe_collects_warm_trials(self, mocker):
+        booster = Booster()
+        # The first ping opens the connection and is left out
+        mocker.patch.object(booster, "ping", side_effect=[0.9, 0.1, 0.2, 0.3, 0.2, 0.2])
+        mock_sleep = mocker.patch("staker.mev.sleep")
+
+        assert booster._probe("https://relay", deadline=float("inf")) == [0.1, 0.2, 0.3, 0.2, 0.2]
+        assert mock_sleep.call_count == 4
+
+    def test_valid_relays_are_logged_with_timing(self, mocker, stub_relay, capsys):
+        relays = [stub_relay.url("delay-0"), stub_relay.url("delay-0.01")]
+        mocker.patch("staker.mev.RELAYS", relays)
+        mocker.patch("staker.mev.sleep")
+
+        Booster().get_relays()
+
+        out = capsys.readouterr().out
+        assert out.count("Valid relay:") == 2
+        assert "cold connect" in out
+
+
+class TestBoosterScoreboard:
+    """Tests for the persisted relay scoreboard."""
+
+    RELAYS = ["https://a.relay", "https://b.relay", "https://c.relay"]
+
+    @pytest.fixture
+    def cache_path(self, tmp_path):
+        return str(tmp_path / "relay_scoreboard.json")
+
+    @pytest.fixture(autouse=True)
+    def relays(self, mocker):
+        mocker.patch("staker.mev.RELAYS", self.RELAYS)
+
+    def write_cache(self, cache_path, **scoreboard):
+        with open(cache_path, "w") as f:
+            json.dump(scoreboard, f)
+
+    def probe_with(self, booster, mocker, samples):
+        mocker.patch.object(booster, "_probe", side_effect=lambda relay, _: samples[relay])
+
+    def test_select_relays_persists_history_and_selection(self, mocker, cache_path):
+        booster = Booster(cache_path=cache_path)
+        self.probe_with(
+            booster,
+            mocker,
+            {
+                "https://a.relay": [0.1, 0.1],
+                "https://b.relay": [0.11, 0.12],
+                "https://c.relay": None,
+            },
+        )
+
+        selection = booster.select_relays()
+
+        with open(cache_path) as f:
+            saved = json.load(f)
+        assert saved["selection"] == selection == ["https://a.relay", "https://b.relay"]
+        assert saved["relays"]["https://a.relay"]["latencies"] == [0.1, 0.1]
+        assert saved["relays"]["https://c.relay"] == {
+            "latencies": [],
+            "attempts": 1,
+            "successes": 0,
+        }
+        loaded = Booster(cache_path=cache_path).scoreboard
+        assert loaded["relays"]["https://b.relay"]["latencies"].tolist() == [0.11, 0.12]
+        assert loaded["selection"] == saved["selection"]
+
+    def test_fallback_selection_is_not_cached(self, mocker, cache_path):
+        booster = Booster(cache_path=cache_path)
+        self.probe_with(booster, mocker, dict.fromkeys(self.RELAYS))
+
+        assert booster.select_relays() == self.RELAYS
+        assert Booster(cache_path=cache_path).scoreboard["selection"] == []
+
+    def test_fresh_cache_is_reused_and_refreshed_in_background(self, mocker, cache_path):
+        self.write_cache(cache_path, selection=["https://a.relay"], selected_at=time.time())
+        booster = Booster(cache_path=cache_path)
+        refreshed = threading.Event()
+        mocker.patch.object(booster, "select_relays", side_effect=lambda: refreshed.set())
+
+        assert booster.get_relays() == ["https://a.relay"]
+        assert refreshed.wait(5)
+
+    def test_stale_cache_is_probed_again(self, mocker, cache_path):
+        selected_at = time.time() - 7 * 60 * 60
+        self.write_cache(cache_path, selection=["https://a.relay"], selected_at=selected_at)
+        booster = Booster(cache_path=cache_path)
+        mock_select = mocker.patch.object(booster, "select_relays", return_value=["fresh"])
+
+        assert booster.get_relays() == ["fresh"]
+        mock_select.assert_called_once()
+
+    def test_cache_for_other_relays_is_ignored(self, mocker, cache_path):
+        self.write_cache(cache_path, selection=["https://other.relay"], selected_at=time.time())
+        booster = Booster(cache_path=cache_path)
+
+        assert booster._cached_selection() is None
+
+    def test_unreadable_cache_starts_empty(self, cache_path):
+        with open(cache_path, "w") as f:
+            f.write("{not json")
+
+        assert Booster(cache_path=cache_path).scoreboard["relays"] == {}
+
+    @pytest.mark.parametrize(
+        "scoreboard",
+        [
+            [],
+            {"relays": []},
+            {"relays": {"https://a.relay": {"latencies": [0.1]}}},
+            {"relays": {"https://a.relay": {"latencies": "x", "attempts": 1, "successes": 1}}},
+            {"relays": {"https://a.relay": None}},
+            {"selection": [1], "selected_at": 0},
+            {"selection": ["https://a.relay"], "selected_at": "yesterday"},
+        ],
+    )
+    def test_malformed_cache_is_a_miss(self, mocker, cache_path, scoreboard):
+        with open(cache_path, "w") as f:
+            json.dump(scoreboard, f)
+        booster = Booster(cache_path=cache_path)
+        mock_select = mocker.patch.object(booster, "select_relays", return_value=["fresh"])
+
+        assert booster.scoreboard == {"relays": {}, "selection": [], "selected_at": 0.0}
+        assert booster.get_relays() == ["fresh"]
+        mock_select.assert_called_once()
+
+    def test_history_is_capped(self, mocker):
+        mocker.patch("staker.mev.RELAY_HISTORY", 3)
+        booster = Booster()
+
+        booster._record({"https://a.relay": [0.1, 0.2]})
+        booster._record({"https://a.relay": [0.3, 0.4]})
+
+        latencies = booster.scoreboard["relays"]["https://a.relay"]["latencies"]
+        assert latencies.tolist() == [0.2, 0.3, 0.4]
+
+    def test_success_rate(self):
+        booster = Booster()
+        booster._record({"https://a.relay": [0.1]})
+        booster._record({"https://a.relay": None})
+
+        assert booster.success_rate("https://a.relay") == 0.5
+        assert booster.success_rate("https://b.relay") is None
+
+    def test_save_failure_only_warns(self, tmp_path, capsys):
+        booster = Booster(cache_path=str(tmp_path / "missing" / "relay_scoreboard.json"))
+
+        booster._save()
+
+        out = capsys.readouterr().out
+        assert "Failed to save relay scoreboard" in out
+        # Rendered by Rich, not printed as literal markup
+        assert "[bright_yellow]" not in out
+
+
+class TestBoosterSelection:
+    """Tests for percentile-based slow relay filtering."""
+
+    RELAYS = [f"https://{name}.relay" for name in ("a", "b", "c", "d", "e")]
+
+    @pytest.fixture
+    def booster(self, mocker):
+        mocker.patch("staker.mev.RELAYS", self.RELAYS)
+        return Booster()
+
+    def select(self, booster, mocker, latencies):
+        samples = dict(zip(self.RELAYS, latencies, strict=True))
+        mocker.patch.object(booster, "_probe", side_effect=lambda relay, _: samples[relay])
+        return booster.select_relays()
+
+    def test_slow_tail_relay_is_dropped(self, booster, mocker, capsys):
+        steady = [0.10, 0.11, 0.10, 0.12, 0.11]
+        spiky = [0.10, 0.11, 0.10, 0.12, 0.90]
+
+        selected = self.select(booster, mocker, [steady, steady, steady, steady, spiky])
+
+        assert selected == self.RELAYS[:4]
+        out = capsys.readouterr().out
+        assert "Slow relay: https://e.relay (p50 110ms, p90 588ms" in out
+        assert "Relay p90 median 116ms" in out
+
+    def test_fast_relay_is_kept(self, booster, mocker):
+        steady = [0.20, 0.21, 0.20, 0.22, 0.21]
+        fast = [0.01, 0.01, 0.01, 0.01, 0.01]
+
+        assert self.select(booster, mocker, [steady] * 4 + [fast]) == self.RELAYS
+
+    def test_identical_latencies_keep_all_relays(self, booster, mocker):
+        same = [0.1] * 5
+
+        assert self.select(booster, mocker, [same] * 5) == self.RELAYS
+
+    def test_small_absolute_excess_is_tolerated(self, booster, mocker):
+        steady = [0.100, 0.101, 0.100, 0.101, 0.100]
+        slightly_slower = [0.130] * 5
+
+        assert self.select(booster, mocker, [steady] * 4 + [slightly_slower]) == self.RELAYS
+
+    def test_two_relays_are_both_kept(self, booster, mocker):
+        fast, slow = [0.1] * 5, [0.5] * 5
+
+        assert self.select(booster, mocker, [fast, slow, None, None, None]) == self.RELAYS[:2]
+
+    def observe(self, booster, relay, count, duration="100", level="info"):
+        for _ in range(count):
+            booster.feedback.observe(
+                f"level={level} method=getHeader url={relay}/eth/v1/builder/header "
+                f"durationMs={duration}"
+            )
+
+    def test_failing_relay_is_dropped(self, booster, mocker, capsys):
+        self.observe(booster, "https://a.relay", 15)
+        self.observe(booster, "https://a.relay", 5, level="error")
+        self.observe(booster, "https://b.relay", 19, level="error")
+        steady = [0.10] * 5
+
+        assert self.select(booster, mocker, [steady] * 5) == self.RELAYS[1:]
+        assert "Failing relay: https://a.relay (getHeader errors 25% of 20)" in (
+            capsys.readouterr().out
+        )
+
+    def test_observed_latency_replaces_pings(self, booster, mocker, capsys):
+        for relay in self.RELAYS[:4]:
+            self.observe(booster, relay, 20)
+        self.observe(booster, "https://e.relay", 20, duration="900")
+        steady = [0.10] * 5
+
+        assert self.select(booster, mocker, [steady] * 5) == self.RELAYS[:4]
+        out = capsys.readouterr().out
+        assert "Scoring relays on observed getHeader latency" in out
+        assert "Slow relay: https://e.relay (p50 900ms" in out
+
+    def test_pings_are_used_until_every_relay_has_samples(self, booster, mocker, capsys):
+        self.observe(booster, "https://e.relay", 20, duration="900")
+        steady = [0.10] * 5
+
+        assert self.select(booster, mocker, [steady] * 5) == self.RELAYS
+        assert "observed getHeader" not in capsys.readouterr().out
+
+    def test_relay_slower_than_slot_budget_is_dropped(self, booster, mocker, capsys):
+        fast = [0.05, 0.06, 0.05, 0.06, 0.05]
+        late = [1.2, 1.3, 1.2, 1.3, 1.2]
+
+        selected = self.select(booster, mocker, [fast, late, fast, late, fast])
+
+        assert selected == self.RELAYS[::2]
+        assert "Late relay: https://b.relay (p50 1200ms" in capsys.readouterr().out
+
+    def test_all_late_relays_are_kept(self, booster, mocker, capsys):
+        late = [1.2] * 5
+
+        assert self.select(booster, mocker, [late] * 5) == self.RELAYS
+        assert "slower than the slot budget" in capsys.readouterr().out
+
+
+class TestRequestTimeouts:
+    """Tests for mev-boost request timeouts derived from relay latency."""
+
+    RELAYS = ["https://a.relay", "https://b.relay"]
+
+    @pytest.fixture
+    def booster(self, mocker):
+        mocker.patch("staker.mev.RELAYS", self.RELAYS)
+        booster = Booster()
+        booster._record({"https://a.relay": [0.1] * 5, "https://b.relay": [0.2] * 5})
+        return booster
+
+    def test_unmeasured_relays_get_the_maximum(self, booster):
+        assert booster.request_timeouts(["https://unknown.relay"]) == {
+            "getHeader": 0.95,
+            "getPayload": 4.0,
+            "registerValidator": 3.0,
+        }
+
+    def test_slowest_ping_p99_with_margin_and_bounds(self, booster):
+        timeouts = booster.request_timeouts(self.RELAYS)
+
+        assert timeouts["getHeader"] == pytest.approx(0.3)
+        assert timeouts["getPayload"] == 1.0
+        assert timeouts["registerValidator"] == 1.0
+
+    def test_observed_latency_is_preferred(self, booster):
+        for _ in range(20):
+            booster.feedback.observe(
+                "method=getHeader url=https://b.relay/eth/v1/builder/header durationMs=400"
+            )
+
+        assert booster.request_timeouts(self.RELAYS)["getHeader"] == pytest.approx(0.6)
+
+    def test_clamped_to_slot_budget(self, booster):
+        booster._record({"https://a.relay": [2.0] * 5})
+
+        assert booster.request_timeouts(self.RELAYS)["getHeader"] == 0.95
+
+
+class TestRelayMonitor:
+    """Tests for the background relay health monitor."""
+
+    RELAYS = ["https://a.relay", "https://b.relay", "https://c.relay"]
+
+    @pytest.fixture
+    def booster(self, mocker):
+        mocker.patch("staker.mev.RELAYS", self.RELAYS)
+        booster = Booster()
+        mocker.patch.object(booster, "select_relays")
+        return booster
+
+    @pytest.fixture
+    def monitor(self, booster):
+        monitor = RelayMonitor(booster, interval=60)
+        monitor.reset(self.RELAYS)
+        return monitor
+
+    def probe(self, monitor, healthy):
+        monitor.booster.select_relays.return_value = healthy
+        return monitor.check()
+
+    def test_one_bad_probe_does_not_drop_a_relay(self, monitor):
+        assert self.probe(monitor, self.RELAYS[:2]) is False
+        assert monitor.health["https://c.relay"] == 0.5
+        assert monitor.take_update() is None
+
+    def test_relay_is_dropped_after_repeated_bad_probes(self, monitor):
+        self.probe(monitor, self.RELAYS[:2])
+
+        assert self.probe(monitor, self.RELAYS[:2]) is True
+        assert monitor.active == self.RELAYS[:2]
+        assert monitor.take_update() == self.RELAYS[:2]
+        assert monitor.take_update() is None
+
+    def test_dropped_relay_must_recover_fully_to_rejoin(self, monitor):
+        monitor.reset(self.RELAYS[:2])
+
+        assert self.probe(monitor, self.RELAYS) is False
+        assert self.probe(monitor, self.RELAYS) is True
+        assert monitor.active == self.RELAYS
+
+    def test_alternating_relay_does_not_flap(self, monitor):
+        changes = [self.probe(monitor, self.RELAYS if i % 2 else self.RELAYS[:2]) for i in range(6)]
+
+        assert changes == [False] * 6
+
+    def test_failed_probe_is_ignored(self, monitor):
+        monitor.booster.probe_failed = True
+
+        assert self.probe(monitor, self.RELAYS) is False
+        assert monitor.health["https://a.relay"] == 1.0
+
+    def test_update_makes_monitor_selectable(self, monitor):
+        self.probe(monitor, self.RELAYS[:1])
+        self.probe(monitor, self.RELAYS[:1])
+
+        readable, _, _ = select.select([monitor], [], [], 0)
+        assert readable == [monitor]
+        monitor.take_update()
+        readable, _, _ = select.select([monitor], [], [], 0)
+        assert readable == []
+
+    def test_background_thread_checks_until_stopped(self, booster):
+        monitor = RelayMonitor(booster, interval=0.01)
+        checked = threading.Event()
+        booster.select_relays.side_effect = lambda: checked.set() or []
+
+        monitor.start()
+        assert checked.wait(5)
+        monitor.stop()
+
+    def test_check_errors_are_logged(self, booster, mocker, capsys):
+        monitor = RelayMonitor(booster, interval=0)
+        mocker.patch.object(monitor, "check", side_effect=[RuntimeError("boom")])
+        mocker.patch.object(monitor._stop, "wait", side_effect=[False, True])
+
+        monitor._run()
 
-        assert result is None
+        out = capsys.readouterr().out
+        assert "Relay health check failed: boom" in out
+        assert "[/bright_yellow]" not in out
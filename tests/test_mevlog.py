@@ -0,0 +1,88 @@
+"""Tests for relay feedback parsed from mev-boost logs."""
+
+import pytest
+
+from staker.mevlog import RelayLogStats, parse_duration
+
+RELAY = "https://0xabc@relay.example.com"
+
+
+def header_line(duration="120", key="durationMs", level="info", extra=""):
+    return (
+        f'time="2024-01-01T00:00:00Z" level={level} msg="got getHeader response" '
+        f"method=getHeader url=https://0xabc@relay.example.com/eth/v1/builder/header "
+        f"{key}={duration} slot=123{extra}"
+    )
+
+
+class TestParseDuration:
+    """Tests for logged duration parsing."""
+
+    def test_milliseconds_field(self):
+        assert parse_duration("durationMs", "120") == pytest.approx(0.12)
+
+    def test_plain_seconds(self):
+        assert parse_duration("duration", "0.5") == 0.5
+
+    def test_go_durations(self):
+        assert parse_duration("duration", "850ms") == pytest.approx(0.85)
+        assert parse_duration("latency", "1m2.5s") == pytest.approx(62.5)
+        assert parse_duration("latency", "120µs") == pytest.approx(0.00012)
+
+    def test_not_a_duration(self):
+        assert parse_duration("duration", "soon") is None
+        assert parse_duration("duration", "5sx") is None
+
+
+class TestRelayLogStats:
+    """Tests for per-relay getHeader/getPayload aggregates."""
+
+    @pytest.fixture
+    def stats(self):
+        return RelayLogStats([RELAY])
+
+    def test_attributes_requests_to_configured_relay(self, stats):
+        assert stats.observe(header_line()) is True
+
+        assert stats.requests == {(RELAY, "getHeader"): 1}
+        assert stats.percentiles(RELAY) == {"p50": 0.12, "p90": 0.12, "p99": 0.12}
+
+    def test_ignores_unrelated_lines(self, stats):
+        assert stats.observe('level=info msg="listening" addr=0.0.0.0:18550') is False
+        assert stats.observe('level=info msg="getHeader called" slot=1') is False
+        assert stats.requests == {}
+
+    def test_observe_fields_skips_parsing(self, stats):
+        fields = {"method": "getPayload", "url": RELAY, "durationMs": "250", "level": "info"}
+
+        assert stats.observe_fields(fields) is True
+        assert stats.percentiles(RELAY, "getPayload") == {"p50": 0.25, "p90": 0.25, "p99": 0.25}
+        assert stats.observe_fields({"msg": "listening"}) is False
+
+    def test_counts_errors(self, stats):
+        stats.observe(header_line())
+        stats.observe(header_line(level="error"))
+        stats.observe(header_line(extra=' error="context deadline exceeded"'))
+
+        assert stats.error_rate(RELAY) == pytest.approx(2 / 3)
+        assert stats.sample_count(RELAY) == 1
+
+    def test_error_rate_without_requests(self, stats):
+        assert stats.error_rate(RELAY) is None
+        assert stats.percentiles(RELAY) == {}
+        assert stats.sample_count(RELAY) == 0
+
+    def test_unknown_relay_uses_hostname(self, stats):
+        stats.observe("method=getPayload url=https://other.relay/eth duration=1.5s")
+
+        assert stats.percentiles("other.relay", "getPayload")["p50"] == 1.5
+
+    def test_summary(self, stats):
+        stats.observe(header_line("100"))
+        stats.observe(header_line("300"))
+        stats.observe(header_line(level="warning"))
+
+        summary = stats.summary()[RELAY]["getHeader"]
+        assert summary["requests"] == 3
+        assert summary["errors"] == 1
+        assert summary["p50"] == pytest.approx(0.2)
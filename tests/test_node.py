@@ -1,13 +1,34 @@
 """Tests for the Node orchestrator."""
 
+import glob
+import json
 import os
 import signal
+import subprocess
+import sys
+import time
 from unittest.mock import MagicMock
 
 import pytest
 
-from staker.node import Node
+import staker.node
+from staker.config import PREFIXES, SNAPSHOT_DAYS
+from staker.node import Node, main
+from staker.records import parse_record
+from staker.restarts import CrashTracker
+from staker.rpc import ChainStatus
+from staker.rules import RuleEngine
 from staker.snapshot import NoOpSnapshotManager
+from staker.startup import StartupPipeline
+from staker.streams import LineReader
+
+
+def ready_startup(**gates):
+    """Build a startup pipeline whose gates are open unless overridden."""
+    startup = StartupPipeline(poll_interval=0)
+    for name in ("execution", "consensus", "validation", "mev"):
+        startup.gate(name, gates.get(name, lambda: True))
+    return startup
 
 
 class MockEnvironment:
@@ -65,12 +86,26 @@ class TestNodeInit:
         node = Node(env=mock_deps, snapshot=NoOpSnapshotManager())
         assert os.path.exists(node.logs_file)
 
+    def test_keeps_previous_run_log(self, mock_deps):
+        with open(mock_deps.get_logs_path(), "w") as f:
+            f.write("previous run\n")
+
+        node = Node(env=mock_deps, snapshot=NoOpSnapshotManager())
+
+        assert os.path.getsize(node.logs_file) == 0
+        assert glob.glob(f"{node.logs_file}.*")
+
     def test_sets_correct_data_dirs(self, mock_deps, mocker):
         mocker.patch("staker.node.platform", "linux")
         node = Node(env=mock_deps, snapshot=NoOpSnapshotManager())
         assert ".ethereum" in node.geth_data_dir
         assert ".eth2" in node.prysm_data_dir
 
+    def test_relay_scoreboard_sits_next_to_data_dirs(self, mock_deps, mocker):
+        mocker.patch("staker.node.DOCKER", True)
+        node = Node(env=mock_deps, snapshot=NoOpSnapshotManager())
+        assert node.booster.cache_path == "/tmp/relay_scoreboard.json"
+
 
 class TestNodeProcesses:
     """Tests for Node process management."""
@@ -150,6 +185,7 @@ class TestNodeLogging:
 
     def test_print_line_writes_to_file(self, node):
         node._print_line("PREFIX", b"test message\n")
+        node.sink.flush()
 
         with open(node.logs_file) as f:
             content = f.read()
@@ -163,6 +199,118 @@ class TestNodeLogging:
         result = node._print_line("PREFIX", b"   \n")
         assert result is None
 
+    def test_print_line_prints_ansi_colors(self, node, capsys):
+        node._print_line("EXECUTION", b"INFO [x] started\n")
+
+        out = capsys.readouterr().out
+        assert "\x1b[1;35mEXECUTION\x1b[0m" in out
+        assert "[x] started" in out
+
+    def test_print_line_prints_plain_logs(self, node, capsys, mocker):
+        mocker.patch.object(node.env, "use_colored_logs", return_value=False)
+        node._print_line("EXECUTION", b"INFO [x] started\n")
+
+        assert capsys.readouterr().out == "EXECUTION INFO [x] started\n"
+
+    def test_print_line_collapses_repeats_on_console_only(self, node, capsys, mocker):
+        mocker.patch.object(node.env, "use_colored_logs", return_value=False)
+        for _ in range(3):
+            node._print_line("EXECUTION", b"Looking for peers\n")
+        node._print_line("EXECUTION", b"Found a peer\n")
+        node.sink.flush()
+
+        assert capsys.readouterr().out == (
+            "EXECUTION Looking for peers\n"
+            "EXECUTION Looking for peers (repeated x2)\n"
+            "EXECUTION Found a peer\n"
+        )
+        with open(node.logs_file) as f:
+            assert f.read().count("Looking for peers") == 3
+
+    def test_print_line_can_log_the_throttled_stream(self, node, mocker):
+        mocker.patch("staker.node.AGGREGATE_LOG_FILE", True)
+        for _ in range(3):
+            node._print_line("EXECUTION", b"Looking for peers\n")
+        node._show(node.throttle.pending())
+        node.sink.flush()
+
+        with open(node.logs_file) as f:
+            assert f.read() == (
+                "EXECUTION Looking for peers\nEXECUTION Looking for peers (repeated x2)\n"
+            )
+
+    def test_print_line_feeds_mev_logs_to_booster(self, node, mocker):
+        observe = mocker.patch.object(node.booster.feedback, "observe")
+        node._print_line("EXECUTION", b"INFO [x] started\n")
+        node._print_line(PREFIXES["mev"], b"level=info method=getHeader\n")
+
+        observe.assert_called_once_with("level=info method=getHeader")
+
+    def test_print_line_counts_lines_for_metrics(self, node):
+        node._print_line(PREFIXES["execution"], b"INFO [x] started\n")
+        node._print_line(PREFIXES["execution"], b"   \n")
+
+        i = node.metrics.names.index("execution")
+        assert node.metrics.lines[i] == 1
+        assert node.metrics.bytes[i] == len(b"INFO [x] started\n")
+
+    def test_print_line_writes_jsonl_records(self, node, mocker):
+        mocker.patch("staker.node.JSON_LOGS", True)
+        node._print_line(PREFIXES["execution"], b"WARN [10-18|12:00:00.000] Slow block  number=7\n")
+        node.sink.flush()
+
+        with open(node.logs_file) as f:
+            record = json.loads(f.read())
+        assert record["src"] == "execution"
+        assert record["level"] == "warn"
+        assert record["msg"] == "Slow block"
+        assert record["fields"] == {"number": "7"}
+
+    def test_print_line_hands_records_to_consumers(self, node, mocker):
+        mocker.patch("staker.node.JSON_LOGS", True)
+        records = []
+        node.record_consumers.append(records.append)
+
+        node._print_line(PREFIXES["consensus"], b"plain\n")
+
+        assert [(record.source, record.msg) for record in records] == [("consensus", "plain")]
+
+    def test_print_line_parses_each_line_once(self, node, mocker):
+        mocker.patch("staker.node.JSON_LOGS", True)
+        parse = mocker.patch("staker.node.parse_record", wraps=parse_record)
+        reparse = mocker.patch("staker.history.parse_record")
+        node.record_consumers.append(lambda record: None)
+
+        node._print_line(PREFIXES["execution"], b"ERROR [10-18|12:00:00.000] Bad block\n")
+        errors = node.history.query(source="execution", level="error")
+
+        parse.assert_called_once()
+        reparse.assert_not_called()
+        assert [entry["line"] for entry in errors] == ["ERROR [10-18|12:00:00.000] Bad block"]
+
+    def test_jsonl_records_feed_relay_feedback(self, node, mocker):
+        mocker.patch("staker.node.JSON_LOGS", True)
+        observe = mocker.patch.object(node.booster.feedback, "observe_fields")
+        line = (
+            b'time="t" level=error msg="error calling getHeader" method=getHeader url=https://r\n'
+        )
+
+        node._print_line(PREFIXES["execution"], b"INFO [x] started\n")
+        node._print_line(PREFIXES["mev"], line)
+
+        observe.assert_called_once_with(
+            {"method": "getHeader", "url": "https://r", "level": "error"}
+        )
+
+    def test_print_line_buffers_until_flush(self, node):
+        node._print_line("PREFIX", b"buffered\n")
+
+        with open(node.logs_file) as f:
+            assert f.read() == ""
+        node.sink.flush()
+        with open(node.logs_file) as f:
+            assert f.read() == "PREFIX buffered\n"
+
 
 class TestNodeProcessState:
     """Tests for Node process state checking."""
@@ -223,24 +371,81 @@ class TestNodeErrorHandling:
         env = MockEnvironment(logs_path=str(logs_file))
         return Node(env=env, snapshot=NoOpSnapshotManager())
 
+    def print_lines(self, node, prefix, *lines):
+        for line in lines:
+            node._print_line(prefix, line.encode())
+
     def test_interrupt_on_error_detects_backfill_failure(self, node, mocker):
         mock_interrupt = mocker.patch.object(node, "_interrupt")
 
-        logs = ["Normal log", "Beacon backfilling failed error", "Another log"]
-        result = node._interrupt_on_error(logs)
+        self.print_lines(
+            node, PREFIXES["consensus"], "Normal log", "Beacon backfilling failed error", "Another"
+        )
+        result = node._interrupt_on_error()
 
         assert result is True
         mock_interrupt.assert_called_once_with(hard=False)
+        assert node.triggered == []
+        assert node.rules.fired["beacon-backfill-failed"] == 1
 
     def test_interrupt_on_error_ignores_normal_logs(self, node, mocker):
         mock_interrupt = mocker.patch.object(node, "_interrupt")
 
-        logs = ["Normal log", "Everything OK", None]
-        result = node._interrupt_on_error(logs)
+        self.print_lines(node, PREFIXES["consensus"], "Normal log", "Everything OK", "")
+        result = node._interrupt_on_error()
 
         assert result is False
         mock_interrupt.assert_not_called()
 
+    def test_interrupt_on_error_restarts_only_the_source(self, node, mocker):
+        node.rules = RuleEngine(
+            [{"name": "stuck", "pattern": "stuck", "source": "mev", "action": "restart-process"}]
+        )
+        node.processes = [{"name": "execution"}, {"name": "mev"}]
+        mock_interrupt = mocker.patch.object(node, "_interrupt")
+
+        self.print_lines(node, PREFIXES["execution"], "stuck")
+        self.print_lines(node, PREFIXES["mev"], "stuck")
+        result = node._interrupt_on_error()
+
+        assert result is False
+        mock_interrupt.assert_called_once_with(hard=False, processes=[{"name": "mev"}])
+
+    def test_interrupt_on_error_only_alerts(self, node, mocker):
+        node.rules = RuleEngine([{"name": "slow", "pattern": "slow", "action": "alert"}])
+        mock_interrupt = mocker.patch.object(node, "_interrupt")
+
+        self.print_lines(node, PREFIXES["execution"], "slow")
+
+        assert node._interrupt_on_error() is False
+        mock_interrupt.assert_not_called()
+        assert node.rules.fired == {"slow": 1}
+
+    def test_interrupt_on_error_terminates_instance(self, node, mocker):
+        node.rules = RuleEngine(
+            [
+                {
+                    "name": "corrupt",
+                    "pattern": "corrupt",
+                    "threshold": 2,
+                    "window": 60,
+                    "action": "terminate",
+                }
+            ]
+        )
+        mocker.patch.object(node.env, "should_manage_snapshots", return_value=True)
+        mock_terminate = mocker.patch.object(node.snapshot, "terminate")
+        mock_interrupt = mocker.patch.object(node, "_interrupt")
+
+        self.print_lines(node, PREFIXES["execution"], "corrupt")
+        assert node._interrupt_on_error() is False
+        self.print_lines(node, PREFIXES["execution"], "corrupt")
+        assert node._interrupt_on_error() is True
+
+        assert node.terminating is True
+        mock_terminate.assert_called_once()
+        mock_interrupt.assert_called_once_with(hard=False)
+
 
 class TestNodeGracefulShutdown:
     """Tests for graceful shutdown handling."""
@@ -258,24 +463,53 @@ class TestNodeGracefulShutdown:
         mock_interrupt = mocker.patch.object(node, "_interrupt")
         mocker.patch.object(node, "_terminate")
         mocker.patch.object(node, "_kill")
-        mocker.patch.object(node, "_all_processes_are_dead", return_value=True)
+        mocker.patch.object(node, "_wait_for_exit", return_value=True)
+        mocker.patch.object(node, "_drain_logs")
         mocker.patch.object(node, "_squeeze_logs")
+        process = MagicMock()
+        process.poll.return_value = None
+        meta = {"name": "mev", "process": process}
 
-        node._handle_gracefully([], hard=True)
+        node._handle_gracefully([meta], hard=True)
 
-        mock_interrupt.assert_called_once()
+        mock_interrupt.assert_called_once_with(hard=True, processes=[meta])
 
     def test_handle_gracefully_squeezes_logs(self, node, mocker):
-        """Verify logs are squeezed at end of graceful shutdown."""
+        """Verify output is drained while stopping and squeezed at the end."""
         mocker.patch.object(node, "_interrupt")
         mocker.patch.object(node, "_terminate")
         mocker.patch.object(node, "_kill")
         mocker.patch.object(node, "_all_processes_are_dead", return_value=True)
+        mock_drain = mocker.patch.object(node, "_drain_logs")
         mock_squeeze = mocker.patch.object(node, "_squeeze_logs")
 
         node._handle_gracefully([], hard=True)
 
-        mock_squeeze.assert_called_once()
+        mock_drain.assert_called_once_with([])
+        mock_squeeze.assert_called_once_with(mock_drain.return_value)
+
+    def test_handle_gracefully_flushes_sink(self, node, mocker):
+        """Verify buffered log lines are flushed after squeezing logs."""
+        mocker.patch.object(node, "_interrupt")
+        mocker.patch.object(node, "_all_processes_are_dead", return_value=True)
+        mocker.patch.object(node, "_drain_logs")
+        mocker.patch.object(node, "_squeeze_logs")
+        mock_flush = mocker.patch.object(node.sink, "flush")
+
+        node._handle_gracefully([], hard=True)
+
+        mock_flush.assert_called_once()
+
+    def test_stop_closes_sink(self, node, mocker):
+        """Verify stop flushes and closes the log sink."""
+        mocker.patch.object(node, "_handle_gracefully")
+        mocker.patch("staker.node.exit")
+        node.sink.write("last line")
+
+        node.stop()
+
+        with open(node.logs_file) as f:
+            assert f.read() == "last line\n"
 
     def test_stop_sets_kill_in_progress(self, node, mocker):
         """Verify stop sets the kill_in_progress flag."""
@@ -295,6 +529,15 @@ class TestNodeGracefulShutdown:
 
         mock_handle.assert_called_once()
 
+    def test_stop_stops_metrics_server(self, node, mocker):
+        mocker.patch.object(node, "_handle_gracefully")
+        mocker.patch("staker.node.exit")
+        stop = mocker.patch.object(node.metrics_server, "stop")
+
+        node.stop()
+
+        stop.assert_called_once()
+
     def test_stop_creates_snapshot_if_draining(self, node, mocker):
         """Test draining logic creates snapshot."""
         mocker.patch.object(node, "_handle_gracefully")
@@ -328,6 +571,8 @@ class TestNodeRun:
     def node(self, mocker, tmp_path):
         mocker.patch("staker.node.DOCKER", False)
         mocker.patch("staker.node.DEV", True)
+        mocker.patch("staker.node.get_checkpoint", return_value="0xabc:1")
+        mocker.patch("staker.node.Booster.get_relays", return_value=[])
         logs_file = tmp_path / "logs.txt"
         env = MockEnvironment(logs_path=str(logs_file))
         return Node(env=env, snapshot=NoOpSnapshotManager())
@@ -337,6 +582,7 @@ class TestNodeRun:
         mocker.patch.object(node.snapshot, "backup")
         mocker.patch.object(node.booster, "get_relays", return_value=[])
         mock_start = mocker.patch.object(node, "_start", return_value=([], []))
+        mocker.patch.object(node, "_start_ready")
         mocker.patch("staker.node.select.select", side_effect=KeyboardInterrupt)
         mocker.patch.object(node, "_handle_gracefully")
 
@@ -355,6 +601,7 @@ class TestNodeRun:
         mocker.patch.object(node, "_consensus", return_value=MagicMock(stdout=MagicMock()))
         mocker.patch.object(node, "_validation", return_value=MagicMock(stdout=MagicMock()))
         mocker.patch.object(node, "_mev", return_value=MagicMock(stdout=MagicMock()))
+        node.startup = ready_startup()
 
         processes, streams = node._start()
 
@@ -377,16 +624,17 @@ class TestNodeRun:
         mocker.patch.object(node.snapshot, "backup", return_value={"SnapshotId": "old"})
         mocker.patch.object(node.booster, "get_relays", return_value=[])
         mocker.patch.object(node, "_start", return_value=([], []))
+        mocker.patch.object(node, "_start_ready")
 
         # Snapshot is old - triggers pause
-        mocker.patch.object(node.snapshot, "is_older_than", return_value=True)
+        mocker.patch.object(node.snapshot, "seconds_until_older_than", return_value=0.0)
         mock_interrupt = mocker.patch.object(node, "_interrupt")
 
         # select returns empty, then logs are processed, then a process dies
         mocker.patch("staker.node.select.select", side_effect=[([], [], [])])
         mocker.patch.object(node, "_stream_logs", return_value=[])
         mocker.patch.object(node, "_interrupt_on_error", return_value=False)
-        mocker.patch.object(node, "_any_process_is_dead", return_value=True)
+        mocker.patch.object(node, "_dead_processes", return_value=[{"name": "mev"}])
         mocker.patch.object(node, "_handle_gracefully", side_effect=KeyboardInterrupt)
 
         with pytest.raises(KeyboardInterrupt):
@@ -394,6 +642,53 @@ class TestNodeRun:
 
         mock_interrupt.assert_called_with(hard=False)
 
+    def test_run_waits_for_snapshot_deadline(self, node, mocker):
+        mocker.patch.object(node.snapshot, "backup", return_value={"SnapshotId": "new"})
+        mocker.patch.object(node, "_start", return_value=([], []))
+        mocker.patch.object(node, "_start_ready")
+        mock_remaining = mocker.patch.object(
+            node.snapshot, "seconds_until_older_than", return_value=3600.0
+        )
+        mock_interrupt = mocker.patch.object(node, "_interrupt")
+        mock_select = mocker.patch(
+            "staker.node.select.select", side_effect=[([], [], []), ([], [], []), KeyboardInterrupt]
+        )
+
+        with pytest.raises(KeyboardInterrupt):
+            node.run()
+
+        # The deadline is computed once per run, not on every wakeup
+        mock_remaining.assert_called_once_with({"SnapshotId": "new"}, SNAPSHOT_DAYS)
+        mock_interrupt.assert_not_called()
+        assert 3599 < node.snapshot_due - time.monotonic() <= 3600
+        assert "snapshot" not in node.planned
+        assert mock_select.call_count == 3
+
+    def test_select_timeout_waits_for_snapshot_deadline(self, node):
+        node.snapshot_due = time.monotonic() + 30
+
+        assert 29 < node._select_timeout([MagicMock()]) <= 30
+
+    def test_no_snapshot_deadline_without_snapshots(self, node):
+        node._set_snapshot_due()
+
+        assert node.snapshot_due is None
+
+    def test_run_defers_snapshot_pause_for_duties(self, node, mocker):
+        mocker.patch.object(node.snapshot, "backup", return_value={"SnapshotId": "old"})
+        mocker.patch.object(node, "_start", return_value=([], []))
+        mocker.patch.object(node, "_start_ready")
+        mocker.patch.object(node.snapshot, "seconds_until_older_than", return_value=0.0)
+        mocker.patch.object(node.duties, "delay", return_value=60.0)
+        mock_interrupt = mocker.patch.object(node, "_interrupt")
+        mocker.patch("staker.node.select.select", side_effect=[([], [], []), KeyboardInterrupt])
+
+        with pytest.raises(KeyboardInterrupt):
+            node.run()
+
+        mock_interrupt.assert_not_called()
+        assert 59 < node.planned["snapshot"] - time.monotonic() <= 60
+
 
 class TestNodeVPNWait:
     """Tests for VPN connection logic."""
@@ -516,6 +811,21 @@ class TestNodeClientProcesses:
         call_args = mock_run.call_args[0][0]
         assert any("checkpoint-sync-url" in arg for arg in call_args)
 
+    def test_consensus_uses_prefetched_checkpoint(self, node, mocker):
+        mocker.patch("staker.node.get_checkpoint", return_value="0xabc:1")
+        node._fetch_checkpoint()
+
+        assert "--weak-subjectivity-checkpoint=0xabc:1" in node._consensus_cmd()
+
+    def test_fetch_checkpoint_failure_is_not_fatal(self, node, mocker):
+        mocker.patch("staker.node.get_checkpoint", side_effect=ValueError("down"))
+        node.checkpoint = "stale"
+
+        node._fetch_checkpoint()
+
+        assert node.checkpoint is None
+        assert not any("weak-subjectivity" in arg for arg in node._consensus_cmd())
+
     def test_validation_includes_enable_builder(self, node, mocker):
         mock_run = mocker.patch.object(node, "_run_cmd", return_value=MagicMock())
         node._validation()
@@ -534,6 +844,24 @@ class TestNodeClientProcesses:
         relay_arg_idx = call_args.index("-relays") + 1
         assert "relay1" in call_args[relay_arg_idx]
 
+    def test_mev_derives_request_timeouts(self, node, mocker):
+        node.relays = ["http://relay1"]
+        timeouts = mocker.patch.object(
+            node.booster,
+            "request_timeouts",
+            return_value={"getHeader": 0.4504, "registerValidator": 3.0},
+        )
+
+        cmd = node._mev_cmd()
+
+        timeouts.assert_called_once_with(["http://relay1"])
+        assert cmd[-4:] == [
+            "-request-timeout-getheader",
+            "450",
+            "-request-timeout-regval",
+            "3000",
+        ]
+
 
 class TestNodeProductionMode:
     """Tests for production mode (DEV=False)."""
@@ -650,6 +978,7 @@ class TestNodeStart:
         mocker.patch.object(node, "_consensus", return_value=mock_proc)
         mocker.patch.object(node, "_validation", return_value=mock_proc)
         mocker.patch.object(node, "_mev", return_value=mock_proc)
+        node.startup = ready_startup()
 
         processes, streams = node._start()
 
@@ -663,6 +992,7 @@ class TestNodeStart:
         mocker.patch.object(node, "_consensus", return_value=mock_proc)
         mocker.patch.object(node, "_validation", return_value=mock_proc)
         mocker.patch.object(node, "_mev", return_value=mock_proc)
+        node.startup = ready_startup()
 
         processes, _ = node._start()
 
@@ -670,6 +1000,58 @@ class TestNodeStart:
         assert "<<< EXECUTION >>>" in prefixes
         assert "[[[ CONSENSUS ]]]" in prefixes
 
+    def test_start_defers_clients_until_ready(self, node, mocker):
+        mocker.patch.object(node, "_spawn", side_effect=lambda name: {"name": name, "reader": name})
+        beacon_ready = False
+        node.startup = ready_startup(consensus=lambda: beacon_ready)
+
+        processes, _ = node._start()
+        assert [meta["name"] for meta in processes] == ["execution", "validation", "mev"]
+
+        beacon_ready = True
+        node._start_ready()
+        assert [meta["name"] for meta in node.processes][-1] == "consensus"
+        assert node.streams[-1] == "consensus"
+        assert not node.startup.pending
+
+    def test_start_prepares_pipeline_when_missing(self, node, mocker):
+        mock_prepare = mocker.patch.object(node, "_prepare")
+
+        node._start()
+
+        mock_prepare.assert_called_once()
+
+    def test_start_ready_without_pipeline_is_noop(self, node, mocker):
+        mock_spawn = mocker.patch.object(node, "_spawn")
+
+        node._start_ready()
+
+        mock_spawn.assert_not_called()
+
+    def test_prepare_gates_clients_on_dependencies(self, node, mocker):
+        mocker.patch("staker.node.STARTUP_POLL_INTERVAL", 0)
+        mocker.patch.object(node.booster, "get_relays", return_value=["https://relay"])
+        mocker.patch("staker.node.get_checkpoint", return_value="0xabc:1")
+        mock_ipc = mocker.patch("staker.node.ipc_is_ready", return_value=False)
+        mocker.patch("staker.node.http_is_ready", return_value=True)
+        startup = node._prepare()
+
+        released = []
+        while "mev" not in released or not mock_ipc.called:
+            released += startup.ready()
+        # Beacon REST answering is not enough while the beacon chain is held back
+        assert released == ["execution", "mev"]
+        mock_ipc.assert_called_with(node.ipc_path)
+
+        mock_ipc.return_value = True
+        while startup.pending:
+            released += startup.ready()
+        assert released == ["execution", "mev", "consensus", "validation"]
+        assert node.relays == ["https://relay"]
+        assert node.checkpoint == "0xabc:1"
+        assert {"relays", "checkpoint", "execution", "validation"} <= startup.durations.keys()
+        startup.close()
+
 
 class TestNodeStreamLogs:
     """Tests for log streaming."""
@@ -682,30 +1064,597 @@ class TestNodeStreamLogs:
         env = MockEnvironment(logs_path=str(logs_file))
         return Node(env=env, snapshot=NoOpSnapshotManager())
 
-    def test_stream_logs_processes_multiple_streams(self, node, mocker):
-        mock_stream1 = MagicMock()
-        mock_stream1.prefix = "PRE1"
-        mock_stream1.readline.return_value = b"log1\n"
-
-        mock_stream2 = MagicMock()
-        mock_stream2.prefix = "PRE2"
-        mock_stream2.readline.return_value = b"log2\n"
+    def test_stream_logs_processes_multiple_streams(self, node):
+        read1, write1 = os.pipe()
+        read2, write2 = os.pipe()
+        os.write(write1, b"log1\n")
+        os.write(write2, b"log2\n")
+        reader1 = LineReader(os.fdopen(read1, "rb"), "PRE1")
+        reader2 = LineReader(os.fdopen(read2, "rb"), "PRE2")
 
-        result = node._stream_logs([mock_stream1, mock_stream2])
+        result = node._stream_logs([reader1, reader2])
 
         assert len(result) == 2
         assert "PRE1 log1" in result
         assert "PRE2 log2" in result
+        for fd in (write1, write2):
+            os.close(fd)
+
+    def test_stream_logs_returns_all_lines_in_chunk(self, node, pipe):
+        stream, write_fd = pipe
+        os.write(write_fd, b"a\nb\nc\npartial")
+        reader = LineReader(stream, "PRE")
+
+        result = node._stream_logs([reader])
+
+        assert result == ["PRE a", "PRE b", "PRE c"]
+
+    def test_squeeze_logs_drains_all_output(self, node, pipe, mocker):
+        stream, write_fd = pipe
+        os.write(write_fd, b"line1\nline2\nlast")
+        os.close(write_fd)
+        reader = LineReader(stream, "TEST")
+        mock_print = mocker.patch.object(node, "_print_line")
+
+        node._squeeze_logs(node._drain_logs([{"process": MagicMock(), "reader": reader}]))
+
+        lines = [bytes(call.args[1]) for call in mock_print.call_args_list]
+        assert lines == [b"line1", b"line2", b"last"]
+        assert reader.eof
+
+    def test_drain_logs_keeps_running_processes_flowing(self, node, pipe, mocker):
+        stream, write_fd = pipe
+        read_other, write_other = os.pipe()
+        os.write(write_other, b"still running\n")
+        os.write(write_fd, b"stopping\n")
+        os.close(write_fd)
+        stopping = {"process": MagicMock(), "reader": LineReader(stream, "STOP")}
+        mock_print = mocker.patch.object(node, "_print_line")
+
+        with os.fdopen(read_other, "rb") as other:
+            running = {"process": MagicMock(), "reader": LineReader(other, "RUN")}
+            node.processes = [stopping, running]
+            node._squeeze_logs(node._drain_logs([stopping]))
+
+        printed = {(call.args[0], bytes(call.args[1])) for call in mock_print.call_args_list}
+        assert printed == {("STOP", b"stopping"), ("RUN", b"still running")}
+        assert not running["reader"].eof
+        os.close(write_other)
+
+    def test_squeeze_logs_gives_up_at_deadline(self, node, pipe, mocker, capsys):
+        # The write end stays open, as if a grandchild still held the pipe
+        stream, write_fd = pipe
+        os.write(write_fd, b"line1\n")
+        mocker.patch("staker.node.LOG_DRAIN_TIMEOUT", 0.2)
+        mock_print = mocker.patch.object(node, "_print_line")
+
+        node._squeeze_logs(
+            node._drain_logs([{"process": MagicMock(), "reader": LineReader(stream, "TEST")}])
+        )
 
-    def test_squeeze_logs_drains_all_output(self, node, mocker):
-        mock_stream = MagicMock()
-        mock_stream.prefix = "TEST"
-        mock_stream.readline.side_effect = [b"line1\n", b"line2\n", b""]
+        assert [bytes(call.args[1]) for call in mock_print.call_args_list] == [b"line1"]
+        assert "Gave up on remaining output" in capsys.readouterr().out
 
-        mock_proc = MagicMock()
-        mock_proc.stdout = mock_stream
 
-        node._squeeze_logs([{"process": mock_proc}])
+class TestNodeRestarts:
+    """Tests for per-process restart policies."""
+
+    @pytest.fixture
+    def node(self, mocker, tmp_path):
+        mocker.patch("staker.node.DOCKER", False)
+        mocker.patch("staker.node.DEV", True)
+        mocker.patch("staker.node.get_checkpoint", return_value="0xabc:1")
+        mocker.patch("staker.node.Booster.get_relays", return_value=[])
+        logs_file = tmp_path / "logs.txt"
+        env = MockEnvironment(logs_path=str(logs_file))
+        node = Node(env=env, snapshot=NoOpSnapshotManager())
+        node.processes = [
+            self.meta(name) for name in ("execution", "consensus", "validation", "mev")
+        ]
+        mocker.patch.object(node, "_drain_logs")
+        mocker.patch.object(node, "_squeeze_logs")
+        return node
+
+    def meta(self, name, alive=True):
+        process = MagicMock()
+        process.poll.return_value = None if alive else 1
+        return {"name": name, "process": process, "prefix": name.upper()}
+
+    def test_spawn_builds_named_meta(self, node, mocker):
+        process = MagicMock()
+        mocker.patch.object(node, "_mev", return_value=process)
+
+        meta = node._spawn("mev")
+
+        assert meta["name"] == "mev"
+        assert meta["process"] is process
+        assert meta["reader"].prefix == "+++ MEV_BOOST +++"
+
+    def test_spawn_counts_restarts(self, node, mocker):
+        mocker.patch.object(node, "_mev", return_value=MagicMock())
+
+        node._spawn("mev")
+        node._spawn("mev")
+
+        assert node.metrics.restarts[node.metrics.names.index("mev")] == 1
+
+    def test_dead_processes_returns_only_dead(self, node):
+        node.processes[3] = self.meta("mev", alive=False)
+        assert node._dead_processes(node.processes) == [node.processes[3]]
+
+    def test_recover_restarts_alone(self, node, mocker):
+        mock_handle = mocker.patch.object(node, "_handle_gracefully")
+        dead = self.meta("mev", alive=False)
+        node.processes[3] = dead
+
+        assert node._recover([dead]) is True
+
+        assert list(node.pending_restarts) == ["mev"]
+        mock_handle.assert_not_called()
+
+    def test_recover_dumps_incident(self, node, tmp_path):
+        node._print_line(PREFIXES["mev"], b"level=fatal msg=boom\n")
+        dead = self.meta("mev", alive=False)
+        node.processes[3] = dead
+
+        node._recover([dead])
+
+        (incident,) = (tmp_path / "incidents").glob("*-mev.log")
+        header, line = incident.read_text().splitlines()
+        assert header == "# mev: exited with code 1"
+        assert line.endswith(" level=fatal msg=boom")
+
+    def test_recover_stops_running_dependents(self, node, mocker):
+        mock_handle = mocker.patch.object(node, "_handle_gracefully")
+        dead = self.meta("execution", alive=False)
+        node.processes[0] = dead
+
+        assert node._recover([dead]) is True
+
+        assert set(node.pending_restarts) == {"execution", "consensus", "validation"}
+        stopped = mock_handle.call_args[0][0]
+        assert [meta["name"] for meta in stopped] == ["consensus", "validation"]
+
+    def test_recover_leaves_gated_dependents_to_startup(self, node, mocker):
+        mock_handle = mocker.patch.object(node, "_handle_gracefully")
+        # Validation is still waiting on its startup gate
+        node.processes = [self.meta("execution", alive=False), self.meta("consensus")]
+
+        assert node._recover([node.processes[0]]) is True
+
+        assert set(node.pending_restarts) == {"execution", "consensus"}
+        stopped = mock_handle.call_args[0][0]
+        assert [meta["name"] for meta in stopped] == ["consensus"]
+
+    def test_recover_skips_pending_processes(self, node):
+        node.pending_restarts = {"mev": 123.0}
+        dead = self.meta("mev", alive=False)
+
+        assert node._recover([dead]) is True
+        assert node.pending_restarts == {"mev": 123.0}
+
+    def test_recover_requests_full_restart_for_restart_all(self, node, mocker):
+        mocker.patch.dict("staker.restarts.RESTART_POLICIES", {"mev": "restart-all"})
+
+        assert node._recover([self.meta("mev", alive=False)]) is False
+        assert node.pending_restarts == {}
+
+    def test_recover_backs_off_exponentially(self, node, mocker):
+        mocker.patch("staker.node.monotonic", return_value=100.0)
+        node.crashes = CrashTracker(backoff=2, threshold=10)
+        dead = self.meta("mev", alive=False)
+        node.processes[3] = dead
+
+        node._recover([dead])
+        assert node.pending_restarts["mev"] == 102.0
+        node.pending_restarts.clear()
+        node._recover([dead])
+        assert node.pending_restarts["mev"] == 104.0
+
+    def test_recover_escalates_crash_loop(self, node, mocker):
+        node.crashes = CrashTracker(threshold=1)
+        mock_escalate = mocker.patch.object(node, "_escalate")
+
+        assert node._recover([self.meta("mev", alive=False)]) is False
+        mock_escalate.assert_called_once_with("mev")
+
+    def test_escalate_terminates_instance_on_aws(self, node, mocker):
+        mocker.patch.object(node.env, "should_manage_snapshots", return_value=True)
+        mock_terminate = mocker.patch.object(node.snapshot, "terminate")
+
+        node._escalate("execution")
+
+        assert node.terminating is True
+        mock_terminate.assert_called_once()
+
+    def test_escalate_only_restarts_locally(self, node, mocker):
+        mock_terminate = mocker.patch.object(node.snapshot, "terminate")
+
+        node._escalate("execution")
+
+        assert node.terminating is False
+        mock_terminate.assert_not_called()
+
+    def test_escalate_starts_a_fresh_crash_count(self, node):
+        node.crashes = CrashTracker(threshold=2)
+        node.crashes.record("execution")
+        node.crashes.record("execution")
+
+        node._escalate("execution")
+
+        assert node.crashes.count("execution") == 0
+
+    def test_check_execution_stops_stalled_geth(self, node, mocker):
+        mocker.patch.object(node.chain, "stalled", return_value=True)
+        node.beacon.synced_since = 0.0
+        node.chain.status = ChainStatus(100, 100, False, 5, 0)
+        mock_handle = mocker.patch.object(node, "_handle_gracefully")
+
+        node._check_execution()
+
+        mock_handle.assert_called_once_with([node.processes[0]], hard=False)
+        assert node.chain.status is None
+
+    def test_check_execution_waits_for_the_beacon_node(self, node, mocker):
+        mocker.patch("staker.rpc.monotonic", return_value=1000.0)
+        node.chain._head_changed_at = 0.0
+        node.chain.status = ChainStatus(100, 100, False, 5, 0)
+        mock_handle = mocker.patch.object(node, "_handle_gracefully")
+
+        # Beacon node down or syncing: geth has nothing to import
+        node._check_execution()
+        # In sync for less than the stall time
+        node.beacon.synced_since = 900.0
+        node._check_execution()
+        mock_handle.assert_not_called()
+
+        node.beacon.synced_since = 400.0
+        node._check_execution()
+        mock_handle.assert_called_once_with([node.processes[0]], hard=False)
+
+    def test_check_execution_ignores_healthy_or_pending_geth(self, node, mocker):
+        node.beacon.synced_since = 0.0
+        stalled = mocker.patch.object(node.chain, "stalled", return_value=False)
+        mock_handle = mocker.patch.object(node, "_handle_gracefully")
+        node._check_execution()
+
+        stalled.return_value = True
+        node.pending_restarts = {"execution": 5.0}
+        node._check_execution()
+
+        node.pending_restarts = {}
+        node.processes[0] = self.meta("execution", alive=False)
+        node._check_execution()
+
+        mock_handle.assert_not_called()
+
+    def test_restart_due_respawns_in_place(self, node, mocker):
+        mocker.patch("staker.node.monotonic", return_value=10.0)
+        new_meta = {"name": "mev", "process": MagicMock()}
+        mock_spawn = mocker.patch.object(node, "_spawn", return_value=new_meta)
+        mock_handle = mocker.patch.object(node, "_handle_gracefully")
+        node.processes[3] = self.meta("mev", alive=False)
+        node.pending_restarts = {"mev": 5.0, "validation": 20.0}
+
+        node._restart_due()
+
+        mock_spawn.assert_called_once_with("mev")
+        mock_handle.assert_not_called()
+        assert node.processes[3] is new_meta
+        assert node.pending_restarts == {"validation": 20.0}
+
+    def test_restart_due_stops_running_process_first(self, node, mocker):
+        mocker.patch("staker.node.monotonic", return_value=10.0)
+        calls = []
+        mocker.patch.object(
+            node, "_handle_gracefully", side_effect=lambda *_, **__: calls.append("stop")
+        )
+        mocker.patch.object(node, "_spawn", side_effect=lambda _: calls.append("spawn"))
+        running = node.processes[3]
+        node.pending_restarts = {"mev": 5.0}
+
+        node._restart_due()
+
+        node._handle_gracefully.assert_called_once_with([running], hard=False)
+        assert calls == ["stop", "spawn"]
+
+    def test_select_timeout_waits_for_next_restart(self, node, mocker):
+        mocker.patch("staker.node.monotonic", return_value=10.0)
+        node.pending_restarts = {"mev": 12.5, "validation": 15.0}
+        assert node._select_timeout([MagicMock()]) == 2.5
+
+    def test_select_timeout_blocks_without_pending_restarts(self, node):
+        assert node._select_timeout([MagicMock()]) is None
+        assert node._select_timeout([]) == 1
+
+    def test_run_recovers_without_full_restart(self, node, mocker):
+        mocker.patch.object(node.booster, "get_relays", return_value=[])
+        mocker.patch.object(node, "_start")
+        mocker.patch.object(node, "_start_ready")
+        mocker.patch("staker.node.select.select", side_effect=[([], [], []), KeyboardInterrupt])
+        mocker.patch.object(node, "_dead_processes", return_value=[self.meta("mev", alive=False)])
+        mock_recover = mocker.patch.object(node, "_recover", return_value=True)
+        mock_restart_due = mocker.patch.object(node, "_restart_due")
+        mock_handle = mocker.patch.object(node, "_handle_gracefully")
+        for meta in node.processes:
+            meta["reader"] = MagicMock(eof=False)
+
+        with pytest.raises(KeyboardInterrupt):
+            node.run()
+
+        mock_recover.assert_called_once()
+        mock_restart_due.assert_called_once()
+        mock_handle.assert_not_called()
+
+    def test_run_returns_once_stop_is_requested(self, node, mocker):
+        mocker.patch.object(node, "_start")
+        mocker.patch.object(node, "_start_ready")
+        mock_handle = mocker.patch.object(node, "_handle_gracefully")
+        for meta in node.processes:
+            meta["reader"] = MagicMock(eof=False)
+
+        def select(rlist, *_):
+            # The signal arrives while select blocks
+            node.request_stop(signal.SIGTERM, None)
+            return [node._wake_read], [], []
+
+        mocker.patch("staker.node.select.select", side_effect=select)
+
+        node.run()
+
+        assert node.stop_requested is True
+        # stop() takes the processes down, outside the signal handler
+        mock_handle.assert_not_called()
+
+    def test_run_restarts_everything_after_error_interrupt(self, node, mocker):
+        mocker.patch.object(node.booster, "get_relays", return_value=[])
+        mocker.patch.object(node, "_start")
+        mocker.patch.object(node, "_start_ready")
+        mocker.patch("staker.node.select.select", return_value=([], [], []))
+        mocker.patch.object(node, "_interrupt_on_error", return_value=True)
+        mocker.patch.object(node, "_dead_processes", return_value=[self.meta("mev", alive=False)])
+        mock_recover = mocker.patch.object(node, "_recover")
+        mocker.patch.object(node, "_handle_gracefully", side_effect=KeyboardInterrupt)
+        for meta in node.processes:
+            meta["reader"] = MagicMock(eof=False)
+
+        with pytest.raises(KeyboardInterrupt):
+            node.run()
+
+        mock_recover.assert_not_called()
+
+    def test_run_backs_off_between_crash_driven_stack_restarts(self, node, mocker):
+        mocker.patch.object(node, "_start")
+        mocker.patch.object(node, "_start_ready")
+        mocker.patch.object(node, "_dead_processes", return_value=[self.meta("vpn", False)])
+        mocker.patch.object(node, "_handle_gracefully")
+        mock_pause = mocker.patch.object(node, "_pause", side_effect=[None, KeyboardInterrupt])
+        mocker.patch("staker.node.select.select", return_value=([], [], []))
+        node.crashes = CrashTracker(backoff=2, threshold=10)
+        for meta in node.processes:
+            meta["reader"] = MagicMock(eof=False)
+
+        with pytest.raises(KeyboardInterrupt):
+            node.run()
+
+        assert [call.args[0] for call in mock_pause.call_args_list] == [2, 4]
+
+    def test_run_starts_gated_clients_and_closes_pipeline(self, node, mocker):
+        mocker.patch.object(node.booster, "get_relays", return_value=[])
+        mocker.patch.object(node, "_start")
+        mocker.patch("staker.node.select.select", return_value=([], [], []))
+        mocker.patch.object(node, "_dead_processes", side_effect=[[], [self.meta("vpn", False)]])
+        mock_start_ready = mocker.patch.object(node, "_start_ready")
+        mock_close = mocker.spy(StartupPipeline, "close")
+        mocker.patch.object(node, "_handle_gracefully", side_effect=KeyboardInterrupt)
+        for meta in node.processes:
+            meta["reader"] = MagicMock(eof=False)
+
+        with pytest.raises(KeyboardInterrupt):
+            node.run()
+
+        mock_start_ready.assert_called_once()
+        mock_close.assert_called_once()
+        assert "backup" in node.startup.durations
+
+    def test_relay_update_plans_mev_restart(self, node, mocker):
+        mocker.patch.object(node.monitor, "take_update", return_value=["https://new.relay"])
+        mocker.patch("staker.node.monotonic", return_value=5.0)
+        mocker.patch.object(node.duties, "delay", return_value=30.0)
+
+        node._apply_relay_update()
+
+        assert node.relays == ["https://new.relay"]
+        assert node.planned == {"mev": 35.0}
+        assert node.pending_restarts == {}
+
+    def test_restart_mev_restarts_only_mev(self, node, mocker):
+        mocker.patch("staker.node.monotonic", return_value=5.0)
+        mock_handle = mocker.patch.object(node, "_handle_gracefully")
+
+        node._restart_mev()
+
+        assert node.pending_restarts == {"mev": 5.0}
+        mock_handle.assert_called_once_with([node.processes[3]], hard=False)
+
+    def test_restart_mev_before_mev_starts_is_noop(self, node, mocker):
+        node.processes = node.processes[:3]
+
+        node._restart_mev()
+
+        assert node.pending_restarts == {}
+
+    def test_planned_due_takes_due_entries(self, node, mocker):
+        mocker.patch("staker.node.monotonic", return_value=10.0)
+        node.planned = {"mev": 5.0, "snapshot": 20.0}
+
+        assert node._planned_due("mev") is True
+        assert node._planned_due("snapshot") is False
+        assert node._planned_due("other") is False
+        assert node.planned == {"snapshot": 20.0}
+
+    def test_select_timeout_waits_for_planned_interruption(self, node, mocker):
+        mocker.patch("staker.node.monotonic", return_value=10.0)
+        node.startup = None
+        node.planned = {"snapshot": 25.0}
+
+        assert node._select_timeout([MagicMock()]) == 15.0
+
+    def test_relay_update_without_change_is_noop(self, node, mocker):
+        mocker.patch.object(node.monitor, "take_update", return_value=None)
+        node.relays = ["https://old.relay"]
+
+        node._apply_relay_update()
+
+        assert node.relays == ["https://old.relay"]
+
+    def test_refresh_relays_resets_monitor(self, node, mocker):
+        mock_reset = mocker.patch.object(node.monitor, "reset")
+
+        node._refresh_relays()
+
+        mock_reset.assert_called_once_with([])
+
+    def test_run_applies_relay_updates_from_monitor(self, node, mocker):
+        mocker.patch.object(node, "_start")
+        mocker.patch.object(node, "_start_ready")
+        mocker.patch.object(node.monitor, "start")
+        mocker.patch.object(node.metrics_server, "start")
+        node.metrics_server.port = 9100
+        mocker.patch(
+            "staker.node.select.select",
+            side_effect=[([node.monitor], [], []), KeyboardInterrupt],
+        )
+        mock_apply = mocker.patch.object(node, "_apply_relay_update")
+        mock_stream = mocker.patch.object(node, "_stream_logs", return_value=[])
+        for meta in node.processes:
+            meta["reader"] = MagicMock(eof=False)
+
+        with pytest.raises(KeyboardInterrupt):
+            node.run()
+
+        node.monitor.start.assert_called_once()
+        node.metrics_server.start.assert_called_once()
+        mock_apply.assert_called_once()
+        mock_stream.assert_called_once_with([])
+
+    def test_run_restarts_mev_once_planned(self, node, mocker):
+        mocker.patch.object(node, "_start")
+        mocker.patch.object(node, "_start_ready")
+        mocker.patch.object(node.monitor, "take_update", return_value=["https://new.relay"])
+        mocker.patch(
+            "staker.node.select.select",
+            side_effect=[([node.monitor], [], []), KeyboardInterrupt],
+        )
+        mocker.patch.object(node, "_stream_logs", return_value=[])
+        mock_restart = mocker.patch.object(node, "_restart_mev")
+        for meta in node.processes:
+            meta["reader"] = MagicMock(eof=False)
+
+        with pytest.raises(KeyboardInterrupt):
+            node.run()
+
+        mock_restart.assert_called_once()
+        assert node.planned == {}
+
+    def test_handle_gracefully_signals_only_given_processes(self, node, mocker):
+        mocker.patch.object(node, "_wait_for_exit", return_value=True)
+        mock_kill = mocker.patch("os.kill")
+        subset = node.processes[1:3]
+
+        node._handle_gracefully(subset, hard=False)
+
+        # Validation stops before the beacon node it depends on
+        pids = [call.args[0] for call in mock_kill.call_args_list]
+        assert pids == [subset[1]["process"].pid, subset[0]["process"].pid]
+
+    def test_handle_gracefully_stops_in_dependency_order(self, node, mocker):
+        node.processes.insert(0, self.meta("vpn"))
+        mocker.patch.object(node, "_wait_for_exit", return_value=True)
+        mock_interrupt = mocker.patch.object(node, "_interrupt")
+
+        node._handle_gracefully(node.processes, hard=False)
+
+        stopped = [call.kwargs["processes"][0]["name"] for call in mock_interrupt.call_args_list]
+        assert stopped == ["validation", "mev", "consensus", "execution", "vpn"]
+        assert list(node.shutdown_durations) == stopped
+
+    def test_handle_gracefully_escalates_per_process(self, node, mocker):
+        mocker.patch("staker.restarts.SHUTDOWN_BUDGETS", {"execution": 7})
+        # Only geth ignores SIGINT and SIGTERM
+        mock_wait = mocker.patch.object(
+            node, "_wait_for_exit", side_effect=lambda meta, _: meta["name"] != "execution"
+        )
+        mock_terminate = mocker.patch.object(node, "_terminate")
+        mock_kill = mocker.patch.object(node, "_kill")
+        execution = node.processes[0]
+
+        node._handle_gracefully(node.processes, hard=False)
+
+        mock_terminate.assert_called_once_with(hard=False, processes=[execution])
+        mock_kill.assert_called_once_with(hard=False, processes=[execution])
+        assert mock_wait.call_args_list[-1].args == (execution, 7)
+
+    def test_handle_gracefully_skips_exited_processes(self, node, mocker):
+        node.processes[3] = self.meta("mev", alive=False)
+        mocker.patch.object(node, "_wait_for_exit", return_value=True)
+        mock_interrupt = mocker.patch.object(node, "_interrupt")
+
+        node._handle_gracefully(node.processes, hard=False)
+
+        assert "mev" not in node.shutdown_durations
+        assert mock_interrupt.call_count == 3
+
+    def test_wait_for_exit_returns_when_process_exits(self, node):
+        process = subprocess.Popen([sys.executable, "-c", "import time; time.sleep(0.2)"])
+
+        started = time.monotonic()
+        assert node._wait_for_exit({"process": process}, 10) is True
+        assert time.monotonic() - started < 5
+
+    def test_wait_for_exit_times_out(self, node):
+        process = subprocess.Popen([sys.executable, "-c", "import time; time.sleep(60)"])
+        try:
+            assert node._wait_for_exit({"process": process}, 0.1) is False
+        finally:
+            process.kill()
+            process.wait()
+
+    def test_wait_for_exit_without_pidfd(self, node, mocker):
+        mocker.patch("staker.node.os.pidfd_open", side_effect=AttributeError, create=True)
+        process = subprocess.Popen([sys.executable, "-c", "pass"])
+
+        assert node._wait_for_exit({"process": process}, 10) is True
+
+
+class TestMain:
+    """Tests for engine selection in main."""
+
+    @pytest.fixture(autouse=True)
+    def deps(self, mocker):
+        mocker.patch("staker.node.AWS", False)
+        mocker.patch("staker.node.Node")
+        mocker.patch("staker.node.signal.signal")
+
+    def test_main_runs_select_loop_by_default(self, mocker):
+        mocker.patch("staker.node.ASYNC_ENGINE", False)
+        mock_asyncio_run = mocker.patch("staker.node.asyncio.run")
+
+        main()
+
+        node = staker.node.Node.return_value
+        node.run.assert_called_once()
+        node.stop.assert_called_once()
+        mock_asyncio_run.assert_not_called()
+        staker.node.signal.signal.assert_any_call(signal.SIGTERM, node.request_stop)
+
+    def test_main_runs_async_supervisor_when_flagged(self, mocker):
+        mocker.patch("staker.node.ASYNC_ENGINE", True)
+        mock_supervisor = mocker.patch("staker.node.AsyncSupervisor")
+        mock_asyncio_run = mocker.patch("staker.node.asyncio.run")
+
+        main()
 
-        # Verify readline was called until empty
-        assert mock_stream.readline.call_count == 3
+        mock_supervisor.assert_called_once_with(staker.node.Node.return_value)
+        mock_asyncio_run.assert_called_once_with(mock_supervisor.return_value.run.return_value)
+        staker.node.Node.return_value.run.assert_not_called()
@@ -0,0 +1,75 @@
+"""Tests for parsing client log lines into structured records."""
+
+import json
+
+from staker.records import Record, parse_record, split_message
+
+
+class TestSplitMessage:
+    """Tests for separating the message from trailing fields."""
+
+    def test_message_and_fields(self):
+        assert split_message('Imported segment    number=1 elapsed="1.5 ms"') == (
+            "Imported segment",
+            {"number": "1", "elapsed": "1.5 ms"},
+        )
+
+    def test_without_fields(self):
+        assert split_message("Starting peer-to-peer node  ") == ("Starting peer-to-peer node", {})
+
+    def test_equals_sign_inside_a_word_is_message(self):
+        assert split_message("Set (a=b) mode  on=true") == ("Set (a=b) mode", {"on": "true"})
+
+
+class TestParseRecord:
+    """Tests for the client log formats."""
+
+    def test_geth_terminal_format(self):
+        line = 'WARN [10-18|12:00:00.123] Served eth_call   reqid=3 err="execution reverted"'
+
+        record = parse_record("execution", line, 100.0)
+
+        assert record == Record(
+            100.0,
+            "execution",
+            "warn",
+            "Served eth_call",
+            {"reqid": "3", "err": "execution reverted"},
+        )
+
+    def test_prysm_prefixed_format(self):
+        line = "[2026-10-18 12:00:00.00]  INFO blockchain: Synced new block slot=5 epoch=0"
+
+        record = parse_record("consensus", line, 0.0)
+
+        assert record.level == "info"
+        assert record.msg == "Synced new block"
+        assert record.fields == {"prefix": "blockchain", "slot": "5", "epoch": "0"}
+
+    def test_logfmt_format(self):
+        line = 'time="2026-10-18T12:00:00Z" level=warning msg="bid late" method=getHeader'
+
+        record = parse_record("mev", line, 0.0)
+
+        assert record.level == "warning"
+        assert record.msg == "bid late"
+        assert record.fields == {"method": "getHeader"}
+
+    def test_unrecognized_line_keeps_text(self):
+        record = parse_record("vpn", "Initialization Sequence Completed", 0.0)
+
+        assert record.level is None
+        assert record.msg == "Initialization Sequence Completed"
+        assert record.fields == {}
+
+    def test_to_json_is_compact(self):
+        record = Record(1.23456, "mev", "info", "ok", {"slot": "1"})
+
+        assert record.to_json() == (
+            '{"ts":1.235,"src":"mev","level":"info","msg":"ok","fields":{"slot":"1"}}'
+        )
+        assert json.loads(Record(0.0, "vpn", None, "up", {}).to_json()) == {
+            "ts": 0.0,
+            "src": "vpn",
+            "msg": "up",
+        }
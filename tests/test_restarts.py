@@ -0,0 +1,107 @@
+"""Tests for per-process restart policies."""
+
+import pytest
+
+from staker.restarts import (
+    CrashTracker,
+    RestartPolicy,
+    get_policy,
+    get_restart_group,
+    get_shutdown_budget,
+    get_shutdown_order,
+)
+
+
+class TestPolicies:
+    """Tests for policy and restart group lookup."""
+
+    def test_get_policy_reads_config(self, mocker):
+        mocker.patch.dict("staker.restarts.RESTART_POLICIES", {"mev": "restart-alone"})
+        assert get_policy("mev") is RestartPolicy.ALONE
+
+    def test_get_policy_defaults_to_all(self):
+        assert get_policy("unknown") is RestartPolicy.ALL
+
+    def test_get_policy_rejects_unknown_policy(self, mocker):
+        mocker.patch.dict("staker.restarts.RESTART_POLICIES", {"mev": "restart-never"})
+        with pytest.raises(ValueError):
+            get_policy("mev")
+
+    def test_restart_group_includes_transitive_dependents(self):
+        assert get_restart_group("execution") == ["execution", "consensus", "validation"]
+
+    def test_restart_group_without_dependents(self):
+        assert get_restart_group("mev") == ["mev"]
+
+
+class TestShutdown:
+    """Tests for shutdown ordering and budgets."""
+
+    def test_dependents_stop_first_and_vpn_last(self):
+        names = ["vpn", "execution", "consensus", "validation", "mev"]
+        ordered = get_shutdown_order([{"name": name} for name in names])
+        assert [meta["name"] for meta in ordered] == [
+            "validation",
+            "mev",
+            "consensus",
+            "execution",
+            "vpn",
+        ]
+
+    def test_unknown_processes_stop_last(self):
+        ordered = get_shutdown_order([{"name": "other"}, {}, {"name": "mev"}])
+        assert ordered == [{"name": "mev"}, {"name": "other"}, {}]
+
+    def test_budget_defaults_to_kill_time(self, mocker):
+        mocker.patch("staker.restarts.SHUTDOWN_BUDGETS", {"execution": 90})
+        assert get_shutdown_budget("execution") == 90
+        assert get_shutdown_budget("mev") == 30
+
+
+class TestCrashTracker:
+    """Tests for CrashTracker backoff and crash-loop detection."""
+
+    def test_backoff_doubles_per_crash(self):
+        tracker = CrashTracker(backoff=1, max_backoff=60, window=600)
+        delays = [tracker.record("mev", now=float(t)) for t in range(4)]
+        assert delays == [1, 2, 4, 8]
+
+    def test_backoff_is_capped(self):
+        tracker = CrashTracker(backoff=1, max_backoff=5, threshold=100, window=600)
+        delays = [tracker.record("mev", now=float(t)) for t in range(5)]
+        assert delays[-1] == 5
+
+    def test_old_crashes_leave_the_window(self):
+        tracker = CrashTracker(backoff=1, window=10)
+        tracker.record("mev", now=0.0)
+        tracker.record("mev", now=1.0)
+
+        assert tracker.record("mev", now=20.0) == 1
+        assert tracker.count("mev") == 1
+
+    def test_crash_loop_at_threshold(self):
+        tracker = CrashTracker(threshold=3, window=600)
+        tracker.record("geth", now=0.0)
+        tracker.record("geth", now=1.0)
+        assert tracker.is_crash_looping("geth") is False
+
+        tracker.record("geth", now=2.0)
+        assert tracker.is_crash_looping("geth") is True
+
+    def test_reset_forgets_crashes(self):
+        tracker = CrashTracker(backoff=1, threshold=2)
+        tracker.record("geth", now=0.0)
+        tracker.record("geth", now=1.0)
+
+        tracker.reset("geth")
+
+        assert tracker.is_crash_looping("geth") is False
+        assert tracker.record("geth", now=2.0) == 1
+
+    def test_crashes_are_tracked_per_process(self):
+        tracker = CrashTracker(threshold=2)
+        tracker.record("mev")
+        tracker.record("geth")
+
+        assert tracker.count("mev") == 1
+        assert tracker.is_crash_looping("mev") is False
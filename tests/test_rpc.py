@@ -0,0 +1,237 @@
+"""Tests for the geth IPC JSON-RPC client."""
+
+import json
+import socket
+import threading
+
+import pytest
+
+from staker.rpc import (
+    STATUS_CALLS,
+    ChainStatus,
+    ExecutionMonitor,
+    IpcClient,
+    RpcError,
+    parse_status,
+)
+
+
+class FakeGeth:
+    """Answers newline-delimited JSON-RPC requests on a Unix socket like geth.ipc.
+
+    ``results`` maps methods to results; unknown methods get an error. Every
+    accepted connection and received batch is counted.
+    """
+
+    def __init__(self, path):
+        self.path = path
+        self.results = {}
+        self.connections = 0
+        self.batches = []
+        self.drop_next = False
+        self._server = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+        self._server.bind(path)
+        self._server.listen()
+        threading.Thread(target=self._accept, daemon=True).start()
+
+    def _accept(self):
+        while True:
+            try:
+                conn, _ = self._server.accept()
+            except OSError:
+                return
+            self.connections += 1
+            threading.Thread(target=self._serve, args=(conn,), daemon=True).start()
+
+    def _serve(self, conn):
+        with conn, conn.makefile("rb") as lines:
+            for line in lines:
+                if self.drop_next:
+                    self.drop_next = False
+                    return
+                requests = json.loads(line)
+                self.batches.append(requests)
+                responses = [self._answer(request) for request in requests]
+                # Split the response to exercise reassembly
+                data = json.dumps(responses[::-1]).encode() + b"\n"
+                conn.sendall(data[:5])
+                conn.sendall(data[5:])
+
+    def _answer(self, request):
+        response = {"jsonrpc": "2.0", "id": request["id"]}
+        if request["method"] in self.results:
+            response["result"] = self.results[request["method"]]
+        else:
+            response["error"] = {"code": -32601, "message": "method not found"}
+        return response
+
+    def close(self):
+        if self._server.fileno() != -1:
+            # Wakes the blocked accept so the socket stops listening
+            self._server.shutdown(socket.SHUT_RDWR)
+            self._server.close()
+
+
+@pytest.fixture
+def geth(tmp_path):
+    server = FakeGeth(str(tmp_path / "geth.ipc"))
+    server.results = {
+        "eth_syncing": False,
+        "net_peerCount": "0x19",
+        "eth_blockNumber": "0x10",
+        "admin_peers": [{"network": {"inbound": True}}, {"network": {"inbound": False}}],
+    }
+    yield server
+    server.close()
+
+
+class TestIpcClient:
+    """Tests for batching and the persistent connection."""
+
+    def test_call(self, geth):
+        client = IpcClient(geth.path)
+        assert client.call("eth_blockNumber") == "0x10"
+        client.close()
+
+    def test_call_raises_on_error(self, geth):
+        client = IpcClient(geth.path)
+        with pytest.raises(RpcError, match="method not found"):
+            client.call("debug_nothing")
+        client.close()
+
+    def test_batch_returns_results_in_call_order(self, geth):
+        client = IpcClient(geth.path)
+
+        results = client.batch([("net_peerCount", []), ("nope", []), ("eth_blockNumber", [])])
+
+        assert results == ["0x19", None, "0x10"]
+        assert len(geth.batches) == 1
+        client.close()
+
+    def test_connection_is_reused(self, geth):
+        client = IpcClient(geth.path)
+        for _ in range(3):
+            client.call("eth_blockNumber")
+        assert geth.connections == 1
+        client.close()
+
+    def test_reconnects_after_connection_loss(self, geth):
+        client = IpcClient(geth.path)
+        client.call("eth_blockNumber")
+        geth.drop_next = True
+
+        assert client.call("eth_blockNumber") == "0x10"
+        assert geth.connections == 2
+        client.close()
+
+    def test_missing_socket_raises(self, tmp_path):
+        client = IpcClient(str(tmp_path / "missing.ipc"))
+        with pytest.raises(OSError):
+            client.call("eth_blockNumber")
+
+
+class TestParseStatus:
+    """Tests for building ChainStatus from poll results."""
+
+    def test_synced(self):
+        status = parse_status([False, "0x5", "0x64", []])
+        assert status == ChainStatus(100, 100, False, 5, 0)
+
+    def test_syncing_without_admin_api(self):
+        status = parse_status(
+            [{"currentBlock": "0x64", "highestBlock": "0xc8"}, "0x5", "0x64", None]
+        )
+        assert status == ChainStatus(100, 200, True, 5, None)
+
+
+class TestExecutionMonitor:
+    """Tests for adaptive polling and stall detection."""
+
+    @pytest.fixture
+    def monitor(self, geth):
+        monitor = ExecutionMonitor(geth.path, min_interval=5, max_interval=60, stall_time=600)
+        yield monitor
+        monitor.stop()
+
+    def test_poll_batches_status_calls(self, monitor, geth, capsys):
+        status = monitor.poll(now=0)
+
+        assert status == ChainStatus(16, 16, False, 25, 1)
+        assert [request["method"] for request in geth.batches[0]] == [
+            method for method, _ in STATUS_CALLS
+        ]
+        assert "Execution client in sync at block 16" in capsys.readouterr().out
+
+    def test_interval_backs_off_while_unchanged(self, monitor):
+        intervals = []
+        for now in range(5):
+            monitor.poll(now=now)
+            intervals.append(monitor.interval)
+        assert intervals == [5, 10, 20, 40, 60]
+
+    def test_interval_resets_on_change(self, monitor, geth, capsys):
+        monitor.poll(now=0)
+        monitor.poll(now=1)
+        geth.results["eth_syncing"] = {"currentBlock": "0x10", "highestBlock": "0x20"}
+
+        monitor.poll(now=2)
+
+        assert monitor.interval == 5
+        assert "Execution client syncing: block 16 of 32" in capsys.readouterr().out
+
+    def test_unreachable_geth_clears_status(self, monitor, geth):
+        monitor.poll(now=0)
+        geth.close()
+        monitor.client.close()
+
+        assert monitor.poll(now=1) is None
+        assert monitor.interval == 5
+
+    def test_stalled_when_synced_head_stops(self, monitor, geth):
+        monitor.poll(now=0)
+        monitor.poll(now=300)
+        assert monitor.stalled(now=599) is False
+        assert monitor.stalled(now=600) is True
+
+        geth.results["eth_blockNumber"] = "0x11"
+        monitor.poll(now=610)
+        assert monitor.stalled(now=1000) is False
+
+    def test_stall_counts_from_since(self, monitor, geth):
+        monitor.poll(now=0)
+        assert monitor.stalled(now=600, since=100) is False
+        assert monitor.stalled(now=700, since=100) is True
+
+    def test_not_stalled_while_syncing(self, monitor, geth):
+        geth.results["eth_syncing"] = {"currentBlock": "0x10", "highestBlock": "0x20"}
+        monitor.poll(now=0)
+        assert monitor.stalled(now=10_000) is False
+
+    def test_reset_forgets_status(self, monitor):
+        monitor.poll(now=0)
+        monitor.reset()
+        assert monitor.status is None
+        assert monitor.stalled() is False
+
+    def test_background_polling(self, geth):
+        monitor = ExecutionMonitor(geth.path, min_interval=0.01, max_interval=0.01)
+        monitor.start()
+        try:
+            for _ in range(500):
+                if monitor.status is not None:
+                    break
+                threading.Event().wait(0.01)
+            assert monitor.status is not None
+        finally:
+            monitor.stop()
+
+    def test_failed_poll_warns_and_keeps_polling(self, monitor, mocker, capsys):
+        mocker.patch.object(monitor._stop, "wait", side_effect=[False, False, True])
+        poll = mocker.patch.object(monitor, "poll", side_effect=OSError("gone"))
+
+        monitor._run()
+
+        assert poll.call_count == 2
+        out = capsys.readouterr().out
+        assert "WARNING: Execution status poll failed: gone" in out
+        assert "[bright_yellow]" not in out
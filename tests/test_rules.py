@@ -0,0 +1,146 @@
+"""Tests for the error rule engine."""
+
+import re
+
+import pytest
+
+from staker.config import ERROR_RULES
+from staker.rules import ErrorRule, RuleAction, RuleEngine
+
+
+class TestErrorRule:
+    """Tests for building rules from config entries."""
+
+    def test_defaults(self):
+        rule = ErrorRule.from_config({"name": "a", "pattern": "x+", "action": "alert"})
+
+        assert rule.pattern.pattern == "x+"
+        assert rule.source is None
+        assert rule.threshold == 1
+        assert rule.window == 0.0
+        assert rule.action is RuleAction.ALERT
+
+    def test_default_rules_are_valid(self):
+        assert RuleEngine(ERROR_RULES).rules
+
+    def test_unknown_action(self):
+        with pytest.raises(ValueError):
+            ErrorRule.from_config({"name": "a", "pattern": "x", "action": "reboot"})
+
+    def test_non_positive_threshold(self):
+        with pytest.raises(ValueError, match="positive threshold"):
+            ErrorRule.from_config({"name": "a", "pattern": "x", "threshold": 0, "action": "alert"})
+
+    def test_global_inline_flags(self):
+        with pytest.raises(ValueError, match="global inline flags"):
+            ErrorRule.from_config({"name": "a", "pattern": "(?i)fatal", "action": "alert"})
+        # Scoped flags work inside the combined regex
+        rule = ErrorRule.from_config({"name": "a", "pattern": "(?i:fatal)", "action": "alert"})
+        assert rule.pattern.search("FATAL")
+
+    @pytest.mark.parametrize("pattern", [r"(x)(y)\2", r"(?P<a>x)(?P=a)"])
+    def test_backreferences(self, pattern):
+        with pytest.raises(ValueError, match="backreference"):
+            ErrorRule.from_config({"name": "a", "pattern": pattern, "action": "alert"})
+
+    def test_escaped_backslash_is_not_a_backreference(self):
+        rule = ErrorRule.from_config({"name": "a", "pattern": r"C:\\1", "action": "alert"})
+        assert rule.pattern.search(r"C:\1")
+
+    def test_invalid_pattern(self):
+        with pytest.raises(re.error):
+            ErrorRule.from_config({"name": "a", "pattern": "(", "action": "alert"})
+
+
+class TestRuleEngine:
+    """Tests for matching lines against rules."""
+
+    def test_fires_at_threshold_within_window(self):
+        engine = RuleEngine(
+            [
+                {
+                    "name": "peer",
+                    "pattern": "peer dropped",
+                    "threshold": 3,
+                    "window": 10,
+                    "action": "alert",
+                }
+            ]
+        )
+
+        assert engine.match("execution", "peer dropped", now=0) is None
+        assert engine.match("execution", "peer dropped", now=5) is None
+        rule = engine.match("execution", "peer dropped", now=9)
+
+        assert rule.name == "peer"
+        assert engine.hits == {"peer": 3}
+        assert engine.fired == {"peer": 1}
+        # The count starts over after firing
+        assert engine.match("execution", "peer dropped", now=9.5) is None
+
+    def test_old_matches_leave_the_window(self):
+        engine = RuleEngine(
+            [
+                {
+                    "name": "peer",
+                    "pattern": "peer dropped",
+                    "threshold": 2,
+                    "window": 10,
+                    "action": "alert",
+                }
+            ]
+        )
+
+        assert engine.match("execution", "peer dropped", now=0) is None
+        assert engine.match("execution", "peer dropped", now=11) is None
+        assert engine.match("execution", "peer dropped", now=12).name == "peer"
+
+    def test_source_scoped_rules(self):
+        engine = RuleEngine(
+            [
+                {"name": "geth", "pattern": "fatal", "source": "execution", "action": "alert"},
+                {"name": "any", "pattern": "panic", "action": "alert"},
+            ]
+        )
+
+        assert engine.match("consensus", "fatal") is None
+        assert engine.match("execution", "fatal").name == "geth"
+        assert engine.match("consensus", "panic").name == "any"
+        assert engine.match("PRE", "fatal") is None
+
+    def test_leftmost_match_then_first_rule_wins(self):
+        engine = RuleEngine(
+            [
+                {"name": "late", "pattern": "disk full", "action": "alert"},
+                {"name": "early", "pattern": "write failed", "action": "alert"},
+                {"name": "shadowed", "pattern": r"write \w+", "action": "alert"},
+            ]
+        )
+
+        assert engine.match("execution", "write failed: disk full").name == "early"
+        assert engine.hits == {"late": 0, "early": 1, "shadowed": 0}
+
+    def test_patterns_with_groups_and_anchors(self):
+        engine = RuleEngine(
+            [
+                {"name": "start", "pattern": "^(?P<level>CRIT)", "action": "alert"},
+                {"name": "code", "pattern": r"code=(\d+)", "action": "alert"},
+            ]
+        )
+
+        assert engine.match("execution", "x CRIT code=5").name == "code"
+        assert engine.match("execution", "CRIT code=5").name == "start"
+
+    def test_patterns_that_cannot_be_combined_fail_at_construction(self):
+        with pytest.raises(re.error):
+            RuleEngine(
+                [
+                    {"name": "a", "pattern": "(?P<code>1)", "action": "alert"},
+                    {"name": "b", "pattern": "(?P<code>2)", "action": "alert"},
+                ]
+            )
+
+    def test_no_rules(self):
+        engine = RuleEngine([])
+
+        assert engine.match("execution", "anything") is None
@@ -21,6 +21,10 @@ class TestNoOpSnapshotManager:
         assert manager.is_older_than(None, 30) is False
         assert manager.is_older_than({}, 30) is False
 
+    def test_seconds_until_older_than_returns_none(self):
+        manager = NoOpSnapshotManager()
+        assert manager.seconds_until_older_than(None, 30) is None
+
     def test_update_returns_false(self):
         manager = NoOpSnapshotManager()
         assert manager.update() is False
@@ -69,6 +73,21 @@ class TestSnapshot:
         almost_old = {"StartTime": datetime.now(UTC) - timedelta(days=29, hours=23)}
         assert snapshot.is_older_than(almost_old, 30) is False
 
+    def test_seconds_until_older_than_none(self, mock_boto3):
+        snapshot = Snapshot()
+        assert snapshot.seconds_until_older_than(None, 30) == 0.0
+
+    def test_seconds_until_older_than_recent(self, mock_boto3):
+        snapshot = Snapshot()
+        recent_snap = {"StartTime": datetime.now(UTC) - timedelta(days=29)}
+        remaining = snapshot.seconds_until_older_than(recent_snap, 30)
+        assert 86_300 < remaining <= 86_400
+
+    def test_seconds_until_older_than_old(self, mock_boto3):
+        snapshot = Snapshot()
+        old_snap = {"StartTime": datetime.now(UTC) - timedelta(days=60)}
+        assert snapshot.seconds_until_older_than(old_snap, 30) == 0.0
+
     def test_force_create_calls_ec2(self, mock_boto3, mocker):
         mock_ec2 = MagicMock()
         mock_ec2.create_snapshot.return_value = {"SnapshotId": "snap-123"}
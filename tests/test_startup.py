@@ -0,0 +1,116 @@
+"""Tests for the readiness-gated startup pipeline."""
+
+import socket
+import threading
+from http.server import BaseHTTPRequestHandler, HTTPServer
+
+import pytest
+
+from staker.startup import StartupPipeline, http_is_ready, ipc_is_ready
+
+
+class TestReadinessChecks:
+    """Tests for the IPC and HTTP readiness probes."""
+
+    def test_ipc_is_ready_when_socket_listens(self, tmp_path):
+        path = str(tmp_path / "geth.ipc")
+        with socket.socket(socket.AF_UNIX, socket.SOCK_STREAM) as server:
+            server.bind(path)
+            server.listen()
+            assert ipc_is_ready(path) is True
+
+    def test_ipc_is_not_ready_without_socket(self, tmp_path):
+        assert ipc_is_ready(str(tmp_path / "geth.ipc")) is False
+
+    def test_http_is_ready_for_any_status(self):
+        class Syncing(BaseHTTPRequestHandler):
+            def do_GET(self):
+                self.send_response(503)
+                self.end_headers()
+
+            def log_message(self, *args):
+                pass
+
+        server = HTTPServer(("127.0.0.1", 0), Syncing)
+        thread = threading.Thread(target=server.handle_request)
+        thread.start()
+        try:
+            assert http_is_ready(f"http://127.0.0.1:{server.server_port}/") is True
+        finally:
+            thread.join()
+            server.server_close()
+
+    def test_http_is_not_ready_when_refused(self):
+        with socket.socket() as sock:
+            sock.bind(("127.0.0.1", 0))
+            port = sock.getsockname()[1]
+        assert http_is_ready(f"http://127.0.0.1:{port}/") is False
+
+
+class TestStartupPipeline:
+    """Tests for StartupPipeline gating and timing."""
+
+    @pytest.fixture
+    def startup(self):
+        startup = StartupPipeline(poll_interval=5)
+        yield startup
+        startup.close()
+
+    def test_ready_releases_in_registration_order(self, startup):
+        startup.gate("a", lambda: True)
+        startup.gate("b", lambda: False)
+        startup.gate("c", lambda: True)
+
+        assert startup.ready(now=0) == ["a", "c"]
+        assert startup.pending
+
+    def test_ready_waits_for_dependencies(self, startup):
+        startup.gate("a", lambda: False)
+        startup.gate("b", lambda: True, after=("a",))
+
+        assert startup.ready(now=0) == []
+
+    def test_dependency_released_in_same_round(self, startup):
+        startup.gate("a", lambda: True)
+        startup.gate("b", lambda: True, after=("a",))
+
+        assert startup.ready(now=0) == ["a", "b"]
+        assert not startup.pending
+
+    def test_ready_is_throttled(self, startup, mocker):
+        check = mocker.Mock(side_effect=[False, True])
+        startup.gate("a", check)
+
+        assert startup.ready(now=0) == []
+        assert startup.ready(now=1) == []
+        assert startup.ready(now=5) == ["a"]
+        assert check.call_count == 2
+
+    def test_timeout_until_next_poll(self, startup):
+        assert startup.timeout(now=0) is None
+        startup.gate("a", lambda: False)
+        assert startup.timeout(now=0) == 0.0
+        startup.ready(now=10)
+        assert startup.timeout(now=12) == 3
+        assert startup.timeout(now=20) == 0.0
+
+    def test_records_durations(self, startup):
+        startup.submit("prep", lambda: 1).result()
+        assert startup.run("sync", lambda: 2) == 2
+        startup.gate("client", lambda: True)
+        startup.ready()
+
+        assert list(startup.durations) == ["prep", "sync", "client"]
+        assert all(seconds >= 0 for seconds in startup.durations.values())
+        assert "client " in startup.summary()
+
+    def test_records_duration_when_task_fails(self, startup):
+        def fail():
+            raise ValueError("boom")
+
+        with pytest.raises(ValueError):
+            startup.run("sync", fail)
+        with pytest.raises(ValueError):
+            startup.submit("prep", fail).result()
+
+        assert {"sync", "prep"} <= startup.durations.keys()
@@ -0,0 +1,146 @@
+"""Tests for chunked child output readers."""
+
+import os
+import select
+import subprocess
+import sys
+import threading
+
+from staker.streams import LineReader, LogDrain
+
+
+class TestLineReader:
+    """Tests for LineReader line reassembly."""
+
+    def test_fileno_delegates_to_stream(self, pipe):
+        stream, _ = pipe
+        reader = LineReader(stream, "PRE")
+        assert reader.fileno() == stream.fileno()
+
+    def test_returns_complete_lines_in_one_read(self, pipe):
+        stream, write_fd = pipe
+        os.write(write_fd, b"one\ntwo\nthree\n")
+        reader = LineReader(stream, "PRE")
+
+        assert reader.read_lines() == [b"one", b"two", b"three"]
+
+    def test_holds_partial_line_until_completed(self, pipe):
+        stream, write_fd = pipe
+        reader = LineReader(stream, "PRE")
+
+        os.write(write_fd, b"first\nsec")
+        assert reader.read_lines() == [b"first"]
+        os.write(write_fd, b"ond half")
+        assert reader.read_lines() == []
+        os.write(write_fd, b"\n")
+        assert reader.read_lines() == [b"second half"]
+
+    def test_returns_partial_line_at_eof(self, pipe):
+        stream, write_fd = pipe
+        reader = LineReader(stream, "PRE")
+        os.write(write_fd, b"tail")
+        assert reader.read_lines() == []
+        os.close(write_fd)
+
+        assert reader.read_lines() == [b"tail"]
+        assert reader.eof is True
+
+    def test_eof_without_partial_returns_nothing(self, pipe):
+        stream, write_fd = pipe
+        reader = LineReader(stream, "PRE")
+        os.close(write_fd)
+
+        assert reader.read_lines() == []
+        assert reader.eof is True
+
+    def test_reassembles_lines_across_small_chunks(self, pipe):
+        stream, write_fd = pipe
+        reader = LineReader(stream, "PRE", chunk_size=4)
+        os.write(write_fd, b"abcdefgh\nij\n")
+        os.close(write_fd)
+
+        lines = []
+        while not reader.eof:
+            lines += reader.read_lines()
+
+        assert lines == [b"abcdefgh", b"ij"]
+
+    def test_partial_line_does_not_block_other_streams(self, pipe):
+        stream, write_fd = pipe
+        other_read, other_write = os.pipe()
+        slow = LineReader(stream, "SLOW")
+        fast = LineReader(os.fdopen(other_read, "rb"), "FAST")
+        os.write(write_fd, b"no newline yet")
+        os.write(other_write, b"ready\n")
+
+        ready, _, _ = select.select([slow, fast], [], [], 1)
+        lines = {reader.prefix: reader.read_lines() for reader in ready}
+
+        assert lines == {"SLOW": [], "FAST": [b"ready"]}
+        os.close(other_write)
+        fast.stream.close()
+
+
+class TestLogDrain:
+    """Tests for draining several pipes at once."""
+
+    def test_drains_every_pipe_past_its_buffer(self):
+        # Each child writes more than a pipe holds, so none can exit unread
+        code = "import sys\nfor _ in range(5000): sys.stdout.write('x' * 99 + '\\n')"
+        children = [
+            subprocess.Popen([sys.executable, "-c", code], stdout=subprocess.PIPE) for _ in range(3)
+        ]
+        lines = []
+        drain = LogDrain(
+            [LineReader(child.stdout, f"P{i}") for i, child in enumerate(children)],
+            lambda prefix, line: lines.append(prefix),
+        )
+
+        drain.start()
+        for child in children:
+            assert child.wait(timeout=10) == 0
+
+        assert drain.close(timeout=5) is True
+        assert sorted(set(lines)) == ["P0", "P1", "P2"]
+        assert len(lines) == 3 * 5000
+        for child in children:
+            child.stdout.close()
+
+    def test_close_stops_at_deadline(self, pipe):
+        stream, write_fd = pipe
+        os.write(write_fd, b"seen\npartial")
+        lines = []
+        drain = LogDrain([LineReader(stream, "PRE")], lambda prefix, line: lines.append(line))
+
+        drain.start()
+
+        assert drain.close(timeout=0.2) is False
+        assert lines == [b"seen"]
+
+    def test_close_gives_up_on_a_stuck_callback(self, pipe):
+        stream, write_fd = pipe
+        other_read, other_write = os.pipe()
+        other = LineReader(os.fdopen(other_read, "rb"), "OTHER")
+        os.write(write_fd, b"line\nnext\n")
+        os.write(other_write, b"more\n")
+        release = threading.Event()
+        lines = []
+
+        def stuck(prefix, line):
+            lines.append(line)
+            release.wait()
+
+        drain = LogDrain([LineReader(stream, "PRE")], stuck, [other])
+
+        drain.start()
+
+        assert drain.close(timeout=0.1) is False
+        release.set()
+        # Once the callback returns, the thread exits without reading again
+        drain._thread.join(timeout=1)
+        assert not drain._thread.is_alive()
+        assert lines == [b"line"]
+        assert drain._wake_read == drain._wake_write == -1
+        assert other.read_lines() == [b"more"]
+        os.close(other_write)
+        other.stream.close()
@@ -0,0 +1,383 @@
+"""Tests for the asyncio supervisor engine."""
+
+import asyncio
+import os
+import sys
+import time
+
+import pytest
+
+from staker.config import PREFIXES
+from staker.node import Node
+from staker.restarts import CrashTracker
+from staker.rpc import ChainStatus
+from staker.snapshot import NoOpSnapshotManager
+from staker.startup import StartupPipeline
+from staker.supervisor import AsyncSupervisor
+
+
+def python_cmd(code: str) -> list[str]:
+    """Build a command that runs a Python snippet."""
+    return [sys.executable, "-c", code]
+
+
+SLEEPER = python_cmd("import time; print('up', flush=True); time.sleep(60)")
+
+
+class StopLoop(Exception):
+    """Raised by mocks to break out of the supervise loop."""
+
+
+class TestAsyncSupervisor:
+    """Tests for AsyncSupervisor process handling."""
+
+    @pytest.fixture
+    def node(self, mocker, mock_env, tmp_path):
+        mocker.patch("staker.node.DOCKER", False)
+        mocker.patch("staker.node.DEV", True)
+        mocker.patch("staker.supervisor.VPN", False)
+        mocker.patch("staker.node.STARTUP_POLL_INTERVAL", 0)
+        mocker.patch("staker.node.get_checkpoint", return_value="0xabc:1")
+        mocker.patch("staker.node.ipc_is_ready", return_value=True)
+        mocker.patch("staker.node.http_is_ready", return_value=True)
+        mocker.patch("staker.node.Booster.get_relays", return_value=[])
+        mocker.patch.object(mock_env, "get_logs_path", return_value=str(tmp_path / "logs.txt"))
+        node = Node(env=mock_env, snapshot=NoOpSnapshotManager())
+        for name in ("execution", "consensus", "validation", "mev"):
+            mocker.patch.object(node, f"_{name}_cmd", return_value=SLEEPER)
+        return node
+
+    @pytest.fixture
+    def supervisor(self, node):
+        return AsyncSupervisor(node)
+
+    def read_logs(self, node):
+        node.sink.flush()
+        with open(node.logs_file) as f:
+            return f.read()
+
+    async def wait_for_logs(self, node, text, count=1):
+        async with asyncio.timeout(10):
+            while self.read_logs(node).count(text) < count:
+                await asyncio.sleep(0.05)
+
+    def test_run_cmd_captures_output(self, supervisor):
+        async def scenario():
+            process = await supervisor._run_cmd(python_cmd("print('hello')"))
+            output = await process.stdout.read()
+            await process.wait()
+            return output
+
+        assert asyncio.run(scenario()) == b"hello\n"
+
+    def test_start_spawns_all_clients(self, supervisor, node):
+        async def scenario():
+            processes = await supervisor._start()
+            await self.wait_for_logs(node, " up\n", count=4)
+            await supervisor._handle_gracefully(hard=True)
+            return processes
+
+        processes = asyncio.run(scenario())
+
+        # Release order depends on when the background preparation finishes
+        assert {meta["prefix"] for meta in processes} == {
+            PREFIXES["execution"],
+            PREFIXES["consensus"],
+            PREFIXES["validation"],
+            PREFIXES["mev"],
+        }
+        assert processes[0]["name"] == "execution"
+        assert node.processes == processes
+        assert not node.startup.pending
+        assert self.read_logs(node).count(" up\n") == 4
+
+    def test_start_stops_waiting_when_a_process_exits(self, supervisor, node, mocker):
+        for name in ("execution", "mev"):
+            mocker.patch.object(node, f"_{name}_cmd", return_value=python_cmd("pass"))
+        mocker.patch("staker.node.ipc_is_ready", return_value=False)
+
+        async def scenario():
+            processes = await supervisor._start()
+            await supervisor._handle_gracefully(hard=True)
+            return processes
+
+        processes = asyncio.run(scenario())
+
+        assert "consensus" not in [meta["name"] for meta in processes]
+        assert node.startup.pending
+
+    def test_read_prints_lines_and_checks_errors(self, supervisor, node, mocker):
+        mock_interrupt = mocker.patch.object(node, "_interrupt")
+        code = "import sys; sys.stdout.write('ok\\nBeacon backfilling failed\\ntail')"
+
+        async def scenario():
+            process = await supervisor._run_cmd(python_cmd(code))
+            await supervisor._read({"process": process, "prefix": "PRE"})
+            await process.wait()
+
+        asyncio.run(scenario())
+
+        assert self.read_logs(node) == "PRE ok\nPRE Beacon backfilling failed\nPRE tail\n"
+        mock_interrupt.assert_called_once_with(hard=False)
+
+    def test_handle_gracefully_escalates_to_terminate(self, supervisor, node, mocker):
+        mocker.patch("staker.restarts.SHUTDOWN_BUDGETS", {"execution": 0.5})
+        ignore_sigint = python_cmd(
+            "import signal, time; signal.signal(signal.SIGINT, signal.SIG_IGN); "
+            "print('stubborn', flush=True); time.sleep(60)"
+        )
+        mocker.patch.object(node, "_execution_cmd", return_value=ignore_sigint)
+        mock_terminate = mocker.spy(node, "_terminate")
+        mock_kill = mocker.spy(node, "_kill")
+
+        async def scenario():
+            processes = await supervisor._start()
+            await self.wait_for_logs(node, "stubborn")
+            await supervisor._handle_gracefully(hard=True)
+            return processes
+
+        processes = asyncio.run(scenario())
+
+        execution = [meta for meta in processes if meta["name"] == "execution"]
+        mock_terminate.assert_called_once_with(hard=True, processes=execution)
+        mock_kill.assert_not_called()
+        assert list(node.shutdown_durations) == ["validation", "mev", "consensus", "execution"]
+        assert all(meta["process"].returncode is not None for meta in processes)
+
+    def test_watch_snapshot_sleeps_until_deadline(self, supervisor, node, mocker):
+        node.snapshot_due = time.monotonic() + 60
+        mock_sleep = mocker.patch("staker.supervisor.asyncio.sleep")
+        mock_interrupt = mocker.patch.object(node, "_interrupt")
+
+        asyncio.run(supervisor._watch_snapshot())
+
+        assert 59 < mock_sleep.call_args.args[0] <= 60
+        mock_interrupt.assert_called_once_with(hard=False)
+        assert node.snapshot_due is None
+
+    def test_watch_snapshot_without_deadline_never_pauses(self, supervisor, node, mocker):
+        node.snapshot_due = None
+        mock_interrupt = mocker.patch.object(node, "_interrupt")
+
+        asyncio.run(supervisor._watch_snapshot())
+
+        mock_interrupt.assert_not_called()
+
+    def test_watch_execution_interrupts_stalled_geth(self, supervisor, node, mocker):
+        node.chain.min_interval = 0
+        node.beacon.synced_since = 0.0
+        results = [False, True, True, True]
+
+        def stalled(since):
+            if not results:
+                raise StopLoop
+            if len(results) == 1:
+                # The first restart is over
+                supervisor.restarting.clear()
+            node.chain.status = ChainStatus(100, 100, False, 5, 0)
+            return results.pop(0)
+
+        mocker.patch.object(node.chain, "stalled", side_effect=stalled)
+        mock_handle = mocker.patch.object(
+            supervisor,
+            "_handle_gracefully",
+            side_effect=lambda **_: supervisor.restarting.add("execution"),
+        )
+        node.processes = [{"name": "execution"}, {"name": "mev"}]
+
+        async def scenario():
+            loop = asyncio.get_running_loop()
+            supervisor.exits = [loop.create_future() for _ in node.processes]
+            await supervisor._watch_execution()
+
+        with pytest.raises(StopLoop):
+            asyncio.run(scenario())
+
+        # Stalled again after the first restart; not stopped again while it was restarting
+        assert mock_handle.call_args_list == [
+            mocker.call(hard=False, processes=[{"name": "execution"}]),
+            mocker.call(hard=False, processes=[{"name": "execution"}]),
+        ]
+        assert node.chain.status is None
+
+    def test_watch_snapshot_defers_for_duties(self, supervisor, node, mocker):
+        node.snapshot_due = time.monotonic()
+        mocker.patch.object(node.duties, "delay", return_value=30.0)
+        mock_sleep = mocker.patch("staker.supervisor.asyncio.sleep")
+        mock_interrupt = mocker.patch.object(node, "_interrupt")
+
+        asyncio.run(supervisor._watch_snapshot())
+
+        assert mock_sleep.call_args.args == (30.0,)
+        mock_interrupt.assert_called_once_with(hard=False)
+
+    def test_supervise_restarts_crashed_process_alone(self, supervisor, node, mocker, tmp_path):
+        crash = python_cmd("print('bye')")
+        mocker.patch.object(node, "_mev_cmd", side_effect=[crash, SLEEPER])
+        node.crashes = CrashTracker(backoff=0)
+        mock_handle = mocker.spy(supervisor, "_handle_gracefully")
+
+        async def scenario():
+            supervise = asyncio.create_task(supervisor._supervise())
+            await self.wait_for_logs(node, " up\n", count=4)
+            supervise.cancel()
+            await supervisor.stop()
+
+        asyncio.run(scenario())
+
+        # Only mev was restarted; the stack kept running until the final stop
+        restart, stop = mock_handle.call_args_list
+        assert [meta["name"] for meta in restart.kwargs["processes"]] == ["mev"]
+        assert stop.kwargs == {"hard": True}
+        assert node._mev_cmd.call_count == 2
+        assert node._execution_cmd.call_count == 1
+        (incident,) = (tmp_path / "incidents").glob("*-mev.log")
+        assert incident.read_text().splitlines()[-1].endswith(" bye")
+
+    def test_recover_restarts_group_members_that_died_together_once(self, supervisor, node, mocker):
+        plan = mocker.patch.object(
+            node, "_plan_recovery", return_value=(["execution", "consensus"], 0.0)
+        )
+
+        async def restart(names, delay):
+            # The group's members are running again
+            loop = asyncio.get_running_loop()
+            supervisor.exits = [loop.create_future() for _ in names]
+
+        mocker.patch.object(supervisor, "_restart", side_effect=restart)
+
+        async def scenario():
+            loop = asyncio.get_running_loop()
+            node.processes = [
+                {"name": name, "process": mocker.Mock(returncode=3)}
+                for name in ("execution", "consensus")
+            ]
+            supervisor.exits = [loop.create_future() for _ in node.processes]
+            supervisor.readers = [loop.create_future() for _ in node.processes]
+            for task in supervisor.exits + supervisor.readers:
+                task.set_result(None)
+            with pytest.raises(TimeoutError):
+                async with asyncio.timeout(0.2):
+                    await supervisor._recover()
+
+        asyncio.run(scenario())
+
+        plan.assert_called_once_with("execution", 3)
+        supervisor._restart.assert_awaited_once_with(["execution", "consensus"], 0.0)
+
+    def test_supervise_restarts_stack_on_crash_loop(self, supervisor, node, mocker):
+        mocker.patch.object(node, "_mev_cmd", return_value=python_cmd("print('bye')"))
+        mocker.patch.object(node.snapshot, "backup", side_effect=[None, StopLoop])
+        mocker.patch.object(node.booster, "get_relays", return_value=["https://relay"])
+        node.crashes = CrashTracker(backoff=0, threshold=1)
+        mock_close = mocker.spy(StartupPipeline, "close")
+        mock_handle = mocker.spy(supervisor, "_handle_gracefully")
+        mock_wait = mocker.patch.object(supervisor, "_wait_for_termination")
+
+        with pytest.raises(StopLoop):
+            asyncio.run(supervisor._supervise())
+
+        mock_handle.assert_called_once_with(hard=False)
+        mock_wait.assert_awaited_once()
+        assert node.relays == ["https://relay"]
+        mock_close.assert_called_once()
+        assert "+++ MEV_BOOST +++ bye" in self.read_logs(node)
+        # The restarted stack starts a fresh count
+        assert node.crashes.count("mev") == 0
+
+    def test_supervise_waits_for_termination_after_escalation(self, supervisor, node, mocker):
+        mocker.patch.object(node, "_mev_cmd", return_value=python_cmd("print('bye')"))
+        mocker.patch.object(node.snapshot, "backup", side_effect=[None, StopLoop])
+        mocker.patch.object(node.env, "should_manage_snapshots", return_value=True)
+        mocker.patch.object(node.snapshot, "update", return_value=False)
+        mock_terminate = mocker.patch.object(node.snapshot, "terminate")
+        mock_wait = mocker.patch.object(supervisor, "_wait_for_termination")
+        node.crashes = CrashTracker(backoff=0, threshold=1)
+
+        with pytest.raises(StopLoop):
+            asyncio.run(supervisor._supervise())
+
+        assert node.terminating is True
+        mock_terminate.assert_called_once()
+        mock_wait.assert_awaited_once()
+
+    def test_supervise_restarts_mev_on_relay_update(self, supervisor, node, mocker):
+        mocker.patch.object(node.monitor, "take_update", return_value=["https://new.relay"])
+        mock_start = mocker.patch.object(node.monitor, "start")
+        mocker.patch.object(supervisor, "_restart", side_effect=StopLoop)
+
+        async def scenario():
+            supervise = asyncio.create_task(supervisor._supervise())
+            await self.wait_for_logs(node, " up\n", count=4)
+            os.write(node.monitor._write_fd, b"!")
+            try:
+                await supervise
+            finally:
+                await supervisor.stop()
+
+        with pytest.raises(StopLoop):
+            asyncio.run(scenario())
+
+        mock_start.assert_called_once()
+        supervisor._restart.assert_awaited_once_with(["mev"], 0.0)
+        assert node.relays == ["https://new.relay"]
+
+    def test_supervise_waits_for_stale_instance_termination(self, supervisor, node, mocker):
+        mocker.patch.object(node.env, "should_manage_snapshots", return_value=True)
+        mocker.patch.object(node.snapshot, "update", return_value=True)
+        mock_terminate = mocker.patch.object(node.snapshot, "terminate")
+        mocker.patch("staker.supervisor.asyncio.sleep", side_effect=StopLoop)
+        mock_metrics = mocker.patch.object(node.metrics_server, "start")
+        node.metrics_server.port = 9100
+
+        with pytest.raises(StopLoop):
+            asyncio.run(supervisor._supervise())
+
+        mock_metrics.assert_called_once()
+        assert node.terminating is True
+        mock_terminate.assert_called_once()
+
+    def test_run_stops_gracefully_on_request(self, supervisor, node, mocker):
+        mocker.patch.object(node.booster, "get_relays", return_value=[])
+        mock_snapshot = mocker.patch.object(node, "_snapshot_if_draining")
+
+        async def scenario():
+            run = asyncio.create_task(supervisor.run())
+            # SIGINT during interpreter startup can be lost, so wait for the children
+            await self.wait_for_logs(node, " up\n", count=4)
+            supervisor.request_stop()
+            await run
+
+        asyncio.run(scenario())
+
+        assert node.kill_in_progress is True
+        assert all(meta["process"].returncode is not None for meta in node.processes)
+        mock_snapshot.assert_called_once()
+
+    def test_run_stops_processes_when_supervise_fails(self, supervisor, node, mocker):
+        mocker.patch.object(node.snapshot, "backup", side_effect=StopLoop)
+        mock_stop = mocker.patch.object(supervisor, "stop")
+
+        with pytest.raises(StopLoop):
+            asyncio.run(supervisor.run())
+
+        mock_stop.assert_called_once()
+
+    def test_wait_for_vpn_retries_until_ip_changes(self, supervisor, node, mocker):
+        mocker.patch("staker.supervisor.VPN_TIMEOUT", 0)  # Immediate timeout
+        mocker.patch("staker.supervisor.get_public_ip", side_effect=["1.1.1.1", "2.2.2.2"])
+        mocker.patch.object(node, "_vpn_cmd", return_value=(SLEEPER, "/tmp/creds"))
+        mock_cleanup = mocker.patch.object(node, "_cleanup_creds")
+
+        async def scenario():
+            processes = await supervisor._wait_for_vpn("1.1.1.1")
+            processes[0]["process"].kill()
+            await processes[0]["process"].wait()
+            return processes
+
+        processes = asyncio.run(scenario())
+
+        assert len(processes) == 1
+        assert processes[0]["prefix"] == PREFIXES["vpn"]
+        assert node._vpn_cmd.call_count == 2
+        assert mock_cleanup.call_count == 2
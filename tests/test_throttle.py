@@ -0,0 +1,87 @@
+"""Tests for console flood control."""
+
+from staker.throttle import ConsoleThrottle
+
+
+class TestRepeats:
+    """Tests for collapsing repeated lines."""
+
+    def test_repeats_print_once_with_count(self):
+        throttle = ConsoleThrottle(window=5, rate=0)
+
+        assert throttle.admit("P", "P same", now=0) == ["P same"]
+        assert throttle.admit("P", "P same", now=1) == []
+        assert throttle.admit("P", "P same", now=2) == []
+        assert throttle.admit("P", "P other", now=3) == ["P same (repeated x2)", "P other"]
+        assert throttle.repeats == {"P": 2}
+
+    def test_timestamps_are_ignored(self):
+        throttle = ConsoleThrottle(window=5, rate=0)
+        geth = "P INFO [10-18|12:00:0{}.000] Looking for peers peercount=0"
+        prysm = 'P time="2026-10-18 12:00:0{}" level=info msg="Peer count"'
+
+        throttle.admit("P", geth.format(1), now=0)
+        assert throttle.admit("P", geth.format(2), now=1) == []
+        throttle.admit("P", prysm.format(1), now=2)
+        assert throttle.admit("P", prysm.format(2), now=3) == []
+
+    def test_window_prints_a_repeat_again(self):
+        throttle = ConsoleThrottle(window=5, rate=0)
+
+        throttle.admit("P", "P same", now=0)
+        throttle.admit("P", "P same", now=1)
+
+        assert throttle.admit("P", "P same", now=6) == ["P same (repeated x1)", "P same"]
+
+    def test_processes_are_independent(self):
+        throttle = ConsoleThrottle(window=5, rate=0)
+
+        throttle.admit("A", "A same", now=0)
+        assert throttle.admit("B", "B same", now=0) == ["B same"]
+        assert throttle.admit("A", "A same", now=0) == []
+
+    def test_pending_flushes_counts(self):
+        throttle = ConsoleThrottle(window=5, rate=0)
+        throttle.admit("P", "P same", now=0)
+        throttle.admit("P", "P same", now=1)
+
+        assert throttle.pending() == ["P same (repeated x1)"]
+        assert throttle.pending() == []
+
+
+class TestRateLimit:
+    """Tests for the per-process token bucket."""
+
+    def test_drops_lines_beyond_burst(self):
+        throttle = ConsoleThrottle(window=5, rate=1, burst=2)
+
+        shown = [throttle.admit("P", f"P line {i}", now=0) for i in range(5)]
+
+        assert shown == [["P line 0"], ["P line 1"], [], [], []]
+        assert throttle.dropped == {"P": 3}
+
+    def test_notes_dropped_lines_once_refilled(self):
+        throttle = ConsoleThrottle(window=5, rate=1, burst=1)
+        throttle.admit("P", "P line 0", now=0)
+        throttle.admit("P", "P line 1", now=0)
+        throttle.admit("P", "P line 2", now=0)
+
+        assert throttle.admit("P", "P line 3", now=1) == [
+            "P (2 lines not shown on the console)",
+            "P line 3",
+        ]
+
+    def test_other_processes_keep_printing(self):
+        throttle = ConsoleThrottle(window=5, rate=1, burst=1)
+        throttle.admit("A", "A line 0", now=0)
+
+        assert throttle.admit("A", "A line 1", now=0) == []
+        assert throttle.admit("B", "B line 0", now=0) == ["B line 0"]
+
+    def test_zero_rate_disables_limit(self):
+        throttle = ConsoleThrottle(window=5, rate=0, burst=1)
+
+        shown = [throttle.admit("P", f"P line {i}", now=0) for i in range(5)]
+
+        assert all(shown)
+        assert throttle.dropped == {"P": 0}
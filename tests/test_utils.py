@@ -4,7 +4,13 @@ from unittest.mock import MagicMock
 
 import requests
 
-from staker.utils import colorize_log, get_public_ip
+from staker.utils import (
+    LogColorizer,
+    colorize_log,
+    colorize_log_ansi,
+    get_public_ip,
+    parse_fields,
+)
 
 
 class TestColorizeLog:
@@ -42,6 +48,52 @@ class TestColorizeLog:
         result = colorize_log("some random text")
         assert result == "some random text"
 
+    def test_longest_match_wins_for_overlapping_keys(self):
+        result = colorize_log("WARNING disk low")
+        assert result == "[bright_yellow]WARNING[/bright_yellow] disk low"
+
+    def test_colorizes_every_occurrence_once(self):
+        result = colorize_log("EXECUTION INFO ERROR INFO")
+        assert result.count("[green]INFO[/green]") == 2
+        assert "[bright_red]ERROR[/bright_red]" in result
+        assert "[[" not in result
+
+
+class TestColorizeLogAnsi:
+    """Tests for ANSI log colorization."""
+
+    def test_emits_ansi_codes(self):
+        result = colorize_log_ansi("level=error msg=test")
+        assert result == "\x1b[91mlevel=error\x1b[0m msg=test"
+
+    def test_leaves_markup_characters_untouched(self):
+        result = colorize_log_ansi("INFO [bold]not markup[/bold]")
+        assert "[bold]not markup[/bold]" in result
+        assert result.startswith("\x1b[32mINFO\x1b[0m")
+
+    def test_no_color_for_unknown(self):
+        assert colorize_log_ansi("some random text") == "some random text"
+
+
+class TestLogColorizer:
+    """Tests for LogColorizer construction."""
+
+    def test_invalid_style_falls_back_to_plain_ansi(self):
+        colorizer = LogColorizer({"KEY": "not_a_color"})
+        assert colorizer.to_ansi("a KEY b") == "a KEY b"
+        assert colorizer.to_markup("a KEY b") == "a [not_a_color]KEY[/not_a_color] b"
+
+
+class TestParseFields:
+    """Tests for parse_fields function."""
+
+    def test_parses_plain_and_quoted_values(self):
+        fields = parse_fields('level=info msg="bid \\"received\\"" slot=12 empty=')
+        assert fields == {"level": "info", "msg": 'bid "received"', "slot": "12", "empty": ""}
+
+    def test_ignores_text_without_fields(self):
+        assert parse_fields("INFO [01-01|00:00:00.000] Imported new chain segment") == {}
+
 
 class TestGetPublicIp:
     """Tests for get_public_ip function."""